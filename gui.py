@@ -5,163 +5,374 @@ Verwendet PyQt6 für native Mac-Oberfläche
 
 import sys
 import os
+import threading
+import queue
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QFileDialog, QProgressBar,
-    QGroupBox, QCheckBox, QListWidget, QListWidgetItem, QMessageBox,
-    QTabWidget, QFormLayout, QSpinBox, QComboBox
+    QGroupBox, QCheckBox, QListWidget, QListWidgetItem, QListView, QMessageBox,
+    QTabWidget, QFormLayout, QSpinBox, QComboBox, QInputDialog
+)
+from PyQt6.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QAbstractListModel, QModelIndex,
+    pyqtSignal, pyqtSlot, QTimer
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QIcon
-from vmware_backup import VMwareBackup
-from vmware_restore import VMwareRestore
 from server_config import ServerConfigManager
-from pyVmomi import vim
+
+# vmware_backup/vmware_restore ziehen pyVmomi nach sich und werden erst bei
+# Bedarf importiert, damit das Hauptfenster schneller erscheint
+if TYPE_CHECKING:
+    from vmware_backup import VMwareBackup
+    from vmware_restore import VMwareRestore
 
 
-class BackupThread(QThread):
-    """Thread für Backup-Operationen"""
+class ProgressThrottler:
+    """
+    Drosselt Fortschrittsmeldungen aus den Worker-Threads
+    
+    Prozent-Meldungen (pro Chunk) werden höchstens einmal pro Zeitfenster
+    weitergereicht, dazwischen wird nur die jeweils letzte gemerkt. Alle
+    anderen Meldungen (Status, Fehler, Hinweise) werden nie verworfen.
+    So wird die Event-Queue des GUI-Threads bei großen VMDK-Downloads
+    nicht mit Meldungen pro Chunk geflutet. Aufrufe aus mehreren Threads
+    (parallel gesicherte VMs) sind erlaubt.
+    """
+    
+    def __init__(self, emit: Callable[[str], None], interval: float = 0.1):
+        """
+        Args:
+            emit: Funktion, die eine Meldung an den GUI-Thread weitergibt
+            interval: Mindestabstand zwischen zwei Prozent-Meldungen in Sekunden
+        """
+        self._emit = emit
+        self._interval = interval
+        self._last_emit = 0.0
+        self._pending = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, message: str):
+        with self._lock:
+            if '%' not in message:
+                # Statusmeldungen in Reihenfolge und ungedrosselt weitergeben
+                self._flush_locked()
+                self._emit(message)
+                return
+            
+            now = time.monotonic()
+            if now - self._last_emit >= self._interval:
+                self._last_emit = now
+                self._pending = None
+                self._emit(message)
+            else:
+                self._pending = message
+    
+    def flush(self):
+        """Liefert eine zurückgehaltene Prozent-Meldung nach"""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        if self._pending is not None:
+            message = self._pending
+            self._pending = None
+            self._last_emit = time.monotonic()
+            self._emit(message)
+
+
+class WorkerSignals(QObject):
+    """Signale für Hintergrund-Operationen im Thread-Pool"""
     
     progress = pyqtSignal(str)
+    progress_pct = pyqtSignal(int)  # Fortschritt in Prozent (0-100)
     finished = pyqtSignal(bool, str)
+
+
+class CallSignals(QObject):
+    """Signale für kurze Hintergrund-Aufrufe"""
+    
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class CallRunnable(QRunnable):
+    """Führt einen blockierenden Aufruf (z.B. pyVmomi) im Thread-Pool aus"""
     
-    def __init__(self, backup_manager: VMwareBackup, backup_dir: str,
-                 backup_host: bool, backup_vms: bool, vm_list: list):
+    def __init__(self, fn: Callable, *args):
         super().__init__()
+        self.signals = CallSignals()
+        self.fn = fn
+        self.args = args
+    
+    def run(self):
+        """Führt den Aufruf aus und meldet Ergebnis oder Fehler"""
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+
+
+class BackupRunnable(QRunnable):
+    """Runnable für Backup-Operationen im globalen Thread-Pool"""
+    
+    def __init__(self, backup_manager: 'VMwareBackup', backup_dir: str,
+                 backup_host: bool, backup_vms: bool, vm_list: list,
+                 feedback_queue: Optional[queue.SimpleQueue] = None):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.feedback_queue = feedback_queue  # Ersetzt progress-Signale, falls gesetzt
         self.backup_manager = backup_manager
         self.backup_dir = backup_dir
         self.backup_host = backup_host
         self.backup_vms = backup_vms
-        self.vm_list = vm_list
-        self._cancel = False
+        self.vm_list = frozenset(vm_list) if vm_list else None
+        self._cancel = threading.Event()
         # Setze Cancel-Flag im Backup-Manager
         if self.backup_manager:
             self.backup_manager.set_cancel_flag(self)
     
     def cancel(self):
         """Bricht den Backup-Vorgang ab"""
-        self._cancel = True
+        self._cancel.set()
         if self.backup_manager:
             self.backup_manager.cancel_backup()
     
+    def is_cancelled(self) -> bool:
+        """Prüft, ob der Backup-Vorgang abgebrochen wurde"""
+        return self._cancel.is_set()
+    
     def run(self):
         """Führt den Backup-Vorgang aus"""
+        # Gebundene emit-Methode einmal auflösen und überall weiterreichen
+        emit = self.feedback_queue.put if self.feedback_queue is not None else self.signals.progress.emit
         try:
             # Verbindung herstellen
-            self.progress.emit("Verbinde mit ESXi Server...")
+            emit("Verbinde mit ESXi Server...")
             if not self.backup_manager.connect():
-                self.finished.emit(False, "Verbindung zum ESXi Server fehlgeschlagen")
+                self.signals.finished.emit(False, "Verbindung zum ESXi Server fehlgeschlagen")
                 return
             
             success_count = 0
             error_messages = []
             
             # Host sichern
-            if self.backup_host and not self._cancel:
-                self.progress.emit("Sichere Host-Konfiguration...")
+            if self.backup_host and not self.is_cancelled():
+                emit("Sichere Host-Konfiguration...")
                 hosts = self.backup_manager.get_hosts()
                 for host in hosts:
-                    if self._cancel:
+                    if self.is_cancelled():
                         break
                     if self.backup_manager.backup_host_config(host, self.backup_dir):
                         success_count += 1
-                        self.progress.emit(f"Host {host.name} gesichert")
+                        emit(f"Host {host.name} gesichert")
                     else:
                         error_messages.append(f"Fehler beim Sichern von Host {host.name}")
             
             # VMs sichern
-            if self.backup_vms and not self._cancel:
-                vms = self.backup_manager.get_vms()
+            if self.backup_vms and not self.is_cancelled():
                 if self.vm_list:
                     # Nur ausgewählte VMs sichern
-                    vms = [vm for vm in vms if vm.name in self.vm_list]
+                    vms = self.backup_manager.get_vms(names=self.vm_list)
+                else:
+                    vms = self.backup_manager.get_vms()
                 
-                total_vms = len(vms)
-                for idx, vm in enumerate(vms):
-                    if self._cancel:
-                        break
-                    
-                    self.progress.emit(f"Sichere VM {vm.name} ({idx+1}/{total_vms})...")
-                    if self.backup_manager.backup_vmdk(vm, self.backup_dir, 
-                                                      lambda msg: self.progress.emit(msg)):
-                        success_count += 1
-                        self.progress.emit(f"VM {vm.name} gesichert")
+                # Fortschrittsmeldungen pro Chunk drosseln
+                throttled_progress = ProgressThrottler(emit)
+                
+                def vm_finished(vm, result: bool):
+                    if result:
+                        throttled_progress(f"VM {vm.name} gesichert")
                     else:
                         error_messages.append(f"Fehler beim Sichern von VM {vm.name}")
+                
+                # Mehrere VMs gleichzeitig sichern
+                results = self.backup_manager.backup_vms(
+                    vms, self.backup_dir, throttled_progress, on_vm_finished=vm_finished
+                )
+                throttled_progress.flush()
+                success_count += sum(1 for result in results.values() if result)
             
             self.backup_manager.disconnect()
             
-            if self._cancel:
-                self.finished.emit(False, "Backup abgebrochen")
+            if self.is_cancelled():
+                self.signals.finished.emit(False, "Backup abgebrochen")
             else:
                 message = f"Backup abgeschlossen. {success_count} Objekte gesichert."
                 if error_messages:
                     message += f"\nFehler: {len(error_messages)}"
-                self.finished.emit(True, message)
+                self.signals.finished.emit(True, message)
                 
         except Exception as e:
-            self.finished.emit(False, f"Fehler: {str(e)}")
+            self.signals.finished.emit(False, f"Fehler: {str(e)}")
 
 
-class RestoreThread(QThread):
-    """Thread für Wiederherstellungs-Operationen"""
-    
-    progress = pyqtSignal(str)
-    finished = pyqtSignal(bool, str)
+class RestoreRunnable(QRunnable):
+    """Runnable für Wiederherstellungs-Operationen im globalen Thread-Pool"""
     
-    def __init__(self, restore_manager: VMwareRestore, backup_path: str,
-                 restore_type: str, new_name: str = None, datastore: str = None):
+    def __init__(self, restore_manager: 'VMwareRestore', backup_path: str,
+                 restore_type: str, new_name: str = None, datastore: str = None,
+                 feedback_queue: Optional[queue.SimpleQueue] = None):
         super().__init__()
+        self.signals = WorkerSignals()
+        self.feedback_queue = feedback_queue  # Ersetzt progress-Signale, falls gesetzt
         self.restore_manager = restore_manager
         self.backup_path = backup_path
         self.restore_type = restore_type
         self.new_name = new_name
         self.datastore = datastore
+        self._cancel = threading.Event()
+        # Cancel-Flag und Prozent-Fortschritt an Manager übergeben
+        restore_manager.set_cancel_flag(self)
+        restore_manager.set_percent_callback(self.signals.progress_pct.emit)
+    
+    def cancel(self):
+        """Bricht die Wiederherstellung ab"""
+        self._cancel.set()
+        # Laufende Uploads sofort unterbrechen
+        self.restore_manager.cancel_restore()
+    
+    def is_cancelled(self) -> bool:
+        """Prüft, ob die Wiederherstellung abgebrochen wurde"""
+        return self._cancel.is_set()
     
     def run(self):
         """Führt die Wiederherstellung aus"""
+        emit = self.feedback_queue.put if self.feedback_queue is not None else self.signals.progress.emit
+        throttled_progress = ProgressThrottler(emit)
         try:
             if self.restore_type == 'host':
                 success = self.restore_manager.restore_host_config(
                     self.backup_path,
-                    lambda msg: self.progress.emit(msg)
+                    throttled_progress
                 )
-                if success:
-                    self.finished.emit(True, "Host-Konfiguration wiederhergestellt")
+                throttled_progress.flush()
+                if self.is_cancelled():
+                    self.signals.finished.emit(False, "Wiederherstellung abgebrochen")
+                elif success:
+                    self.signals.finished.emit(True, "Host-Konfiguration wiederhergestellt")
                 else:
-                    self.finished.emit(False, "Host-Wiederherstellung fehlgeschlagen")
+                    self.signals.finished.emit(False, "Host-Wiederherstellung fehlgeschlagen")
                     
             elif self.restore_type == 'vm':
                 success = self.restore_manager.restore_vm(
                     self.backup_path,
                     self.new_name,
                     self.datastore,
-                    lambda msg: self.progress.emit(msg)
+                    throttled_progress
                 )
-                if success:
-                    self.finished.emit(True, f"VM wiederhergestellt: {self.new_name or 'Originalname'}")
+                throttled_progress.flush()
+                if self.is_cancelled():
+                    self.signals.finished.emit(False, "Wiederherstellung abgebrochen")
+                elif success:
+                    self.signals.finished.emit(True, f"VM wiederhergestellt: {self.new_name or 'Originalname'}")
                 else:
-                    self.finished.emit(False, "VM-Wiederherstellung fehlgeschlagen")
+                    self.signals.finished.emit(False, "VM-Wiederherstellung fehlgeschlagen")
                     
         except Exception as e:
-            self.finished.emit(False, f"Fehler: {str(e)}")
+            throttled_progress.flush()
+            self.signals.finished.emit(False, f"Fehler: {str(e)}")
+
+
+class BackupListModel(QAbstractListModel):
+    """Listenmodell für gescannte Backups (Anzeigetext und Backup-Dictionary)"""
+    
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._backups = []  # Backup-Dictionaries
+        self._texts = []  # Vorberechnete Anzeigetexte
+    
+    def set_backups(self, backups: list):
+        """
+        Ersetzt alle Backups in einem Modell-Reset
+        
+        Args:
+            backups: Liste von Backup-Dictionaries aus scan_backup_directory
+        """
+        self.beginResetModel()
+        self._backups = list(backups)
+        self._texts = []
+        for backup in self._backups:
+            name = backup['info'].get('name', backup['name'])
+            timestamp = backup['timestamp'] or 'Unbekannt'
+            prefix = "VM" if backup['type'] == 'vm' else "Host"
+            self._texts.append(f"{prefix}: {name} ({timestamp})")
+        self.endResetModel()
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._backups)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._texts[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return self._backups[index.row()]  # Komplette Backup-Informationen
+        return None
 
 
 class VMwareBackupGUI(QMainWindow):
     """Hauptfenster der Anwendung"""
     
+    LOG_MAX_LINES = 500  # Maximale Anzahl angezeigter Log-Zeilen
+    LOG_FLUSH_INTERVAL_MS = 100  # Bündelungsintervall für Log-Ausgaben
+    CANCEL_CHECK_DELAY_MS = 3000  # Erste Prüfung nach einem Backup-Abbruch
+    CANCEL_RECHECK_INTERVAL_MS = 1000  # Weitere Prüfungen, solange das Backup läuft
+    CANCEL_RECHECK_MAX_MS = 30000  # Obergrenze für den wachsenden Prüfabstand
+    
     def __init__(self):
         super().__init__()
-        self.backup_manager: Optional[VMwareBackup] = None
-        self.restore_manager: Optional[VMwareRestore] = None
-        self.backup_thread: Optional[BackupThread] = None
-        self.restore_thread: Optional[RestoreThread] = None
-        self.backup_data = {}  # Speichert Backup-Informationen
+        self.backup_manager: Optional['VMwareBackup'] = None
+        self.restore_manager: Optional['VMwareRestore'] = None
+        self.backup_runnable: Optional[BackupRunnable] = None
+        self.restore_runnable: Optional[RestoreRunnable] = None
+        self._background_calls = set()  # Laufende CallRunnables
+        self._server_index = {}  # Servername -> Index in der Server-Combobox
+        self._checked_vms = set()  # Namen der angehakten VMs
+        
+        # Log-Puffer: Meldungen werden gesammelt und gebündelt angezeigt
+        self._log_buffer = deque(maxlen=self.LOG_MAX_LINES)
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_log)
+        
+        # Fortschrittsmeldungen der Worker landen in einer Queue und werden
+        # periodisch gesammelt abgeholt statt einzeln per Signal zugestellt
+        self._feedback_queue = queue.SimpleQueue()
+        self._feedback_timer = QTimer(self)
+        self._feedback_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._feedback_timer.timeout.connect(self._drain_feedback)
+        
+        # Prüft nach einem Abbruch, ob das Backup tatsächlich beendet wurde
+        self._cancel_check_timer = QTimer(self)
+        self._cancel_check_timer.setSingleShot(True)
+        self._cancel_check_timer.timeout.connect(self._check_backup_stopped)
+        self._cancel_recheck_ms = 0  # Aktueller Prüfabstand, 0 vor der ersten Prüfung
         self.server_config = ServerConfigManager()  # Server-Konfigurations-Manager
+        
+        # Verzeichnisdialoge werden einmal erstellt und bei jedem Klick wiederverwendet
+        self._backup_dir_dialog = self._create_dir_dialog()
+        self._restore_dir_dialog = self._create_dir_dialog()
         self.init_ui()
     
+    def _create_dir_dialog(self) -> QFileDialog:
+        """
+        Erstellt einen wiederverwendbaren Dialog zur Verzeichnisauswahl
+        
+        Returns:
+            Konfigurierter QFileDialog
+        """
+        dialog = QFileDialog(self, "Backup-Verzeichnis wählen", str(Path.home()))
+        dialog.setFileMode(QFileDialog.FileMode.Directory)
+        dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
+        return dialog
+    
     def init_ui(self):
         """Initialisiert die Benutzeroberfläche"""
         self.setWindowTitle("VMware ESXi Backup Tool")
@@ -210,15 +421,39 @@ class VMwareBackupGUI(QMainWindow):
         # Log-Nachricht hinzufügen
         self.log("Anwendung gestartet")
     
-    def refresh_servers(self):
-        """Aktualisiert die Server-Liste"""
-        self.server_combo.clear()
-        self.server_combo.addItem("-- Neuer Server --", None)
-        
-        servers = self.server_config.load_servers()
-        for server in servers:
-            display_name = f"{server['name']} ({server['host']})"
-            self.server_combo.addItem(display_name, server)
+    def refresh_servers(self, select_name: Optional[str] = None):
+        """
+        Aktualisiert die Server-Liste
+        
+        Die Konfigurationsdatei wird im Hintergrund gelesen.
+        
+        Args:
+            select_name: Nach dem Laden auszuwählender Server (optional)
+        """
+        self.run_in_background(
+            self.server_config.load_servers,
+            lambda servers: self._populate_server_combo(servers, select_name)
+        )
+    
+    def _populate_server_combo(self, servers: list, select_name: Optional[str] = None):
+        """Füllt die Server-Combobox mit den geladenen Servern"""
+        # Combobox in einem Durchgang neu aufbauen, ohne Zwischen-Signale
+        self.server_combo.blockSignals(True)
+        try:
+            self.server_combo.clear()
+            self.server_combo.addItem("-- Neuer Server --", None)
+            self.server_combo.addItems(
+                [f"{server['name']} ({server['host']})" for server in servers]
+            )
+            self._server_index = {}
+            for i, server in enumerate(servers, start=1):
+                self.server_combo.setItemData(i, server)
+                self._server_index[server['name']] = i
+            self.server_combo.setCurrentIndex(self._server_index.get(select_name, 0))
+        finally:
+            self.server_combo.blockSignals(False)
+        
+        self.on_server_selected(self.server_combo.currentIndex())
     
     def on_server_selected(self, index: int):
         """Wird aufgerufen, wenn ein Server ausgewählt wird"""
@@ -227,7 +462,15 @@ class VMwareBackupGUI(QMainWindow):
             self.host_input.setText(server_data['host'])
             self.port_input.setValue(server_data.get('port', 443))
             self.user_input.setText(server_data['user'])
-            self.password_input.setText(server_data['password'])
+            # Passwort erst bei Auswahl und im Hintergrund entschlüsseln (Keychain/Fernet)
+            self.password_input.clear()
+            name = server_data['name']
+            self.run_in_background(
+                self.server_config.get_server,
+                lambda server: self._on_password_loaded(server, name),
+                None,
+                name
+            )
         else:
             # "Neuer Server" ausgewählt - Felder leeren
             self.host_input.clear()
@@ -235,12 +478,30 @@ class VMwareBackupGUI(QMainWindow):
             self.user_input.clear()
             self.password_input.clear()
     
+    def _on_password_loaded(self, server: Optional[dict], name: str):
+        """Wird im GUI-Thread aufgerufen, wenn das Passwort entschlüsselt ist"""
+        # Inzwischen könnte ein anderer Server ausgewählt worden sein
+        server_data = self.server_combo.currentData()
+        if server and server_data and server_data['name'] == name:
+            self.password_input.setText(server['password'])
+    
+    def _read_connection_inputs(self) -> tuple:
+        """
+        Liest die Verbindungsfelder einmalig aus
+        
+        Returns:
+            Tuple (host, port, user, password)
+        """
+        return (
+            self.host_input.text().strip(),
+            self.port_input.value(),
+            self.user_input.text().strip(),
+            self.password_input.text()
+        )
+    
     def save_current_server(self):
         """Speichert die aktuellen Verbindungsdaten als Server"""
-        host = self.host_input.text().strip()
-        port = self.port_input.value()
-        user = self.user_input.text().strip()
-        password = self.password_input.text()
+        host, port, user, password = self._read_connection_inputs()
         
         if not host or not user or not password:
             QMessageBox.warning(self, "Fehler", 
@@ -248,7 +509,6 @@ class VMwareBackupGUI(QMainWindow):
             return
         
         # Dialog für Server-Namen
-        from PyQt6.QtWidgets import QInputDialog
         name, ok = QInputDialog.getText(
             self,
             "Server speichern",
@@ -261,9 +521,8 @@ class VMwareBackupGUI(QMainWindow):
         
         name = name.strip()
         
-        # Prüfe, ob Server bereits existiert
-        existing_server = self.server_config.get_server(name)
-        if existing_server:
+        # Prüfe, ob Server bereits existiert (Liste ist bereits geladen)
+        if name in self._server_index:
             reply = QMessageBox.question(
                 self,
                 "Server existiert bereits",
@@ -274,18 +533,21 @@ class VMwareBackupGUI(QMainWindow):
             if reply != QMessageBox.StandardButton.Yes:
                 return
         
-        # Speichere Server
-        if self.server_config.save_server(name, host, port, user, password):
+        # Speichere Server im Hintergrund
+        self.run_in_background(
+            self.server_config.save_server,
+            lambda saved: self._on_server_saved(saved, name),
+            None,
+            name, host, port, user, password
+        )
+    
+    def _on_server_saved(self, saved: bool, name: str):
+        """Wird im GUI-Thread aufgerufen, wenn das Speichern beendet ist"""
+        if saved:
             self.log(f"Server '{name}' gespeichert")
             QMessageBox.information(self, "Erfolg", f"Server '{name}' wurde gespeichert.")
-            self.refresh_servers()
             # Wähle den gespeicherten Server aus
-            index = self.server_combo.findData(None)
-            for i in range(self.server_combo.count()):
-                item_data = self.server_combo.itemData(i)
-                if item_data and item_data['name'] == name:
-                    self.server_combo.setCurrentIndex(i)
-                    break
+            self.refresh_servers(select_name=name)
         else:
             QMessageBox.critical(self, "Fehler", "Fehler beim Speichern des Servers.")
     
@@ -308,13 +570,21 @@ class VMwareBackupGUI(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.server_config.delete_server(name):
-                self.log(f"Server '{name}' gelöscht")
-                QMessageBox.information(self, "Erfolg", f"Server '{name}' wurde gelöscht.")
-                self.refresh_servers()
-                self.server_combo.setCurrentIndex(0)  # Wähle "Neuer Server"
-            else:
-                QMessageBox.critical(self, "Fehler", "Fehler beim Löschen des Servers.")
+            self.run_in_background(
+                self.server_config.delete_server,
+                lambda deleted: self._on_server_deleted(deleted, name),
+                None,
+                name
+            )
+    
+    def _on_server_deleted(self, deleted: bool, name: str):
+        """Wird im GUI-Thread aufgerufen, wenn das Löschen beendet ist"""
+        if deleted:
+            self.log(f"Server '{name}' gelöscht")
+            QMessageBox.information(self, "Erfolg", f"Server '{name}' wurde gelöscht.")
+            self.refresh_servers()  # Wählt "Neuer Server"
+        else:
+            QMessageBox.critical(self, "Fehler", "Fehler beim Löschen des Servers.")
     
     def create_connection_tab(self) -> QWidget:
         """Erstellt den Verbindungs-Tab"""
@@ -423,10 +693,11 @@ class VMwareBackupGUI(QMainWindow):
         
         self.vm_list = QListWidget()
         self.vm_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.vm_list.itemChanged.connect(self._on_vm_toggled)
         vm_layout.addWidget(self.vm_list)
         
         refresh_vms_button = QPushButton("VMs aktualisieren")
-        refresh_vms_button.clicked.connect(self.refresh_vms)
+        refresh_vms_button.clicked.connect(lambda: self.refresh_vms(refresh=True))
         vm_layout.addWidget(refresh_vms_button)
         
         vm_group.setLayout(vm_layout)
@@ -464,22 +735,99 @@ class VMwareBackupGUI(QMainWindow):
         
         return widget
     
+    def _connect_worker_signals(self, signals: WorkerSignals, finished_slot: Callable):
+        """
+        Verbindet die Signale eines Workers explizit als Queued-Verbindung
+        
+        UniqueConnection verhindert doppelte Zustellung bei erneutem Verbinden.
+        
+        Args:
+            signals: Signale des Workers
+            finished_slot: Slot für das finished-Signal
+        """
+        connection_type = Qt.ConnectionType.QueuedConnection | Qt.ConnectionType.UniqueConnection
+        signals.progress.connect(self.log, connection_type)
+        signals.progress_pct.connect(self.progress_bar.setValue, connection_type)
+        signals.finished.connect(finished_slot, connection_type)
+    
+    def _disconnect_worker_signals(self, signals: WorkerSignals, finished_slot: Callable):
+        """
+        Trennt die Signale eines beendeten Workers wieder
+        
+        Args:
+            signals: Signale des Workers
+            finished_slot: Slot für das finished-Signal
+        """
+        try:
+            signals.progress.disconnect(self.log)
+            signals.progress_pct.disconnect(self.progress_bar.setValue)
+            signals.finished.disconnect(finished_slot)
+        except TypeError:
+            pass  # Bereits getrennt
+    
+    @pyqtSlot(str)
     def log(self, message: str):
         """Fügt eine Nachricht zum Log hinzu"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_text.append(f"[{timestamp}] {message}")
+        timestamp = time.strftime("%H:%M:%S")
+        self._log_buffer.append(f"[{timestamp}] {message}")
+        if not self._log_timer.isActive():
+            self._log_timer.start(self.LOG_FLUSH_INTERVAL_MS)
+    
+    def _drain_feedback(self):
+        """Holt alle wartenden Worker-Meldungen ab und übergibt sie gesammelt ans Log"""
+        while True:
+            try:
+                message = self._feedback_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.log(message)
+    
+    def _finish_feedback(self):
+        """Holt letzte Meldungen ab und stoppt den Timer, wenn kein Worker mehr läuft"""
+        self._drain_feedback()
+        if not self.backup_runnable and not self.restore_runnable:
+            self._feedback_timer.stop()
+    
+    def _flush_log(self):
+        """Schreibt die gepufferten Log-Meldungen in einem Schritt ins Log-Feld"""
+        self.status_text.setPlainText("\n".join(self._log_buffer))
         # Auto-Scroll zum Ende
         self.status_text.verticalScrollBar().setValue(
             self.status_text.verticalScrollBar().maximum()
         )
     
+    def run_in_background(self, fn: Callable, on_result: Callable,
+                          on_error: Optional[Callable] = None, *args):
+        """
+        Führt einen blockierenden Aufruf im Thread-Pool aus
+        
+        Args:
+            fn: Auszuführende Funktion
+            on_result: Wird im GUI-Thread mit dem Rückgabewert aufgerufen
+            on_error: Wird im GUI-Thread mit der Fehlermeldung aufgerufen (optional)
+            *args: Argumente für fn
+        """
+        runnable = CallRunnable(fn, *args)
+        self._background_calls.add(runnable)
+        
+        def handle_result(result):
+            self._background_calls.discard(runnable)
+            on_result(result)
+        
+        def handle_error(message):
+            self._background_calls.discard(runnable)
+            if on_error:
+                on_error(message)
+            else:
+                self.log(f"Fehler: {message}")
+        
+        runnable.signals.result.connect(handle_result)
+        runnable.signals.error.connect(handle_error)
+        QThreadPool.globalInstance().start(runnable)
+    
     def connect_to_server(self):
         """Stellt Verbindung zum ESXi Server her"""
-        host = self.host_input.text().strip()
-        port = self.port_input.value()
-        user = self.user_input.text().strip()
-        password = self.password_input.text()
+        host, port, user, password = self._read_connection_inputs()
         
         if not host or not user or not password:
             QMessageBox.warning(self, "Fehler", 
@@ -489,18 +837,37 @@ class VMwareBackupGUI(QMainWindow):
         self.log(f"Verbinde mit {host}:{port}...")
         self.connect_button.setEnabled(False)
         
-        # Verbindung im Hintergrund testen
-        self.backup_manager = VMwareBackup(host, user, password, port)
-        if self.backup_manager.connect():
+        from vmware_backup import VMwareBackup
+        from vmware_restore import VMwareRestore
+        
+        # Verbindung im Hintergrund aufbauen, damit die GUI bedienbar bleibt
+        backup_manager = VMwareBackup(host, user, password, port)
+        # Erstelle auch Restore-Manager mit gleichen Credentials
+        restore_manager = VMwareRestore(host, user, password, port)
+        
+        def connect_managers() -> bool:
+            if not backup_manager.connect():
+                return False
+            restore_manager.connect()
+            return True
+        
+        self.run_in_background(
+            connect_managers,
+            lambda connected: self._on_connect_finished(connected, backup_manager, restore_manager),
+            lambda message: self._on_connect_finished(False, None, None)
+        )
+    
+    def _on_connect_finished(self, connected: bool, backup_manager: Optional['VMwareBackup'],
+                             restore_manager: Optional['VMwareRestore']):
+        """Wird im GUI-Thread aufgerufen, wenn der Verbindungsaufbau beendet ist"""
+        if connected:
+            self.backup_manager = backup_manager
+            self.restore_manager = restore_manager
             self.log("Verbindung erfolgreich!")
             self.connect_button.setEnabled(False)
             self.disconnect_button.setEnabled(True)
             self.start_backup_button.setEnabled(True)
             
-            # Erstelle auch Restore-Manager mit gleichen Credentials
-            self.restore_manager = VMwareRestore(host, user, password, port)
-            self.restore_manager.connect()
-            
             self.refresh_vms()
             self.refresh_datastores()
         else:
@@ -514,21 +881,33 @@ class VMwareBackupGUI(QMainWindow):
     
     def cancel_backup(self):
         """Bricht den Backup-Vorgang ab"""
-        if self.backup_thread and self.backup_thread.isRunning():
+        if self.backup_runnable and not self.backup_runnable.is_cancelled():
             self.log("Backup wird abgebrochen...")
-            self.backup_thread.cancel()
-            
-            # Informiere Backup-Manager über Cancel
-            if self.backup_manager:
-                self.backup_manager.cancel_backup()
+            # Pool-Threads können nicht hart beendet werden - der Runnable
+            # prüft das Cancel-Flag und der Manager schließt aktive Verbindungen
+            self.backup_runnable.cancel()
             
-            # Warte kurz, damit der Thread reagieren kann
-            if not self.backup_thread.wait(3000):  # Warte max. 3 Sekunden
-                # Falls Thread nicht reagiert, erzwinge Beendigung
-                self.log("Thread reagiert nicht, erzwinge Beendigung...")
-                self.backup_thread.terminate()
-                self.backup_thread.wait(1000)  # Warte auf Beendigung
-                self.log("Backup-Thread wurde beendet")
+            # Nicht blockierend auf das Ende warten
+            self._cancel_recheck_ms = 0
+            self._cancel_check_timer.start(self.CANCEL_CHECK_DELAY_MS)
+    
+    def _check_backup_stopped(self):
+        """Prüft nach einem Abbruch, ob der Backup-Vorgang beendet ist"""
+        if not self.backup_runnable:
+            return
+        
+        # Vorgang hängt noch (z.B. in einem blockierenden Read oder wartet auf
+        # das Entfernen eines Snapshots) - aktive Verbindungen erneut schließen.
+        # Nur beim ersten Mal melden und danach mit wachsendem Abstand prüfen,
+        # sonst verdrängen die Meldungen bei langen Tasks das eigentliche Log.
+        if not self._cancel_recheck_ms:
+            self.log("Backup reagiert noch nicht, schließe aktive Verbindungen...")
+            self._cancel_recheck_ms = self.CANCEL_RECHECK_INTERVAL_MS
+        else:
+            self._cancel_recheck_ms = min(self._cancel_recheck_ms * 2, self.CANCEL_RECHECK_MAX_MS)
+        if self.backup_manager:
+            self.backup_manager.cancel_backup()
+        self._cancel_check_timer.start(self._cancel_recheck_ms)
     
     def disconnect_from_server(self):
         """Trennt die Verbindung zum ESXi Server"""
@@ -543,33 +922,57 @@ class VMwareBackupGUI(QMainWindow):
         self.disconnect_button.setEnabled(False)
         self.start_backup_button.setEnabled(False)
         self.vm_list.clear()
+        self._checked_vms.clear()
         self.restore_datastore_combo.clear()
     
-    def refresh_vms(self):
-        """Aktualisiert die VM-Liste"""
+    def refresh_vms(self, refresh: bool = False):
+        """
+        Aktualisiert die VM-Liste
+        
+        Args:
+            refresh: VM-Cache des Backup-Managers umgehen
+        """
         if not self.backup_manager:
             return
         
+        self.run_in_background(
+            self.backup_manager.get_vm_names,
+            self._populate_vm_list,
+            lambda message: self.log(f"Fehler beim Abrufen der VMs: {message}"),
+            refresh
+        )
+    
+    def _populate_vm_list(self, vm_names: list):
+        """Füllt die VM-Liste mit den abgerufenen VM-Namen"""
+        # Liste ohne Zwischen-Layouts und Signale neu aufbauen
+        self.vm_list.setUpdatesEnabled(False)
+        self.vm_list.blockSignals(True)
         self.vm_list.clear()
+        self._checked_vms.clear()
         try:
-            vms = self.backup_manager.get_vms()
-            for vm in vms:
-                item = QListWidgetItem(vm.name)
+            for vm_name in vm_names:
+                item = QListWidgetItem(vm_name)
                 item.setCheckState(Qt.CheckState.Unchecked)
                 self.vm_list.addItem(item)
-            self.log(f"{len(vms)} VMs gefunden")
+            self.log(f"{len(vm_names)} VMs gefunden")
         except Exception as e:
             self.log(f"Fehler beim Abrufen der VMs: {str(e)}")
+        finally:
+            self.vm_list.blockSignals(False)
+            self.vm_list.setUpdatesEnabled(True)
+            self.vm_list.viewport().update()
+    
+    def _on_vm_toggled(self, item: QListWidgetItem):
+        """Hält die Menge der angehakten VMs beim Umschalten aktuell"""
+        if item.checkState() == Qt.CheckState.Checked:
+            self._checked_vms.add(item.text())
+        else:
+            self._checked_vms.discard(item.text())
     
     def browse_backup_dir(self):
         """Öffnet Dialog zur Auswahl des Backup-Verzeichnisses"""
-        directory = QFileDialog.getExistingDirectory(
-            self,
-            "Backup-Verzeichnis wählen",
-            str(Path.home())
-        )
-        if directory:
-            self.backup_dir_input.setText(directory)
+        if self._backup_dir_dialog.exec():
+            self.backup_dir_input.setText(self._backup_dir_dialog.selectedFiles()[0])
     
     def start_backup(self):
         """Startet den Backup-Vorgang"""
@@ -601,23 +1004,20 @@ class VMwareBackupGUI(QMainWindow):
             return
         
         # Ausgewählte VMs ermitteln
-        selected_vms = []
-        for i in range(self.vm_list.count()):
-            item = self.vm_list.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                selected_vms.append(item.text())
-        
-        # Backup-Thread starten
-        self.backup_thread = BackupThread(
+        selected_vms = list(self._checked_vms)
+        
+        # Backup im Thread-Pool starten
+        self.backup_runnable = BackupRunnable(
             self.backup_manager,
             backup_dir,
             backup_host,
             backup_vms,
-            selected_vms if selected_vms else None
+            selected_vms if selected_vms else None,
+            feedback_queue=self._feedback_queue
         )
-        self.backup_thread.progress.connect(self.log)
-        self.backup_thread.finished.connect(self.backup_finished)
-        self.backup_thread.start()
+        self._connect_worker_signals(self.backup_runnable.signals, self.backup_finished)
+        self._feedback_timer.start()
+        QThreadPool.globalInstance().start(self.backup_runnable)
         
         # UI aktualisieren
         self.start_backup_button.setEnabled(False)
@@ -626,8 +1026,14 @@ class VMwareBackupGUI(QMainWindow):
         self.progress_bar.setRange(0, 0)  # Unbestimmter Fortschritt
         self.log("Backup gestartet...")
     
+    @pyqtSlot(bool, str)
     def backup_finished(self, success: bool, message: str):
         """Wird aufgerufen, wenn der Backup-Vorgang abgeschlossen ist"""
+        if self.backup_runnable:
+            self._disconnect_worker_signals(self.backup_runnable.signals, self.backup_finished)
+        self.backup_runnable = None
+        self._finish_feedback()
+        self._cancel_check_timer.stop()
         self.progress_bar.setVisible(False)
         self.start_backup_button.setEnabled(True)
         self.cancel_backup_button.setEnabled(False)
@@ -668,8 +1074,11 @@ class VMwareBackupGUI(QMainWindow):
         backups_group = QGroupBox("Verfügbare Backups")
         backups_layout = QVBoxLayout()
         
-        self.backups_list = QListWidget()
-        self.backups_list.itemDoubleClicked.connect(self.on_backup_selected)
+        self.backups_model = BackupListModel(self)
+        self.backups_list = QListView()
+        self.backups_list.setModel(self.backups_model)
+        self.backups_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.backups_list.doubleClicked.connect(self.on_backup_selected)
         backups_layout.addWidget(self.backups_list)
         
         backups_group.setLayout(backups_layout)
@@ -688,7 +1097,6 @@ class VMwareBackupGUI(QMainWindow):
         restore_options_layout.addLayout(vm_name_layout)
         
         # Datastore-Auswahl
-        from PyQt6.QtWidgets import QComboBox
         datastore_layout = QHBoxLayout()
         datastore_layout.addWidget(QLabel("Datastore:"))
         self.restore_datastore_combo = QComboBox()
@@ -696,7 +1104,7 @@ class VMwareBackupGUI(QMainWindow):
         restore_options_layout.addLayout(datastore_layout)
         
         refresh_datastores_button = QPushButton("Datastores aktualisieren")
-        refresh_datastores_button.clicked.connect(self.refresh_datastores)
+        refresh_datastores_button.clicked.connect(lambda: self.refresh_datastores(refresh=True))
         restore_options_layout.addWidget(refresh_datastores_button)
         
         restore_options_group.setLayout(restore_options_layout)
@@ -727,13 +1135,8 @@ class VMwareBackupGUI(QMainWindow):
     
     def browse_restore_backup_dir(self):
         """Öffnet Dialog zur Auswahl des Backup-Verzeichnisses"""
-        directory = QFileDialog.getExistingDirectory(
-            self,
-            "Backup-Verzeichnis wählen",
-            str(Path.home())
-        )
-        if directory:
-            self.restore_backup_dir_input.setText(directory)
+        if self._restore_dir_dialog.exec():
+            self.restore_backup_dir_input.setText(self._restore_dir_dialog.selectedFiles()[0])
             self.scan_backups()
     
     def scan_backups(self):
@@ -751,32 +1154,20 @@ class VMwareBackupGUI(QMainWindow):
         
         # Verwende Restore-Manager zum Scannen (auch ohne Verbindung möglich)
         if not self.restore_manager:
+            from vmware_restore import VMwareRestore
             self.restore_manager = VMwareRestore("", "", "")
         
-        backups = self.restore_manager.scan_backup_directory(backup_dir)
-        
-        self.backups_list.clear()
-        self.backup_data = {}
-        
-        for backup in backups:
-            backup_type = backup['type']
-            backup_name = backup['name']
-            backup_info = backup['info']
-            
-            if backup_type == 'vm':
-                display_name = f"VM: {backup_info.get('name', backup_name)}"
-                details = f"OS: {backup_info.get('guest_os', 'Unknown')}, "
-                details += f"RAM: {backup_info.get('memory_mb', 0)}MB, "
-                details += f"CPU: {backup_info.get('num_cpu', 0)}"
-            else:
-                display_name = f"Host: {backup_info.get('name', backup_name)}"
-                details = f"Version: {backup_info.get('version', 'Unknown')}"
-            
-            item_text = f"{display_name} ({backup['timestamp'] or 'Unbekannt'})"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, backup['path'])
-            self.backups_list.addItem(item)
-            self.backup_data[backup['path']] = backup
+        self.run_in_background(
+            self.restore_manager.scan_backup_directory,
+            self._on_backups_scanned,
+            lambda message: self.log(f"Fehler beim Scannen der Backups: {message}"),
+            backup_dir
+        )
+    
+    def _on_backups_scanned(self, backups: list):
+        """Zeigt die gescannten Backups an"""
+        # Ein Modell-Reset statt einzelner Listeneinträge
+        self.backups_model.set_backups(backups)
         
         self.log(f"{len(backups)} Backups gefunden")
         
@@ -785,87 +1176,137 @@ class VMwareBackupGUI(QMainWindow):
         self.restore_host_button.setEnabled(has_backups)
         self.restore_vm_button.setEnabled(has_backups)
     
-    def on_backup_selected(self, item):
+    def on_backup_selected(self, index: QModelIndex):
         """Wird aufgerufen, wenn ein Backup ausgewählt wird"""
-        backup_path = item.data(Qt.ItemDataRole.UserRole)
-        if backup_path in self.backup_data:
-            backup = self.backup_data[backup_path]
-            if backup['type'] == 'vm':
-                self.restore_vm_name_input.setText(backup['info'].get('name', ''))
-    
-    def refresh_datastores(self):
-        """Aktualisiert die Datastore-Liste"""
+        backup = index.data(Qt.ItemDataRole.UserRole)
+        if backup and backup['type'] == 'vm':
+            self.restore_vm_name_input.setText(backup['info'].get('name', ''))
+    
+    def refresh_datastores(self, refresh: bool = False):
+        """
+        Aktualisiert die Datastore-Liste
+        
+        Args:
+            refresh: Zwischengespeicherte Datastores ignorieren
+        """
         if not self.restore_manager or not self.restore_manager.content:
             QMessageBox.warning(self, "Fehler", "Bitte verbinden Sie sich zuerst mit dem Server.")
             return
         
+        self.run_in_background(
+            self.restore_manager.get_datastore_names,
+            self._populate_datastore_combo,
+            lambda message: self.log(f"Fehler beim Abrufen der Datastores: {message}"),
+            refresh
+        )
+    
+    def _populate_datastore_combo(self, datastore_names: list):
+        """Füllt die Datastore-Auswahl"""
         self.restore_datastore_combo.clear()
-        try:
-            datastores = self.restore_manager._get_datastores()
-            for ds in datastores:
-                self.restore_datastore_combo.addItem(ds.name)
-            self.log(f"{len(datastores)} Datastores gefunden")
-        except Exception as e:
-            self.log(f"Fehler beim Abrufen der Datastores: {str(e)}")
+        self.restore_datastore_combo.addItems(datastore_names)
+        self.log(f"{len(datastore_names)} Datastores gefunden")
     
-    def start_host_restore(self):
-        """Startet die Host-Wiederherstellung"""
-        selected_items = self.backups_list.selectedItems()
-        if not selected_items:
+    def _selected_backup(self, expected_type: str) -> Optional[dict]:
+        """
+        Prüft die Backup-Auswahl und die Verbindung vor einer Wiederherstellung
+        
+        Args:
+            expected_type: Erwarteter Backup-Typ ('host' oder 'vm')
+            
+        Returns:
+            Backup-Dictionary oder None (Fehlermeldung wurde bereits angezeigt)
+        """
+        selected_indexes = self.backups_list.selectionModel().selectedIndexes()
+        if not selected_indexes:
             QMessageBox.warning(self, "Fehler", "Bitte wählen Sie ein Backup aus.")
-            return
+            return None
         
-        backup_path = selected_items[0].data(Qt.ItemDataRole.UserRole)
-        backup = self.backup_data.get(backup_path)
+        backup = selected_indexes[0].data(Qt.ItemDataRole.UserRole)
         
-        if not backup or backup['type'] != 'host':
-            QMessageBox.warning(self, "Fehler", "Bitte wählen Sie ein Host-Backup aus.")
-            return
+        if not backup or backup['type'] != expected_type:
+            label = "Host" if expected_type == 'host' else "VM"
+            QMessageBox.warning(self, "Fehler", f"Bitte wählen Sie ein {label}-Backup aus.")
+            return None
         
         if not self.restore_manager:
             QMessageBox.warning(self, "Fehler", "Bitte verbinden Sie sich zuerst mit dem Server.")
-            return
+            return None
         
-        reply = QMessageBox.question(
-            self,
-            "Bestätigung",
-            f"Möchten Sie die Host-Konfiguration wirklich wiederherstellen?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        return backup
+    
+    def _confirm_async(self, title: str, text: str, on_yes: Callable):
+        """
+        Zeigt eine Ja/Nein-Abfrage, ohne die Ereignisschleife zu blockieren
+        
+        Args:
+            title: Fenstertitel
+            text: Frage
+            on_yes: Wird aufgerufen, wenn der Benutzer mit Ja bestätigt
+        """
+        box = QMessageBox(
+            QMessageBox.Icon.Question,
+            title,
+            text,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            self
         )
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
-        if reply == QMessageBox.StandardButton.Yes:
-            self.restore_thread = RestoreThread(
-                self.restore_manager,
-                backup_path,
-                'host'
-            )
-            self.restore_thread.progress.connect(self.log)
-            self.restore_thread.finished.connect(self.restore_finished)
-            self.restore_thread.start()
-            
-            self.restore_host_button.setEnabled(False)
-            self.restore_vm_button.setEnabled(False)
-            self.cancel_restore_button.setEnabled(True)
-            self.progress_bar.setVisible(True)
+        def on_finished(_result: int):
+            if box.standardButton(box.clickedButton()) == QMessageBox.StandardButton.Yes:
+                on_yes()
+        
+        box.finished.connect(on_finished)
+        box.open()
+    
+    def _launch_restore(self, backup_path: str, restore_type: str, *args):
+        """
+        Startet eine Wiederherstellung im Thread-Pool und aktualisiert die UI
+        
+        Args:
+            backup_path: Pfad zum Backup-Verzeichnis
+            restore_type: 'host' oder 'vm'
+            *args: Weitere Argumente für RestoreRunnable (Name, Datastore)
+        """
+        self.restore_runnable = RestoreRunnable(
+            self.restore_manager,
+            backup_path,
+            restore_type,
+            *args,
+            feedback_queue=self._feedback_queue
+        )
+        self._connect_worker_signals(self.restore_runnable.signals, self.restore_finished)
+        self._feedback_timer.start()
+        QThreadPool.globalInstance().start(self.restore_runnable)
+        
+        self.restore_host_button.setEnabled(False)
+        self.restore_vm_button.setEnabled(False)
+        self.cancel_restore_button.setEnabled(True)
+        self.progress_bar.setVisible(True)
+        if restore_type == 'vm':
+            self.progress_bar.setRange(0, 100)  # Prozent aus Upload und vSphere-Task
+            self.progress_bar.setValue(0)
+            self.log("VM-Wiederherstellung gestartet...")
+        else:
             self.progress_bar.setRange(0, 0)
             self.log("Host-Wiederherstellung gestartet...")
     
-    def start_vm_restore(self):
-        """Startet die VM-Wiederherstellung"""
-        selected_items = self.backups_list.selectedItems()
-        if not selected_items:
-            QMessageBox.warning(self, "Fehler", "Bitte wählen Sie ein Backup aus.")
-            return
-        
-        backup_path = selected_items[0].data(Qt.ItemDataRole.UserRole)
-        backup = self.backup_data.get(backup_path)
-        
-        if not backup or backup['type'] != 'vm':
-            QMessageBox.warning(self, "Fehler", "Bitte wählen Sie ein VM-Backup aus.")
+    def start_host_restore(self):
+        """Startet die Host-Wiederherstellung"""
+        backup = self._selected_backup('host')
+        if not backup:
             return
         
-        if not self.restore_manager:
-            QMessageBox.warning(self, "Fehler", "Bitte verbinden Sie sich zuerst mit dem Server.")
+        self._confirm_async(
+            "Bestätigung",
+            f"Möchten Sie die Host-Konfiguration wirklich wiederherstellen?",
+            lambda: self._launch_restore(backup['path'], 'host')
+        )
+    
+    def start_vm_restore(self):
+        """Startet die VM-Wiederherstellung"""
+        backup = self._selected_backup('vm')
+        if not backup:
             return
         
         # Datastore auswählen
@@ -876,42 +1317,32 @@ class VMwareBackupGUI(QMainWindow):
         datastore_name = self.restore_datastore_combo.currentText()
         new_vm_name = self.restore_vm_name_input.text().strip() or None
         
-        reply = QMessageBox.question(
-            self,
+        self._confirm_async(
             "Bestätigung",
             f"Möchten Sie die VM wirklich wiederherstellen?\n"
             f"Name: {new_vm_name or backup['info'].get('name', 'Original')}\n"
             f"Datastore: {datastore_name}",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            lambda: self._launch_restore(backup['path'], 'vm', new_vm_name, datastore_name)
         )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            self.restore_thread = RestoreThread(
-                self.restore_manager,
-                backup_path,
-                'vm',
-                new_vm_name,
-                datastore_name
-            )
-            self.restore_thread.progress.connect(self.log)
-            self.restore_thread.finished.connect(self.restore_finished)
-            self.restore_thread.start()
-            
-            self.restore_host_button.setEnabled(False)
-            self.restore_vm_button.setEnabled(False)
-            self.cancel_restore_button.setEnabled(True)
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, 0)
-            self.log("VM-Wiederherstellung gestartet...")
     
     def cancel_restore(self):
         """Bricht die Wiederherstellung ab"""
-        if self.restore_thread and self.restore_thread.isRunning():
-            self.restore_thread.terminate()
+        if self.restore_runnable and not self.restore_runnable.is_cancelled():
+            self.restore_runnable.cancel()
             self.log("Wiederherstellung wird abgebrochen...")
     
+    @pyqtSlot(bool, str)
     def restore_finished(self, success: bool, message: str):
-        """Wird aufgerufen, wenn die Wiederherstellung abgeschlossen ist"""
+        """
+        Wird aufgerufen, wenn die Wiederherstellung abgeschlossen ist
+        
+        Läuft ausschließlich im GUI-Thread: das finished-Signal des Workers
+        ist als QueuedConnection verbunden.
+        """
+        if self.restore_runnable:
+            self._disconnect_worker_signals(self.restore_runnable.signals, self.restore_finished)
+        self.restore_runnable = None
+        self._finish_feedback()
         self.progress_bar.setVisible(False)
         self.restore_host_button.setEnabled(True)
         self.restore_vm_button.setEnabled(True)
@@ -4,12 +4,8 @@ VMware ESXi Backup Tool - Hauptanwendung
 Startet die GUI-Anwendung
 """
 
-import sys
-import os
-
-# Füge das aktuelle Verzeichnis zum Python-Pfad hinzu
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
+# Das Skriptverzeichnis steht beim Start über "python3 main.py" bereits
+# an erster Stelle in sys.path, gui.py wird daher direkt gefunden
 from gui import main
 
 if __name__ == '__main__':
@@ -5,15 +5,22 @@ Speichert und verwaltet ESXi Server-Verbindungsdaten
 
 import json
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
-from cryptography.fernet import Fernet
+from typing import TYPE_CHECKING, List, Dict, Optional
 import base64
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
 
 class ServerConfigManager:
     """Verwaltet gespeicherte ESXi Server-Konfigurationen"""
     
+    KEYRING_SERVICE = 'vmware_backup'  # Dienstname im System-Schlüsselbund
+    CIPHER_PREFIX = 'fer1:'  # Kennzeichnet Fernet-verschlüsselte Passwörter
+    LEGACY_CIPHER_PREFIX = 'gAAAAA'  # Fernet-Token ohne Kennzeichnung (ältere Versionen)
+    
     def __init__(self, config_file: str = None):
         """
         Initialisiert den Server-Konfigurations-Manager
@@ -29,34 +36,77 @@ class ServerConfigManager:
         
         self.config_file = config_file
         self.key_file = config_file.replace('.json', '.key')
+        self._cache = None  # Geladene Server nach Name (Passwörter verschlüsselt)
+        self._cache_mtime = None  # st_mtime_ns der Datei beim Laden
+        # Speichern und Löschen laufen in Pool-Threads: Lesen, Ändern und
+        # Schreiben von Datei und Cache dürfen sich nicht überlappen
+        self._lock = threading.RLock()
+        self._cipher = None  # Fernet-Instanz, erst bei Bedarf erstellt
+        self._keyring = None  # keyring-Modul, erst bei Bedarf geladen
+        self._keyring_loaded = False
         self._ensure_key()
     
+    def _get_keyring(self):
+        """
+        Lädt das optionale keyring-Modul (z.B. macOS-Schlüsselbund) beim ersten Zugriff
+        
+        Returns:
+            keyring-Modul oder None, falls nicht installiert
+        """
+        if not self._keyring_loaded:
+            self._keyring_loaded = True
+            try:
+                import keyring
+                self._keyring = keyring
+            except ImportError:
+                self._keyring = None
+        return self._keyring
+    
     def _ensure_key(self):
         """Stellt sicher, dass ein Verschlüsselungsschlüssel existiert"""
         if not os.path.exists(self.key_file):
-            # Erstelle neuen Schlüssel
-            key = Fernet.generate_key()
+            # Erstelle neuen Schlüssel (gleiches Format wie Fernet.generate_key,
+            # ohne cryptography schon beim Start laden zu müssen)
+            key = base64.urlsafe_b64encode(os.urandom(32))
             with open(self.key_file, 'wb') as f:
                 f.write(key)
     
-    def _get_cipher(self) -> Fernet:
-        """Gibt den Verschlüsselungscipher zurück"""
-        with open(self.key_file, 'rb') as f:
-            key = f.read()
-        return Fernet(key)
+    def _get_cipher(self) -> 'Fernet':
+        """Gibt den Verschlüsselungscipher zurück (beim ersten Aufruf erstellt)"""
+        if self._cipher is None:
+            from cryptography.fernet import Fernet
+            with open(self.key_file, 'rb') as f:
+                key = f.read()
+            self._cipher = Fernet(key)
+        return self._cipher
     
     def _encrypt_password(self, password: str) -> str:
         """Verschlüsselt ein Passwort"""
         cipher = self._get_cipher()
-        return cipher.encrypt(password.encode()).decode()
+        return self.CIPHER_PREFIX + cipher.encrypt(password.encode()).decode()
     
     def _decrypt_password(self, encrypted_password: str) -> str:
         """Entschlüsselt ein Passwort"""
+        if encrypted_password.startswith(self.CIPHER_PREFIX):
+            token = encrypted_password[len(self.CIPHER_PREFIX):]
+            cipher = self._get_cipher()
+            from cryptography.fernet import InvalidToken
+            try:
+                return cipher.decrypt(token.encode()).decode()
+            except InvalidToken:
+                # Schlüssel passt nicht (mehr) - Passwort muss neu eingegeben werden
+                print(f"Passwort konnte nicht entschlüsselt werden (Schlüssel {self.key_file} passt nicht)")
+                return ""
+        
+        if not encrypted_password.startswith(self.LEGACY_CIPHER_PREFIX):
+            # Unverschlüsseltes Passwort, Fernet muss nicht bemüht werden
+            return encrypted_password
+        
         try:
             cipher = self._get_cipher()
             return cipher.decrypt(encrypted_password.encode()).decode()
         except Exception:
-            # Falls Entschlüsselung fehlschlägt, könnte es ein unverschlüsseltes Passwort sein
+            # Sieht nur wie ein Token aus - unverschlüsseltes Passwort
             return encrypted_password
     
     def save_server(self, name: str, host: str, port: int, user: str, 
@@ -76,30 +126,29 @@ class ServerConfigManager:
             True bei Erfolg, False sonst
         """
         try:
-            servers = self.load_servers()
-            
-            # Prüfe, ob Server bereits existiert
-            server_exists = any(s['name'] == name for s in servers)
-            
-            server_data = {
-                'name': name,
-                'host': host,
-                'port': port,
-                'user': user,
-                'password': self._encrypt_password(password),
-                'description': description
-            }
-            
-            if server_exists:
-                # Aktualisiere existierenden Server
-                servers = [s if s['name'] != name else server_data for s in servers]
-            else:
-                # Füge neuen Server hinzu
-                servers.append(server_data)
-            
-            # Speichere zurück
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(servers, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                servers = dict(self._load_raw())
+                
+                server_data = {
+                    'name': name,
+                    'host': host,
+                    'port': port,
+                    'user': user,
+                    'description': description
+                }
+                
+                # Passwort bevorzugt im System-Schlüsselbund ablegen, sonst Fernet
+                if self._store_in_keyring(name, password):
+                    server_data['keyring'] = True
+                else:
+                    server_data['password'] = self._encrypt_password(password)
+                
+                # Aktualisiere existierenden oder füge neuen Server hinzu
+                # (bestehende Server behalten ihre Position)
+                servers[name] = server_data
+                
+                # Speichere zurück
+                self._write_servers(servers)
             
             return True
             
@@ -107,43 +156,125 @@ class ServerConfigManager:
             print(f"Fehler beim Speichern des Servers: {str(e)}")
             return False
     
-    def load_servers(self) -> List[Dict]:
+    def _write_servers(self, servers: Dict[str, Dict]):
         """
-        Lädt alle gespeicherten Server
+        Schreibt die Server-Liste atomar und übernimmt sie direkt in den Cache
         
-        Returns:
-            Liste von Server-Dictionaries
+        Der Aufrufer muss self._lock halten, da die temporäre Datei einen
+        festen Namen hat.
+        
+        Args:
+            servers: Server-Dictionaries nach Name, mit verschlüsselten Passwörtern
         """
-        if not os.path.exists(self.config_file):
-            return []
+        # Erst in temporäre Datei schreiben, dann ersetzen - ein Abbruch
+        # hinterlässt so nie eine halb geschriebene Konfiguration
+        tmp_file = self.config_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(list(servers.values()), f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_file, self.config_file)
         
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                servers = json.load(f)
+        self._cache = servers
+        self._cache_mtime = os.stat(self.config_file).st_mtime_ns
+    
+    def _load_raw(self) -> Dict[str, Dict]:
+        """
+        Lädt alle gespeicherten Server ohne die Passwörter zu entschlüsseln
+        
+        Das zurückgegebene Dictionary ist der Cache selbst und darf nicht
+        verändert werden; schreibende Methoden arbeiten auf einer Kopie.
+        
+        Returns:
+            Server-Dictionaries nach Name, mit verschlüsselten Passwörtern
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.config_file).st_mtime_ns
+            except FileNotFoundError:
+                return {}
             
-            # Entschlüssele Passwörter beim Laden
-            for server in servers:
-                if 'password' in server:
-                    server['password'] = self._decrypt_password(server['password'])
+            # Unveränderte Datei: Ergebnis aus dem Cache liefern
+            if self._cache is not None and mtime == self._cache_mtime:
+                return self._cache
             
-            return servers
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    servers = {server['name']: server for server in json.load(f)}
+                
+                self._cache = servers
+                self._cache_mtime = mtime
+                return servers
+                
+            except Exception as e:
+                print(f"Fehler beim Laden der Server: {str(e)}")
+                return {}
+    
+    def _store_in_keyring(self, name: str, password: str) -> bool:
+        """
+        Legt ein Passwort im System-Schlüsselbund ab
+        
+        Args:
+            name: Name des Servers
+            password: Passwort
             
-        except Exception as e:
-            print(f"Fehler beim Laden der Server: {str(e)}")
-            return []
+        Returns:
+            True bei Erfolg, False wenn kein Schlüsselbund verfügbar ist
+        """
+        keyring = self._get_keyring()
+        if not keyring:
+            return False
+        try:
+            keyring.set_password(self.KEYRING_SERVICE, name, password)
+            return True
+        except Exception:
+            # Kein nutzbares Schlüsselbund-Backend
+            return False
+    
+    def _decrypted(self, server: Dict) -> Dict:
+        """Gibt eine Kopie des Servers mit entschlüsseltem Passwort zurück"""
+        if server.get('keyring'):
+            password = None
+            keyring = self._get_keyring()
+            if keyring:
+                try:
+                    password = keyring.get_password(self.KEYRING_SERVICE, server['name'])
+                except Exception:
+                    pass
+            decrypted = {k: v for k, v in server.items() if k != 'keyring'}
+            decrypted['password'] = password or ""
+            return decrypted
+        if 'password' not in server:
+            return dict(server)
+        return {**server, 'password': self._decrypt_password(server['password'])}
+    
+    def load_servers(self, decrypt: bool = False) -> List[Dict]:
+        """
+        Lädt alle gespeicherten Server
+        
+        Args:
+            decrypt: Passwörter entschlüsseln (sonst bleiben sie verschlüsselt)
+        
+        Returns:
+            Liste von Server-Dictionaries
+        """
+        servers = self._load_raw().values()
+        if decrypt:
+            return [self._decrypted(s) for s in servers]
+        return list(servers)
     
     def get_server(self, name: str) -> Optional[Dict]:
         """
         Lädt einen spezifischen Server
         
+        Nur das Passwort dieses Servers wird entschlüsselt.
+        
         Args:
             name: Name des Servers
             
         Returns:
             Server-Dictionary oder None
         """
-        servers = self.load_servers()
-        return next((s for s in servers if s['name'] == name), None)
+        server = self._load_raw().get(name)
+        return self._decrypted(server) if server else None
     
     def delete_server(self, name: str) -> bool:
         """
@@ -156,11 +287,18 @@ class ServerConfigManager:
             True bei Erfolg, False sonst
         """
         try:
-            servers = self.load_servers()
-            servers = [s for s in servers if s['name'] != name]
+            with self._lock:
+                servers = dict(self._load_raw())
+                removed = servers.pop(name, None)
+                
+                self._write_servers(servers)
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(servers, f, indent=2, ensure_ascii=False)
+            # Passwort auch aus dem Schlüsselbund entfernen
+            if removed and removed.get('keyring') and self._get_keyring():
+                try:
+                    self._keyring.delete_password(self.KEYRING_SERVICE, name)
+                except Exception:
+                    pass
             
             return True
             
@@ -175,5 +313,4 @@ class ServerConfigManager:
         Returns:
             Liste von Server-Namen
         """
-        servers = self.load_servers()
-        return [s['name'] for s in servers]
+        return list(self._load_raw())
@@ -5,17 +5,356 @@ Handhabt die Verbindung und Sicherung von ESXi Servern
 
 import ssl
 import os
+import fcntl
+import itertools
+import random
+import re
+import json
+import shlex
 import shutil
+import socket
+import tarfile
+import threading
+import time
+import traceback
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 from pyVim.connect import SmartConnect, Disconnect
 from pyVmomi import vim, vmodl
 
+try:
+    import orjson  # Optional: schnellere JSON-Serialisierung
+except ImportError:
+    orjson = None
+
+try:
+    import paramiko  # Für SSH/SFTP-Downloads
+except ImportError:
+    paramiko = None
+
+try:
+    # Optional: libssh2 entschlüsselt in C, deutlich schneller als paramiko
+    from ssh2.session import Session as Libssh2Session
+    from ssh2.sftp import LIBSSH2_FXF_READ, LIBSSH2_SFTP_S_IRUSR
+except ImportError:
+    Libssh2Session = None
+
+try:
+    import requests  # Für HTTP-Downloads über den Datastore-Browser
+    import urllib3
+    from requests.auth import HTTPBasicAuth
+    # Vorübergehende Fehler, nach denen eine Anfrage wiederholt wird
+    _HTTP_TRANSIENT_ERRORS = (requests.exceptions.ConnectionError,
+                              requests.exceptions.ChunkedEncodingError,
+                              requests.exceptions.Timeout)
+except ImportError:
+    requests = None
+    _HTTP_TRANSIENT_ERRORS = ()
+
+
+# Datastore-Präfix eines Pfads: "[datastore1] vm/vm.vmdk" -> "vm/vm.vmdk"
+_DS_PREFIX_RE = re.compile(r'\[.*?\]\s*(.+)')
+
+
+# Extent-Zeilen im VMDK-Descriptor: RW <Sektoren> VMFS "<Name>-flat.vmdk"
+_EXTENT_VMFS_RE = re.compile(r'RW\s+\d+\s+VMFS\s+"([^"]+)"')
+_EXTENT_FLAT_RE = re.compile(r'RW\s+\d+\s+\w+\s+"([^"]+-flat\.vmdk)"')
+
+# HTML-Fehlerseiten und Text-Fehlermeldungen in den ersten Bytes einer HTTP-Antwort
+_ERR_RE = re.compile(rb'(?i)<html|<!doctype|not\s*found|\b404\b|forbidden|unauthorized|\berror\b')
+
+# SSL-Kontext ohne Zertifikatsprüfung (selbstsignierte ESXi-Zertifikate), einmal
+# erzeugt und bei jedem connect() wiederverwendet
+_UNVERIFIED_SSL_CONTEXT = ssl._create_unverified_context()
+
+
+def _strip_ds(path: str) -> str:
+    """Entfernt das [Datastore]-Präfix eines Datastore-Pfads"""
+    match = _DS_PREFIX_RE.match(path)
+    return match.group(1).strip() if match else path
+
+
+@lru_cache(maxsize=128)
+def _flat_extent_name(data: bytes, original_path: str) -> str:
+    """
+    Sucht in einem VMDK-Descriptor den Namen der Daten-Datei (-flat.vmdk)
+    
+    Descriptoren ändern sich während eines Backups nicht; das Ergebnis wird
+    daher pro (Inhalt, Pfad) zwischengespeichert, z.B. für den erneuten
+    Versuch nach einem fehlgeschlagenen Download.
+    
+    Args:
+        data: Inhalt der Descriptor-Datei
+        original_path: Original-Pfad der VMDK-Datei
+        
+    Returns:
+        Name der -flat.vmdk Datei
+    """
+    # Zeilenweise suchen und bei der ersten VMFS-Extent-Zeile aufhören;
+    # eingebettete Descriptoren stehen zwischen Binärdaten
+    alternative = None
+    for line in data.decode('utf-8', errors='replace').splitlines():
+        if 'RW' not in line:
+            continue
+        # Format: RW <sectors> VMFS "<filename>-flat.vmdk"
+        match = _EXTENT_VMFS_RE.search(line)
+        if match:
+            return match.group(1)
+        # Alternative: andere Extent-Typen mit -flat.vmdk Datei
+        if alternative is None:
+            match = _EXTENT_FLAT_RE.search(line)
+            if match:
+                alternative = match.group(1)
+    
+    if alternative:
+        return alternative
+    
+    # Falls nicht gefunden, konstruiere den Namen basierend auf dem Original-Namen
+    base_name = os.path.splitext(os.path.basename(original_path))[0]
+    return f"{base_name}-flat.vmdk"
+
+
+def _dump_json(obj, path: str):
+    """Schreibt obj eingerückt als UTF-8-JSON, mit orjson falls installiert"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+# Blockgröße für lokale Schreibvorgänge: wenige große Syscalls statt vieler kleiner
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+def _open_backup_file(path: str):
+    """
+    Öffnet eine lokale Zieldatei für große Downloads zum Schreiben
+    
+    Der Puffer hat die Größe eines Kopierblocks, so werden auch kleinere
+    Schreibvorgänge zu Syscalls von _COPY_BUFFER_SIZE zusammengefasst. Unter
+    macOS wird der Page-Cache per F_NOCACHE umgangen: die Daten werden nur
+    einmal geschrieben und nicht wieder gelesen, sollen also keinen
+    Arbeitsspeicher verdrängen.
+    """
+    f = open(path, 'wb', buffering=_COPY_BUFFER_SIZE)
+    no_cache = getattr(fcntl, 'F_NOCACHE', None)
+    if no_cache is not None:
+        try:
+            fcntl.fcntl(f.fileno(), no_cache, 1)
+        except OSError:
+            pass
+    return f
+
+
+# Vergleichsblock für die Erkennung von Null-Blöcken beim Schreiben
+_ZERO_BLOCK = bytes(_COPY_BUFFER_SIZE)
+
+
+def _is_zero_block(chunk: bytes) -> bool:
+    """
+    Prüft, ob ein Datenblock nur aus Nullbytes besteht
+    
+    bytes-Vergleiche laufen als memcmp in C; Blöcke mit Daten am Anfang oder
+    Ende werden vorab ohne Vergleich und ohne Slice-Kopie aussortiert.
+    """
+    size = len(chunk)
+    if not size:
+        return False
+    if chunk[0] or chunk[-1]:
+        return False
+    if size == len(_ZERO_BLOCK):
+        return chunk == _ZERO_BLOCK
+    if size < len(_ZERO_BLOCK):
+        return chunk == _ZERO_BLOCK[:size]
+    return chunk == bytes(size)
+
+
+def _write_sparse(file, chunk: bytes):
+    """
+    Schreibt einen Block, überspringt Null-Blöcke aber per seek
+    
+    Die übersprungenen Bereiche bleiben Löcher einer Sparse-Datei; der
+    Aufrufer muss am Ende file.truncate() aufrufen, damit auch ein Null-Block
+    am Dateiende die Länge festlegt.
+    """
+    if _is_zero_block(chunk):
+        file.seek(len(chunk), os.SEEK_CUR)
+    else:
+        file.write(chunk)
+
+
+def _backoff_delay(attempt: int, max_delay: float = 30.0) -> float:
+    """
+    Wartezeit vor einem erneuten Versuch: exponentiell wachsend mit Zufallsanteil,
+    damit parallele Downloads den Server nicht gleichzeitig wieder anfragen
+    
+    Args:
+        attempt: Nummer des fehlgeschlagenen Versuchs (ab 0)
+        max_delay: Obergrenze in Sekunden
+        
+    Returns:
+        Wartezeit in Sekunden
+    """
+    return min(max_delay, 2.0 ** attempt) * (1 + random.uniform(0, 0.5))
+
+
+class _RateLimiter:
+    """Lässt Fortschrittsmeldungen aus Transfer-Schleifen höchstens alle interval Sekunden durch"""
+    
+    def __init__(self, interval: float = 0.25):
+        self._interval = interval
+        self._last = 0.0
+    
+    def ready(self, force: bool = False) -> bool:
+        """
+        Args:
+            force: Immer durchlassen (z.B. beim letzten Block)
+            
+        Returns:
+            True, wenn jetzt gemeldet werden soll
+        """
+        now = time.monotonic()
+        if force or now - self._last >= self._interval:
+            self._last = now
+            return True
+        return False
+
+
+class _CancellableReader:
+    """Lesbares Dateiobjekt, das bei Cancel abbricht und Fortschritt meldet"""
+    
+    def __init__(self, stream, is_cancelled, on_read=None):
+        self._stream = stream
+        self._is_cancelled = is_cancelled
+        self._on_read = on_read
+        self._limiter = _RateLimiter()
+        self.bytes_read = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        if self._is_cancelled():
+            raise IOError("Download abgebrochen")
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        # tarfile liest in kleinen Blöcken - Fortschritt nur gedrosselt melden
+        if self._on_read and self._limiter.ready(not data):
+            self._on_read(self.bytes_read)
+        return data
+
+
+class _FileBusyError(Exception):
+    """Die Datei ist auf dem ESXi Server gesperrt (Device or resource busy)"""
+
+
+class _ChannelReader:
+    """Liest die Ausgabe eines SSH-Kanals in vollen Blöcken, mit regelmäßiger Cancel-Prüfung"""
+    
+    def __init__(self, channel, is_cancelled, timeout: float = 1.0):
+        self._channel = channel
+        self._is_cancelled = is_cancelled
+        # Das Timeout lässt recv regelmäßig für die Cancel-Prüfung zurückkehren
+        channel.settimeout(timeout)
+    
+    def read(self, size: int) -> bytes:
+        parts = []
+        remaining = size
+        while remaining > 0:
+            try:
+                data = self._channel.recv(remaining)
+            except socket.timeout:
+                if self._is_cancelled():
+                    raise IOError("Download abgebrochen")
+                continue
+            if not data:
+                break  # EOF
+            parts.append(data)
+            remaining -= len(data)
+        return b''.join(parts)
+
+
+class _SparseWriter:
+    """Schreibziel für shutil.copyfileobj, das Null-Blöcke als Löcher überspringt"""
+    
+    def __init__(self, file):
+        self._file = file
+    
+    def write(self, chunk: bytes):
+        _write_sparse(self._file, chunk)
+
+
+if requests is not None:
+    class _TLSAdapter(requests.adapters.HTTPAdapter):
+        """HTTPAdapter, dessen Verbindungen sich einen vorab erzeugten SSLContext teilen"""
+        
+        def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+            # Vor super().__init__ setzen, das bereits init_poolmanager aufruft
+            self._ssl_context = ssl_context
+            super().__init__(**kwargs)
+        
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = self._ssl_context
+            super().init_poolmanager(*args, **kwargs)
+
 
 class VMwareBackup:
     """Klasse zur Verwaltung von VMware ESXi Backups"""
     
-    def __init__(self, host: str, user: str, password: str, port: int = 443):
+    VM_CACHE_TTL = 30  # Gültigkeit der VM-Liste in Sekunden
+    SSH_PORTS = [22, 2222]  # Standard-Port und häufige Alternative
+    SSH_KEEPALIVE_INTERVAL = 30  # Sekunden zwischen SSH-Keepalives
+    SSH_STALL_TIMEOUT = 120  # Sekunden ohne Antwort, nach denen ein libssh2-Download aufgibt
+    SSH_WINDOW_SIZE = 2 ** 27  # 128 MiB Kanal-Fenster statt paramikos 2 MiB
+    SSH_MAX_PACKET_SIZE = 2 ** 19  # 512 KiB Pakete
+    # CBC-Modi und 3DES sind auf beiden Seiten deutlich langsamer als aes128-ctr/-gcm
+    SSH_SLOW_CIPHERS = ['3des-cbc', 'blowfish-cbc', 'aes128-cbc', 'aes192-cbc', 'aes256-cbc']
+    SFTP_BUFFER_SIZE = 1024 * 1024  # Puffer pro geöffneter Remote-Datei
+    # 256 KiB pro READ-Anfrage statt 32 KiB; größere Anfragen kürzt der sftp-server
+    # des ESXi (OpenSSH) auf 256 KiB, was paramikos Prefetch aus dem Tritt bringt
+    SFTP_MAX_REQUEST_SIZE = 2 ** 18
+    BACKUP_CONCURRENCY = 3  # Gleichzeitig gesicherte VMs
+    DISK_CONCURRENCY = 4  # Gleichzeitig geladene Festplatten/Daten-Dateien pro VM (unter MaxSessions)
+    DESCRIPTOR_MAX_SIZE = 64 * 1024  # Größere .vmdk-Dateien sind keine Text-Descriptoren
+    USE_CHANGE_TRACKING = True  # Laufende VMs über CBT nur belegte Bereiche lesen lassen
+    CBT_READ_BATCH = 16  # Gleichzeitig angeforderte Blöcke pro readv-Aufruf
+    SFTP_PARALLEL_THRESHOLD = 64 * 1024 * 1024  # Ab dieser Größe parallel herunterladen
+    SFTP_PARALLEL_WORKERS = 16  # Gleichzeitige Lese-Handles pro Datei
+    SFTP_PARALLEL_CHUNK = 4 * 1024 * 1024  # Blockgröße pro Lesevorgang
+    SFTP_PARALLEL_STREAMS = 4  # Max. SSH-Verbindungen pro Datei (eine je angefangenem GiB)
+    # Zusätzliche Verbindungen aller gleichzeitig geladenen Dateien zusammen; bei
+    # mehreren VMs und Festplatten sonst Dutzende Handshakes (sshd MaxStartups)
+    SFTP_EXTRA_STREAMS_TOTAL = SFTP_PARALLEL_STREAMS - 1
+    SFTP_READV_CHUNKS = 4  # Blöcke, deren READ-Anfragen ein Worker gleichzeitig offen hält
+    HTTP_POOL_SIZE = 16  # Offene HTTPS-Verbindungen zum ESXi Server
+    HTTP_RANGE_STREAMS = 4  # Gleichzeitige Range-Anfragen pro großer Datei
+    HTTP_RETRIES = 3  # Wiederholungen bei vorübergehenden HTTP-Fehlern
+    HTTP_RETRY_STATUS = (500, 502, 503, 504)  # Statuscodes, die wiederholt werden
+    HTTP_COMPAT_URLS = False  # Zusätzlich abweichende /folder-URL-Formate probieren
+    # Eigenschaften, die pro VM in einem PropertyCollector-Aufruf gelesen werden
+    VM_PROPERTIES = [
+        'name',
+        'config.uuid',
+        'config.guestFullName',
+        'config.hardware.memoryMB',
+        'config.hardware.numCPU',
+        'runtime.powerState',
+        'config.hardware.device',
+        'config.changeTrackingEnabled',
+    ]
+    HOST_PROPERTIES = [
+        'name',
+        'config.product',
+        'hardware.systemInfo',
+        'hardware.cpuInfo.numCpuCores',
+        'hardware.memorySize',
+        'runtime.connectionState',
+        'runtime.powerState',
+    ]
+    
+    def __init__(self, host: str, user: str, password: str, port: int = 443,
+                 ssh_compression: bool = False):
         """
         Initialisiert die Verbindung zum ESXi Server
         
@@ -24,42 +363,186 @@ class VMwareBackup:
             user: Benutzername
             password: Passwort
             port: Port (Standard: 443)
+            ssh_compression: zlib-Kompression für SSH-Übertragungen (Standard: aus; bremst im LAN, nur für langsame Leitungen)
         """
         self.host = host
         self.user = user
         self.password = password
         self.port = port
+        self.ssh_compression = ssh_compression
         self.service_instance = None
         self.content = None
-        self._cancel_flag = None  # Referenz zum Cancel-Flag vom Thread
-        self._active_ssh_connection = None  # Aktive SSH-Verbindung für Cancel
-        self._active_scp_session = None  # Aktive SCP-Session für Cancel
+        self._cancel_flag = None  # Referenz zum Cancel-Flag vom Runnable
+        self._ssh_clients = {}  # Thread-ID -> wiederverwendete SSH-Verbindung
+        self._sftp_clients = {}  # Thread-ID -> SFTP-Session auf dieser Verbindung
+        self._ssh_lock = threading.Lock()
+        self._raw_sockets = set()  # Sockets der libssh2-Downloads, für cancel_backup()
+        self._stream_slots = threading.BoundedSemaphore(self.SFTP_EXTRA_STREAMS_TOTAL)
+        self._vm_cache = None  # Zwischengespeicherte VM-Eigenschaften (VM -> Dict)
+        self._vm_cache_ts = 0.0  # Zeitpunkt (monotonic) des letzten Abrufs
+        self._property_collectors = {}  # Thread-ID -> eigener PropertyCollector
+        self._datastores = None  # Zwischengespeicherte Datastores (Name -> Datastore)
+        self._datacenter_name: Optional[str] = None  # Zwischengespeicherter Datacenter-Name
+        self._sftp_workers = self.SFTP_PARALLEL_WORKERS  # Lese-Handles pro Datei
+        self._http_session = None  # Wiederverwendete HTTPS-Session für Datastore-Downloads
+        self._working_template: Optional[str] = None  # Zuletzt erfolgreiches URL-Format
     
-    def set_cancel_flag(self, thread):
-        """Setzt das Cancel-Flag vom Thread"""
-        self._cancel_flag = thread
+    def set_cancel_flag(self, runnable):
+        """Setzt das Cancel-Flag vom Runnable"""
+        self._cancel_flag = runnable
     
     def cancel_backup(self):
         """Bricht den aktuellen Backup-Vorgang ab"""
-        # Schließe aktive SSH-Verbindungen
-        if self._active_ssh_connection:
+        # Laufende Übertragungen enden mit dem Schließen der SSH-Verbindung
+        self._close_ssh()
+    
+    def _get_ssh(self, progress_callback=None, key=None):
+        """
+        Liefert die SSH-Verbindung des aufrufenden Threads zum ESXi Server
+        
+        Eine bestehende Verbindung wird wiederverwendet, solange ihr Transport
+        aktiv ist; sonst wird eine neue aufgebaut. Jeder Thread erhält eine
+        eigene Verbindung, damit parallel gesicherte VMs nicht denselben
+        TCP-Strom teilen. Geschlossen werden sie nur von cancel_backup() und
+        disconnect().
+        
+        Args:
+            progress_callback: Optional Callback für Verbindungsmeldungen
+            key: Optional Schlüssel für eine zusätzliche Verbindung (Standard: Thread-ID)
+            
+        Returns:
+            Verbundener paramiko.SSHClient
+            
+        Raises:
+            Exception: Wenn auf keinem Port eine Verbindung zustande kommt
+        """
+        thread_id = threading.get_ident() if key is None else key
+        ssh = self._ssh_clients.get(thread_id)
+        if ssh is not None:
+            transport = ssh.get_transport()
+            if transport is not None and transport.is_active():
+                return ssh
+            self._drop_ssh(thread_id)
+        
+        if paramiko is None:
+            raise ImportError("paramiko-Bibliothek fehlt")
+        
+        disabled_algorithms = {'ciphers': self.SSH_SLOW_CIPHERS}
+        if not self.ssh_compression:
+            # Auch dann keine Kompression, wenn der Server sie bevorzugt
+            disabled_algorithms['compression'] = ['zlib', 'zlib@openssh.com']
+        
+        last_error = None
+        for ssh_port in self.SSH_PORTS:
+            if self._is_cancelled():
+                raise IOError("Backup wurde abgebrochen")
+            
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            # Schon vor dem Verbindungsaufbau registrieren, damit cancel_backup()
+            # auch einen laufenden Handshake abbrechen kann
+            with self._ssh_lock:
+                self._ssh_clients[thread_id] = ssh
             try:
-                self._active_ssh_connection.close()
-            except:
-                pass
-            self._active_ssh_connection = None
+                if progress_callback:
+                    progress_callback(f"Versuche SSH-Verbindung auf Port {ssh_port}...")
+                ssh.connect(
+                    self.host,
+                    username=self.user,
+                    password=self.password,
+                    port=ssh_port,
+                    timeout=10,
+                    allow_agent=False,
+                    look_for_keys=False,
+                    compress=self.ssh_compression,
+                    disabled_algorithms=disabled_algorithms
+                )
+            except Exception as e:
+                self._drop_ssh(thread_id)
+                last_error = e
+                continue
+            
+            if self._is_cancelled():
+                self._drop_ssh(thread_id)
+                raise IOError("Backup wurde abgebrochen")
+            
+            transport = ssh.get_transport()
+            transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # SFTP-Anfragen sind kleine Pakete; nicht auf Nagle-Pufferung warten.
+            # SO_RCVBUF bleibt bewusst unverändert: ein fester Wert schaltet die
+            # Puffer-Autotuning des Betriebssystems ab.
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport.set_keepalive(self.SSH_KEEPALIVE_INTERVAL)
+            # Gilt für alle danach geöffneten Kanäle (exec, SFTP); das kleine
+            # Standardfenster begrenzt sonst den Durchsatz bei hoher Latenz
+            transport.default_window_size = self.SSH_WINDOW_SIZE
+            transport.default_max_packet_size = self.SSH_MAX_PACKET_SIZE
+            if progress_callback:
+                progress_callback(f"SSH-Verbindung erfolgreich auf Port {ssh_port}")
+                cipher = getattr(transport, 'remote_cipher', None) or 'unbekannt'
+                compression = getattr(transport, 'remote_compression', None) or 'none'
+                progress_callback(f"SSH-Verschlüsselung: {cipher}, Kompression: {compression}")
+            return ssh
         
-        if self._active_scp_session:
+        raise last_error
+    
+    def _open_remote(self, sftp, remote_path: str):
+        """
+        Öffnet eine Remote-Datei zum Lesen mit großem Puffer und großen READ-Anfragen
+        
+        Args:
+            sftp: Offene SFTPClient-Session
+            remote_path: Pfad auf dem ESXi Server
+            
+        Returns:
+            SFTPFile
+        """
+        remote_file = sftp.open(remote_path, 'rb', bufsize=self.SFTP_BUFFER_SIZE)
+        if hasattr(remote_file, 'MAX_REQUEST_SIZE'):
+            remote_file.MAX_REQUEST_SIZE = self.SFTP_MAX_REQUEST_SIZE
+        return remote_file
+    
+    def _get_sftp(self, key=None):
+        """Liefert die SFTP-Session auf der SSH-Verbindung des aufrufenden Threads (oder zu key)"""
+        ssh = self._get_ssh(key=key)
+        thread_id = threading.get_ident() if key is None else key
+        sftp = self._sftp_clients.get(thread_id)
+        if sftp is None or sftp.get_channel().closed:
+            sftp = ssh.open_sftp()
+            with self._ssh_lock:
+                self._sftp_clients[thread_id] = sftp
+        return sftp
+    
+    def _drop_ssh(self, thread_id: int):
+        """Schließt SFTP-Session und SSH-Verbindung eines Threads"""
+        with self._ssh_lock:
+            connections = (self._sftp_clients.pop(thread_id, None),
+                           self._ssh_clients.pop(thread_id, None))
+        for connection in connections:
+            if connection is not None:
+                try:
+                    connection.close()
+                except:
+                    pass
+    
+    def _close_ssh(self):
+        """Schließt alle SFTP-Sessions und SSH-Verbindungen"""
+        with self._ssh_lock:
+            thread_ids = set(self._ssh_clients) | set(self._sftp_clients)
+            raw_sockets = list(self._raw_sockets)
+        for thread_id in thread_ids:
+            self._drop_ssh(thread_id)
+        # shutdown() weckt auch libssh2-Aufrufe auf, die blockierend auf dem Socket lesen
+        for sock in raw_sockets:
             try:
-                self._active_scp_session.close()
-            except:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
                 pass
-            self._active_scp_session = None
     
     def _is_cancelled(self) -> bool:
         """Prüft, ob der Backup-Vorgang abgebrochen wurde"""
         if self._cancel_flag:
-            return self._cancel_flag._cancel
+            return self._cancel_flag.is_cancelled()
         return False
         
     def connect(self) -> bool:
@@ -70,18 +553,17 @@ class VMwareBackup:
             True bei erfolgreicher Verbindung, False sonst
         """
         try:
-            # SSL-Zertifikat-Validierung umgehen (für selbstsignierte Zertifikate)
-            context = ssl._create_unverified_context()
-            
             self.service_instance = SmartConnect(
                 host=self.host,
                 user=self.user,
                 pwd=self.password,
                 port=self.port,
-                sslContext=context
+                sslContext=_UNVERIFIED_SSL_CONTEXT
             )
             
             self.content = self.service_instance.RetrieveContent()
+            # Neue Sitzung - gecachte Objekte gehören zur alten Verbindung
+            self.invalidate_cache()
             return True
             
         except Exception as e:
@@ -92,6 +574,100 @@ class VMwareBackup:
         """Trennt die Verbindung zum ESXi Server"""
         if self.service_instance:
             Disconnect(self.service_instance)
+        self._close_ssh()
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+        self.invalidate_cache()
+    
+    def _get_http_session(self):
+        """
+        Liefert die HTTPS-Session für Datastore-Downloads
+        
+        Die Session wird einmal angelegt und hält Verbindungen offen, so fallen
+        TCP- und TLS-Handshake nicht für jede Datei erneut an.
+        
+        Returns:
+            requests.Session
+        """
+        if self._http_session is None:
+            # SSL-Warnungen unterdrücken (selbstsignierte Zertifikate)
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(self.user, self.password)
+            session.verify = False
+            adapter = _TLSAdapter(_UNVERIFIED_SSL_CONTEXT,
+                                  pool_connections=8, pool_maxsize=self.HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            self._http_session = session
+        return self._http_session
+    
+    def invalidate_cache(self):
+        """Verwirft alle zwischengespeicherten Inventar-Objekte der Sitzung"""
+        self.invalidate_vm_cache()
+        self._datastores = None
+        self._datacenter_name = None
+        self._property_collectors.clear()
+    
+    def invalidate_vm_cache(self):
+        """Verwirft die zwischengespeicherte VM-Liste"""
+        self._vm_cache = None
+        self._vm_cache_ts = 0.0
+    
+    def _get_property_collector(self) -> vmodl.query.PropertyCollector:
+        """
+        Liefert den PropertyCollector des aufrufenden Threads
+        
+        Der Collector wird einmal pro Verbindung und Thread angelegt und für
+        alle Task-Wartevorgänge wiederverwendet, damit Filter anderer Aufrufer
+        (auch parallel gesicherter VMs) nicht in die Updates hineinlaufen.
+        """
+        thread_id = threading.get_ident()
+        collector = self._property_collectors.get(thread_id)
+        if collector is None:
+            collector = self.content.propertyCollector.CreatePropertyCollector()
+            self._property_collectors[thread_id] = collector
+        return collector
+    
+    def _wait_for_task(self, task: vim.Task) -> str:
+        """
+        Wartet blockierend auf das Ende eines Tasks
+        
+        Statt task.info.state zu pollen, wartet WaitForUpdatesEx, bis der
+        Server eine Zustandsänderung meldet.
+        
+        Args:
+            task: vSphere-Task
+            
+        Returns:
+            Endzustand des Tasks ('success' oder 'error')
+        """
+        collector = self._get_property_collector()
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+            objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=task)],
+            propSet=[vmodl.query.PropertyCollector.PropertySpec(
+                type=vim.Task,
+                pathSet=['info.state']
+            )]
+        )
+        property_filter = collector.CreateFilter(filter_spec, partialUpdates=True)
+        
+        try:
+            version = ''
+            state = None
+            while state not in (vim.TaskInfo.State.success, vim.TaskInfo.State.error):
+                update = collector.WaitForUpdatesEx(version)
+                if update is None:
+                    continue
+                version = update.version
+                for filter_update in update.filterSet:
+                    for object_update in filter_update.objectSet:
+                        for change in object_update.changeSet:
+                            if change.name == 'info.state':
+                                state = change.val
+            return state
+        finally:
+            property_filter.Destroy()
     
     def get_hosts(self) -> List[vim.HostSystem]:
         """
@@ -112,24 +688,127 @@ class VMwareBackup:
         host_view.Destroy()
         return hosts
     
-    def get_vms(self) -> List[vim.VirtualMachine]:
+    def get_vms(self, refresh: bool = False, names=None) -> List[vim.VirtualMachine]:
         """
         Ruft alle VMs vom ESXi Server ab
         
+        Das ungefilterte Ergebnis wird samt VM_PROPERTIES für VM_CACHE_TTL
+        Sekunden zwischengespeichert.
+        
+        Args:
+            refresh: Cache ignorieren und Inventar neu abrufen
+            names: Nur VMs mit diesen Namen zurückgeben (optional)
+        
         Returns:
             Liste von VirtualMachine-Objekten
         """
         if not self.content:
             return []
         
-        vm_view = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder,
-            [vim.VirtualMachine],
-            True
-        )
-        vms = vm_view.view
-        vm_view.Destroy()
-        return vms
+        if names is not None:
+            # Nur die Namen per PropertyCollector abrufen statt jede VM einzeln abzufragen
+            wanted = names if isinstance(names, (set, frozenset)) else set(names)
+            return [vm for vm, name in self._get_vm_names() if name in wanted]
+        
+        return list(self._get_vm_inventory(refresh))
+    
+    def get_vm_names(self, refresh: bool = False) -> List[str]:
+        """
+        Ruft die Namen aller VMs aus dem zwischengespeicherten Inventar ab
+        
+        Args:
+            refresh: Cache ignorieren und Inventar neu abrufen
+        
+        Returns:
+            Liste der VM-Namen
+        """
+        if not self.content:
+            return []
+        return [props['name'] for props in self._get_vm_inventory(refresh).values()
+                if 'name' in props]
+    
+    def _get_vm_inventory(self, refresh: bool = False) -> Dict:
+        """
+        Liefert VM_PROPERTIES aller VMs, zwischengespeichert für VM_CACHE_TTL Sekunden
+        
+        Args:
+            refresh: Cache ignorieren und Inventar neu abrufen
+        
+        Returns:
+            Dictionary VirtualMachine -> Eigenschaften
+        """
+        if (not refresh and self._vm_cache is not None
+                and time.monotonic() - self._vm_cache_ts < self.VM_CACHE_TTL):
+            return self._vm_cache
+        
+        self._vm_cache = self._retrieve_properties(vim.VirtualMachine, self.VM_PROPERTIES)
+        self._vm_cache_ts = time.monotonic()
+        return self._vm_cache
+    
+    def _get_vm_names(self) -> List[tuple]:
+        """
+        Ruft alle VMs zusammen mit ihrem Namen in einem PropertyCollector-Aufruf ab
+        
+        Returns:
+            Liste von (VirtualMachine, Name)-Tupeln
+        """
+        return [(vm, props['name'])
+                for vm, props in self._retrieve_properties(vim.VirtualMachine, ['name']).items()
+                if 'name' in props]
+    
+    def _retrieve_properties(self, obj_type, path_set: List[str], obj=None) -> Dict:
+        """
+        Liest mehrere Eigenschaften in einem einzigen RetrieveContents-Aufruf
+        
+        Jeder Attributzugriff auf ein Managed Object ist sonst ein eigener
+        SOAP-Roundtrip.
+        
+        Args:
+            obj_type: vim-Typ der Objekte (z.B. vim.VirtualMachine)
+            path_set: Abzurufende Eigenschaftspfade
+            obj: Einzelnes Objekt; ohne Angabe alle Objekte des Typs im Inventar
+        
+        Returns:
+            Dictionary Objekt -> {Pfad: Wert}; nicht gesetzte Eigenschaften fehlen
+        """
+        view = None
+        if obj is not None:
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=obj, skip=False)
+        else:
+            view = self.content.viewManager.CreateContainerView(
+                self.content.rootFolder,
+                [obj_type],
+                True
+            )
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+                name='traverseView',
+                path='view',
+                skip=False,
+                type=vim.view.ContainerView
+            )
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(
+                obj=view,
+                skip=True,
+                selectSet=[traversal_spec]
+            )
+        
+        try:
+            property_spec = vmodl.query.PropertyCollector.PropertySpec(
+                type=obj_type,
+                pathSet=path_set,
+                all=False
+            )
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+                objectSet=[object_spec],
+                propSet=[property_spec]
+            )
+            results = self.content.propertyCollector.RetrieveContents([filter_spec])
+        finally:
+            if view is not None:
+                view.Destroy()
+        
+        return {result.obj: {prop.name: prop.val for prop in result.propSet}
+                for result in results}
     
     def get_host_info(self, host: vim.HostSystem) -> Dict:
         """
@@ -141,17 +820,20 @@ class VMwareBackup:
         Returns:
             Dictionary mit Host-Informationen
         """
+        props = self._retrieve_properties(vim.HostSystem, self.HOST_PROPERTIES, host).get(host, {})
+        product = props['config.product']
+        system_info = props['hardware.systemInfo']
         return {
-            'name': host.name,
-            'version': host.config.product.version,
-            'build': host.config.product.build,
-            'vendor': host.config.product.vendor,
-            'model': host.hardware.systemInfo.model,
-            'cpu_cores': host.hardware.cpuInfo.numCpuCores,
-            'memory_mb': host.hardware.memorySize // (1024 * 1024),
-            'uuid': host.hardware.systemInfo.uuid,
-            'connection_state': str(host.runtime.connectionState),
-            'power_state': str(host.runtime.powerState),
+            'name': props['name'],
+            'version': product.version,
+            'build': product.build,
+            'vendor': product.vendor,
+            'model': system_info.model,
+            'cpu_cores': props['hardware.cpuInfo.numCpuCores'],
+            'memory_mb': props['hardware.memorySize'] // (1024 * 1024),
+            'uuid': system_info.uuid,
+            'connection_state': str(props['runtime.connectionState']),
+            'power_state': str(props['runtime.powerState']),
         }
     
     def backup_host_config(self, host: vim.HostSystem, backup_dir: str) -> bool:
@@ -173,29 +855,39 @@ class VMwareBackup:
             os.makedirs(host_backup_dir, exist_ok=True)
             
             # Host-Informationen speichern
-            import json
             config_file = os.path.join(host_backup_dir, 'host_config.json')
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(host_info, f, indent=2, ensure_ascii=False)
+            _dump_json(host_info, config_file)
             
             # Host-Konfiguration exportieren (falls verfügbar)
             try:
+                # Nur die benötigten Teilbäume in einem Aufruf lesen statt host.config mehrfach
+                props = self._retrieve_properties(
+                    vim.HostSystem, ['config.network.dnsConfig', 'config.dateTimeInfo'], host
+                ).get(host, {})
+                try:
+                    dns = list(props['config.network.dnsConfig'].addressHostName)
+                except (KeyError, AttributeError):
+                    dns = []
+                try:
+                    timezone = props['config.dateTimeInfo'].timeZone.name
+                except (KeyError, AttributeError):
+                    timezone = None
+                
                 # Versuche Host-Profile zu exportieren
                 host_config = {
                     'config': {
                         'network': {
-                            'dns': list(host.config.network.dnsConfig.addressHostName) if hasattr(host.config.network.dnsConfig, 'addressHostName') else [],
+                            'dns': dns,
                             'ip_routes': []
                         },
                         'datetime': {
-                            'timezone': host.config.dateTimeInfo.timeZone.name if hasattr(host.config.dateTimeInfo, 'timeZone') else None
+                            'timezone': timezone
                         }
                     }
                 }
                 
                 config_details_file = os.path.join(host_backup_dir, 'host_config_details.json')
-                with open(config_details_file, 'w', encoding='utf-8') as f:
-                    json.dump(host_config, f, indent=2, ensure_ascii=False)
+                _dump_json(host_config, config_details_file)
             except Exception as e:
                 print(f"Warnung: Konnte einige Host-Konfigurationsdetails nicht exportieren: {str(e)}")
             
@@ -205,19 +897,26 @@ class VMwareBackup:
             print(f"Fehler beim Sichern der Host-Konfiguration: {str(e)}")
             return False
     
-    def get_vm_disks(self, vm: vim.VirtualMachine) -> List[Dict]:
+    def get_vm_disks(self, vm: vim.VirtualMachine, devices=None) -> List[Dict]:
         """
         Ruft alle Festplatten einer VM ab
         
         Args:
             vm: VirtualMachine-Objekt
+            devices: Bereits abgerufene Geräteliste (config.hardware.device), optional
             
         Returns:
             Liste von Festplatten-Informationen
         """
+        if devices is None and vm.config and vm.config.hardware:
+            devices = vm.config.hardware.device
+        
+        # Datastore-Namen aus dem Cache statt einem Roundtrip pro backing.datastore.name
+        datastore_names = {datastore: name for name, datastore in self._get_datastores_by_name().items()}
+        
         disks = []
-        if vm.config and vm.config.hardware and vm.config.hardware.device:
-            for device in vm.config.hardware.device:
+        if devices:
+            for device in devices:
                 if isinstance(device, vim.vm.device.VirtualDisk):
                     disk_info = {
                         'label': device.deviceInfo.label if device.deviceInfo else 'Unknown',
@@ -225,16 +924,70 @@ class VMwareBackup:
                         'backing': {}
                     }
                     
-                    if device.backing:
-                        if hasattr(device.backing, 'fileName'):
-                            disk_info['backing']['fileName'] = device.backing.fileName
-                        if hasattr(device.backing, 'datastore'):
-                            if device.backing.datastore:
-                                disk_info['backing']['datastore'] = device.backing.datastore.name
+                    backing = device.backing
+                    if backing:
+                        try:
+                            disk_info['backing']['fileName'] = backing.fileName
+                        except AttributeError:
+                            pass
+                        try:
+                            datastore = backing.datastore
+                        except AttributeError:
+                            datastore = None
+                        if datastore:
+                            name = datastore_names.get(datastore)
+                            disk_info['backing']['datastore'] = name if name is not None else datastore.name
                     
                     disks.append(disk_info)
         return disks
     
+    def backup_vms(self, vms: List[vim.VirtualMachine], backup_dir: str, progress_callback=None,
+                   max_concurrency: int = None, on_vm_finished=None) -> Dict:
+        """
+        Sichert mehrere VMs gleichzeitig
+        
+        Jede VM läuft in einem eigenen Thread mit eigener SSH-Verbindung, so
+        überlappen Lese-Latenz auf dem ESXi Server und Netzwerkübertragung
+        verschiedener VMs. Die parallelen Lese-Handles pro Datei werden durch
+        die Anzahl gleichzeitiger VMs geteilt, damit die Summe der offenen
+        Anfragen nicht mit der Parallelität wächst.
+        
+        Args:
+            vms: Zu sichernde VirtualMachine-Objekte
+            backup_dir: Zielverzeichnis für Backup
+            progress_callback: Optional thread-sicherer Callback für Fortschritt
+            max_concurrency: Gleichzeitige VMs (Standard: BACKUP_CONCURRENCY)
+            on_vm_finished: Optional Callback (vm, erfolgreich) nach jeder VM
+            
+        Returns:
+            Dictionary VirtualMachine -> True bei Erfolg, False sonst
+        """
+        concurrency = max(1, min(max_concurrency or self.BACKUP_CONCURRENCY, len(vms) or 1))
+        total_vms = len(vms)
+        worker_ids = set()
+        
+        def backup_one(index: int, vm: vim.VirtualMachine) -> bool:
+            worker_ids.add(threading.get_ident())
+            if self._is_cancelled():
+                return False
+            if progress_callback:
+                progress_callback(f"Sichere VM {vm.name} ({index + 1}/{total_vms})...")
+            result = self.backup_vmdk(vm, backup_dir, progress_callback)
+            if on_vm_finished:
+                on_vm_finished(vm, result)
+            return result
+        
+        self._sftp_workers = max(2, self.SFTP_PARALLEL_WORKERS // concurrency)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = {executor.submit(backup_one, idx, vm): vm for idx, vm in enumerate(vms)}
+                return {futures[future]: future.result() for future in futures}
+        finally:
+            self._sftp_workers = self.SFTP_PARALLEL_WORKERS
+            # Die Worker-Threads sind beendet, ihre Verbindungen werden nicht mehr gebraucht
+            for thread_id in worker_ids:
+                self._drop_ssh(thread_id)
+    
     def backup_vmdk(self, vm: vim.VirtualMachine, backup_dir: str, progress_callback=None) -> bool:
         """
         Sichert VMDK-Dateien einer VM
@@ -248,45 +1001,67 @@ class VMwareBackup:
             True bei Erfolg, False sonst
         """
         try:
-            vm_name = vm.name.replace(' ', '_')
+            # Alle benötigten Eigenschaften in einem Aufruf lesen
+            props = self._retrieve_properties(vim.VirtualMachine, self.VM_PROPERTIES, vm).get(vm, {})
+            display_name = props.get('name', '')
+            vm_name = display_name.replace(' ', '_')
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             vm_backup_dir = os.path.join(backup_dir, f"{vm_name}_{timestamp}")
             os.makedirs(vm_backup_dir, exist_ok=True)
             
             # Prüfe VM-Status
-            power_state = str(vm.runtime.powerState)
+            power_state = str(props.get('runtime.powerState'))
             is_running = power_state == "poweredOn"
             was_powered_on = is_running
             
+            if is_running and self.USE_CHANGE_TRACKING and not props.get('config.changeTrackingEnabled'):
+                # Muss vor dem Snapshot aktiv sein, damit dieser CBT-Daten liefert
+                self._enable_change_tracking(vm, progress_callback)
+            
             if is_running and progress_callback:
-                progress_callback(f"Warnung: VM {vm.name} läuft.")
+                progress_callback(f"Warnung: VM {display_name} läuft.")
                 progress_callback(f"Versuche Backup mit Snapshot-Methode...")
                 progress_callback(f"Hinweis: Falls Backup fehlschlägt, VM manuell ausschalten und erneut versuchen.")
             
             # VM-Informationen speichern
-            import json
             vm_info = {
-                'name': vm.name,
-                'uuid': vm.config.uuid if vm.config else None,
-                'guest_os': vm.config.guestFullName if vm.config else None,
-                'memory_mb': vm.config.hardware.memoryMB if vm.config else None,
-                'num_cpu': vm.config.hardware.numCPU if vm.config else None,
+                'name': display_name,
+                'uuid': props.get('config.uuid'),
+                'guest_os': props.get('config.guestFullName'),
+                'memory_mb': props.get('config.hardware.memoryMB'),
+                'num_cpu': props.get('config.hardware.numCPU'),
                 'power_state': power_state,
                 'is_running': is_running,
-                'disks': self.get_vm_disks(vm)
+                'disks': self.get_vm_disks(vm, props.get('config.hardware.device', []))
             }
             
             vm_info_file = os.path.join(vm_backup_dir, 'vm_info.json')
-            with open(vm_info_file, 'w', encoding='utf-8') as f:
-                json.dump(vm_info, f, indent=2, ensure_ascii=False)
+            _dump_json(vm_info, vm_info_file)
             
             # VMDK-Dateien sichern über Datastore Browser
             if progress_callback:
-                progress_callback(f"Starte VMDK-Sicherung für {vm.name}...")
+                progress_callback(f"Starte VMDK-Sicherung für {display_name}...")
             
             # Für VMDK-Sicherung benötigen wir Zugriff auf den Datastore
             # Dies erfolgt über den Datastore Browser API
-            datastores = self._get_datastores()
+            datastores = self._get_datastores_by_name()
+            
+            # Ausgeschaltete VMs: alle Festplatten eines Verzeichnisses in einem
+            # tar-Stream über eine SSH-Verbindung laden, Reste gebündelt per SFTP
+            bulk_done = set()
+            if not is_running:
+                bulk_done = self._download_disks_tar(
+                    vm_info['disks'], datastores, vm_backup_dir, progress_callback
+                )
+                if not self._is_cancelled():
+                    bulk_done |= self._download_disks_sftp(
+                        vm_info['disks'], datastores, vm_backup_dir, progress_callback, skip=bulk_done
+                    )
+                if not self._is_cancelled():
+                    # Reste über die Einzel-Methoden, mehrere Festplatten gleichzeitig
+                    bulk_done |= self._download_disks_single(
+                        vm_info['disks'], datastores, vm_backup_dir, progress_callback, skip=bulk_done
+                    )
             
             disks_backed_up = 0
             for disk_info in vm_info['disks']:
@@ -302,7 +1077,7 @@ class VMwareBackup:
                     
                     if file_name:
                         # Finde den Datastore
-                        datastore = next((ds for ds in datastores if ds.name == datastore_name), None)
+                        datastore = datastores.get(datastore_name)
                         if datastore:
                             if progress_callback:
                                 progress_callback(f"Sichere VMDK: {file_name}...")
@@ -341,8 +1116,8 @@ class VMwareBackup:
                                         progress_callback(f"")
                                         progress_callback(f"Hinweis: Die VM läuft weiterhin normal.")
                             else:
-                                # Normales Backup für ausgeschaltete VMs
-                                success = self._download_vmdk(datastore, file_name, vm_backup_dir, progress_callback)
+                                # Ausgeschaltete VMs wurden oben schon gesichert (tar, SFTP, Einzel-Methoden)
+                                success = file_name in bulk_done
                             
                             # Prüfe auf Cancel nach Download
                             if self._is_cancelled():
@@ -357,7 +1132,7 @@ class VMwareBackup:
                                     progress_callback(f"Warnung: Konnte VMDK {file_name} nicht vollständig sichern")
             
             if progress_callback:
-                progress_callback(f"VMDK-Sicherung für {vm.name} abgeschlossen ({disks_backed_up}/{len(vm_info['disks'])} Festplatten)")
+                progress_callback(f"VMDK-Sicherung für {display_name} abgeschlossen ({disks_backed_up}/{len(vm_info['disks'])} Festplatten)")
             
             return True
             
@@ -365,19 +1140,355 @@ class VMwareBackup:
             print(f"Fehler beim Sichern der VMDK: {str(e)}")
             return False
     
-    def _get_datastores(self) -> List[vim.Datastore]:
-        """Ruft alle Datastores ab"""
-        if not self.content:
-            return []
+    def _download_disks_tar(self, disks: List[Dict], datastores: Dict[str, vim.Datastore],
+                            backup_dir: str, progress_callback=None) -> set:
+        """
+        Sichert die Festplatten einer VM verzeichnisweise per tar-Stream
         
-        datastore_view = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder,
-            [vim.Datastore],
-            True
-        )
-        datastores = datastore_view.view
-        datastore_view.Destroy()
-        return datastores
+        Args:
+            disks: Festplatten aus get_vm_disks
+            datastores: Datastores nach Namen (aus _get_datastores_by_name)
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            
+        Returns:
+            Menge der vollständig gesicherten VMDK-Pfade (mit Datastore-Präfix)
+        """
+        # Festplatten nach Datastore und Verzeichnis gruppieren
+        groups = {}
+        for disk_info in disks:
+            backing = disk_info.get('backing', {})
+            file_name = backing.get('fileName', '')
+            if not file_name or 'datastore' not in backing:
+                continue
+            clean_path = _strip_ds(file_name)
+            key = (backing['datastore'], os.path.dirname(clean_path))
+            groups.setdefault(key, []).append((file_name, clean_path))
+        
+        done = set()
+        for (datastore_name, vm_dir), files in groups.items():
+            if self._is_cancelled():
+                break
+            datastore = datastores.get(datastore_name)
+            if datastore:
+                done.update(self._download_vmdk_tar(datastore, vm_dir, files, backup_dir, progress_callback))
+        return done
+    
+    def _download_disks_sftp(self, disks: List[Dict], datastores: Dict[str, vim.Datastore],
+                             backup_dir: str, progress_callback=None, skip=frozenset()) -> set:
+        """
+        Lädt die Festplatten einer VM gebündelt über die gemeinsame SFTP-Session
+        
+        Zuerst werden alle Descriptor-Dateien gleichzeitig auf derselben
+        Session gelesen, sodass sich ihre READ-Anfragen überlappen. Dateien
+        über DESCRIPTOR_MAX_SIZE (z.B. monolithic sparse) oder leere Dateien
+        bleiben den Einzel-Fallbacks überlassen. Danach folgen die Daten-Dateien: kleine (unter SFTP_PARALLEL_THRESHOLD)
+        werden zu DISK_CONCURRENCY gleichzeitig geladen, große nacheinander,
+        da _sftp_download sie ohnehin mit parallelen Handles lädt.
+        Fehlgeschlagene Festplatten übernimmt der Aufrufer mit den
+        Einzel-Fallbacks.
+        
+        Args:
+            disks: Festplatten aus get_vm_disks
+            datastores: Datastores nach Namen (aus _get_datastores_by_name)
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            skip: Bereits gesicherte VMDK-Pfade (mit Datastore-Präfix)
+            
+        Returns:
+            Menge der vollständig gesicherten VMDK-Pfade (mit Datastore-Präfix)
+        """
+        pending = []
+        for disk_info in disks:
+            backing = disk_info.get('backing', {})
+            file_name = backing.get('fileName', '')
+            if not file_name or file_name in skip or 'datastore' not in backing:
+                continue
+            datastore = datastores.get(backing['datastore'])
+            if not datastore:
+                continue
+            clean_path = _strip_ds(file_name)
+            pending.append((file_name, clean_path, f"/vmfs/volumes/{datastore.name}/{clean_path}"))
+        if not pending:
+            return set()
+        
+        try:
+            sftp = self._get_sftp()
+        except Exception:
+            return set()
+        
+        if progress_callback:
+            progress_callback(f"Lade {len(pending)} Festplatten gebündelt per SFTP...")
+        
+        # Descriptoren: gleichzeitig und nur bis knapp über DESCRIPTOR_MAX_SIZE lesen
+        def read_descriptor(remote_path: str) -> bytes:
+            return self._sftp_read_bytes(sftp, remote_path, self.DESCRIPTOR_MAX_SIZE + 1)
+        
+        descriptors = {}
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.DISK_CONCURRENCY, len(pending))) as executor:
+                contents = list(executor.map(read_descriptor, [remote_path for _, _, remote_path in pending]))
+            for (file_name, clean_path, _), data in zip(pending, contents):
+                if not data or len(data) > self.DESCRIPTOR_MAX_SIZE:
+                    continue  # Kein Text-Descriptor - Einzel-Fallbacks übernehmen
+                with open(os.path.join(backup_dir, os.path.basename(clean_path)), 'wb') as local_file:
+                    local_file.write(data)
+                descriptors[file_name] = data
+        except Exception as e:
+            if progress_callback and not self._is_cancelled():
+                progress_callback(f"SFTP-Bündel fehlgeschlagen, lade Dateien einzeln: {str(e)}")
+            return set()
+        
+        # Daten-Dateien mit Größe ermitteln (alle Größen mit einem stat-Aufruf)
+        flat_remotes = []
+        for file_name, clean_path, remote_path in pending:
+            if file_name not in descriptors:
+                continue
+            flat_file = self._parse_vmdk_descriptor_bytes(descriptors[file_name], clean_path)
+            if flat_file:
+                flat_remotes.append((file_name, f"{os.path.dirname(remote_path)}/{os.path.basename(flat_file)}",
+                                     os.path.basename(flat_file)))
+        sizes = self._probe_sizes([flat_remote for _, flat_remote, _ in flat_remotes])
+        
+        flats = []
+        for file_name, flat_remote, flat_name in flat_remotes:
+            try:
+                file_size = sizes[flat_remote] if flat_remote in sizes else sftp.stat(flat_remote).st_size
+            except Exception as e:
+                if progress_callback and not self._is_cancelled():
+                    progress_callback(f"SFTP-Download von {flat_remote} fehlgeschlagen: {str(e)}")
+                continue
+            flats.append((file_name, flat_remote, flat_name, file_size))
+        
+        def download_flat(file_name: str, flat_remote: str, flat_name: str, file_size: int) -> bool:
+            if self._is_cancelled():
+                return False
+            local_path = os.path.join(backup_dir, flat_name)
+            try:
+                if progress_callback:
+                    progress_callback(f"Lade Daten-Datei: {flat_name} ({file_size // (1024*1024)}MB)...")
+                self._sftp_download(sftp, flat_remote, local_path, file_size, flat_name, progress_callback)
+            except Exception as e:
+                if progress_callback and not self._is_cancelled():
+                    progress_callback(f"SFTP-Download von {flat_remote} fehlgeschlagen: {str(e)}")
+                return False
+            return not self._is_cancelled() and os.path.getsize(local_path) == file_size
+        
+        small = [flat for flat in flats if flat[3] < self.SFTP_PARALLEL_THRESHOLD]
+        large = [flat for flat in flats if flat[3] >= self.SFTP_PARALLEL_THRESHOLD]
+        
+        done = set()
+        if small:
+            # Eigene Handles auf derselben SFTP-Session; die Anfragen laufen gemultiplext
+            with ThreadPoolExecutor(max_workers=min(self.DISK_CONCURRENCY, len(small))) as executor:
+                futures = {executor.submit(download_flat, *flat): flat[0] for flat in small}
+                done.update(futures[future] for future in futures if future.result())
+        for flat in large:
+            if self._is_cancelled():
+                break
+            if download_flat(*flat):
+                done.add(flat[0])
+        return done
+    
+    def _probe_sizes(self, remote_paths: List[str]) -> Dict[str, int]:
+        """
+        Ermittelt die Größen mehrerer Remote-Dateien mit einem einzigen stat-Aufruf
+        
+        Ein Kanal statt einem SFTP-stat pro Datei. Fehlende Dateien und
+        Fehler führen nur zu fehlenden Einträgen; der Aufrufer fragt diese
+        dann einzeln per SFTP nach.
+        
+        Args:
+            remote_paths: Pfade auf dem ESXi Server
+            
+        Returns:
+            Dictionary Pfad -> Größe in Bytes
+        """
+        sizes = {}
+        if len(remote_paths) < 2:
+            return sizes  # Ein einzelner SFTP-stat ist nicht teurer
+        try:
+            ssh = self._get_ssh()
+            quoted = " ".join(shlex.quote(path) for path in remote_paths)
+            stdin, stdout, stderr = ssh.exec_command(f"stat -c '%s %n' {quoted} 2>/dev/null")
+            for line in stdout:
+                size, _, path = line.rstrip('\n').partition(' ')
+                if size.isdigit():
+                    sizes[path] = int(size)
+        except Exception:
+            pass
+        return sizes
+    
+    def _download_disks_single(self, disks: List[Dict], datastores: Dict[str, vim.Datastore],
+                               backup_dir: str, progress_callback=None, skip=frozenset()) -> set:
+        """
+        Lädt die übrigen Festplatten einer VM gleichzeitig über _download_vmdk
+        
+        Bis zu DISK_CONCURRENCY Festplatten laufen parallel, jede in einem
+        eigenen Thread mit eigener SSH-Verbindung bzw. eigener Verbindung aus
+        dem HTTPS-Pool. Die Verbindungen der Threads werden danach geschlossen.
+        
+        Args:
+            disks: Festplatten aus get_vm_disks
+            datastores: Datastores nach Namen (aus _get_datastores_by_name)
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            skip: Bereits gesicherte VMDK-Pfade (mit Datastore-Präfix)
+            
+        Returns:
+            Menge der vollständig gesicherten VMDK-Pfade (mit Datastore-Präfix)
+        """
+        pending = []
+        for disk_info in disks:
+            backing = disk_info.get('backing', {})
+            file_name = backing.get('fileName', '')
+            if not file_name or file_name in skip or 'datastore' not in backing:
+                continue
+            datastore = datastores.get(backing['datastore'])
+            if datastore:
+                pending.append((datastore, file_name))
+        if not pending:
+            return set()
+        
+        worker_ids = set()
+        
+        def download(datastore: vim.Datastore, file_name: str) -> bool:
+            worker_ids.add(threading.get_ident())
+            if self._is_cancelled():
+                return False
+            if progress_callback:
+                progress_callback(f"Sichere VMDK: {file_name}...")
+            return self._download_vmdk(datastore, file_name, backup_dir, progress_callback)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.DISK_CONCURRENCY, len(pending))) as executor:
+                futures = {executor.submit(download, *entry): entry[1] for entry in pending}
+                return {futures[future] for future in futures if future.result()}
+        finally:
+            for thread_id in worker_ids:
+                self._drop_ssh(thread_id)
+    
+    def _download_vmdk_tar(self, datastore: vim.Datastore, vm_dir: str, files: List[tuple],
+                           backup_dir: str, progress_callback=None) -> set:
+        """
+        Lädt Descriptor- und Daten-Dateien mehrerer VMDKs in einem tar-Stream herunter
+        
+        Eine SSH-Verbindung und ein Datenstrom statt einer Sitzung pro Datei.
+        Festplatten, die danach nicht vollständig vorliegen, werden vom Aufrufer
+        einzeln nachgeladen.
+        
+        Args:
+            datastore: Datastore-Objekt
+            vm_dir: VM-Verzeichnis auf dem Datastore
+            files: Liste von (VMDK-Pfad mit Präfix, VMDK-Pfad ohne Präfix)
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            
+        Returns:
+            Menge der vollständig gesicherten VMDK-Pfade (mit Datastore-Präfix)
+        """
+        if paramiko is None:
+            return set()
+        
+        remote_dir = f"/vmfs/volumes/{datastore.name}/{vm_dir}"
+        channel = None
+        
+        try:
+            ssh = self._get_ssh()
+            
+            # Vorhandene Dateien ermitteln, damit tar nur existierende Dateien erhält
+            stdin, stdout, stderr = ssh.exec_command(f"ls -1 {shlex.quote(remote_dir)}")
+            remote_files = {line.strip() for line in stdout.read().decode('utf-8', errors='ignore').splitlines()}
+            
+            members = []
+            for _, clean_path in files:
+                descriptor = os.path.basename(clean_path)
+                flat = f"{os.path.splitext(descriptor)[0]}-flat.vmdk"
+                members.extend(name for name in (descriptor, flat) if name in remote_files)
+            if not members:
+                return set()
+            
+            if progress_callback:
+                progress_callback(f"Lade {len(members)} Dateien per tar-Stream aus {vm_dir}...")
+            
+            file_list = " ".join(shlex.quote(name) for name in members)
+            stdin, stdout, stderr = ssh.exec_command(f"tar cf - -C {shlex.quote(remote_dir)} {file_list}")
+            channel = stdout.channel
+            
+            def report(read_bytes: int):
+                if progress_callback:
+                    progress_callback(f"tar-Stream {vm_dir}: {read_bytes // (1024*1024)}MB übertragen")
+            
+            reader = _CancellableReader(stdout, self._is_cancelled, report)
+            wanted = set(members)
+            extracted = set()
+            # Großer Lesepuffer statt tarfiles 10 KiB-Blöcken
+            with tarfile.open(fileobj=reader, mode='r|', bufsize=_COPY_BUFFER_SIZE) as tar:
+                for member in tar:
+                    # Nur angeforderte reguläre Dateien, immer direkt ins Zielverzeichnis
+                    name = os.path.basename(member.name)
+                    if not member.isfile() or name not in wanted:
+                        continue
+                    source = tar.extractfile(member)
+                    with _open_backup_file(os.path.join(backup_dir, name)) as local_file:
+                        # Null-Blöcke bleiben Löcher, statt thin-Disks voll auszuschreiben
+                        shutil.copyfileobj(source, _SparseWriter(local_file), _COPY_BUFFER_SIZE)
+                        local_file.truncate()
+                        written = local_file.tell()
+                    if written == member.size:
+                        extracted.add(name)
+            
+            # Bei einem Fehler kann tar eine Datei mit Nullen aufgefüllt oder mitten im
+            # Eintrag abgebrochen haben - dann alle Dateien einzeln nachladen lassen
+            if stdout.channel.recv_exit_status() != 0:
+                if progress_callback:
+                    progress_callback(f"tar meldete Fehler, lade Dateien einzeln: "
+                                      f"{stderr.read().decode('utf-8', errors='ignore').strip()}")
+                return set()
+            
+            # Nur Festplatten mit vollständigem Descriptor und referenzierter Daten-Datei gelten als gesichert
+            done = set()
+            for file_name, clean_path in files:
+                descriptor = os.path.basename(clean_path)
+                if descriptor not in extracted:
+                    continue
+                flat_file = self._parse_vmdk_descriptor(os.path.join(backup_dir, descriptor), clean_path)
+                if flat_file and os.path.basename(flat_file) in extracted:
+                    done.add(file_name)
+            
+            if progress_callback:
+                progress_callback(f"tar-Stream abgeschlossen: {len(done)}/{len(files)} Festplatten")
+            return done
+            
+        except Exception as e:
+            if progress_callback and not self._is_cancelled():
+                progress_callback(f"tar-Stream fehlgeschlagen, lade Dateien einzeln: {str(e)}")
+            return set()
+        finally:
+            # Nur den tar-Kanal schließen, die SSH-Verbindung bleibt bestehen
+            if channel is not None:
+                channel.close()
+    
+    def _get_datastores_by_name(self, refresh: bool = False) -> Dict[str, vim.Datastore]:
+        """
+        Liefert alle Datastores nach Namen, zwischengespeichert pro Verbindung
+        
+        Die Namen werden in einem PropertyCollector-Aufruf gelesen statt über
+        ds.name je Datastore und Festplatte.
+        
+        Args:
+            refresh: Cache ignorieren und neu abrufen
+            
+        Returns:
+            Dictionary Name -> Datastore
+        """
+        if not self.content:
+            return {}
+        if refresh or self._datastores is None:
+            self._datastores = {props['name']: datastore
+                                for datastore, props in self._retrieve_properties(vim.Datastore, ['name']).items()
+                                if 'name' in props}
+        return self._datastores
     
     def _download_vmdk(self, datastore: vim.Datastore, file_path: str, 
                       backup_dir: str, progress_callback=None) -> bool:
@@ -397,14 +1508,8 @@ class VMwareBackup:
             True bei Erfolg, False sonst
         """
         try:
-            import re
-            
             # Entferne Datastore-Präfix
-            clean_path = file_path
-            if file_path.startswith('['):
-                match = re.match(r'\[.*?\]\s*(.+)', file_path)
-                if match:
-                    clean_path = match.group(1).strip()
+            clean_path = _strip_ds(file_path)
             
             # Prüfe auf Cancel vor Download
             if self._is_cancelled():
@@ -412,7 +1517,13 @@ class VMwareBackup:
                     progress_callback("Backup wurde abgebrochen")
                 return False
             
-            # Versuche zuerst SSH/SCP (zuverlässiger für große Dateien)
+            # Schnellweg: Descriptor im Speicher parsen, Daten-Datei auf derselben SFTP-Session
+            if self._download_vmdk_sftp_pair(datastore, clean_path, backup_dir, progress_callback):
+                return True
+            if self._is_cancelled():
+                return False
+            
+            # Versuche SSH/SCP mit cat/dd-Fallback (auch für gesperrte Dateien)
             if self._download_vmdk_scp(datastore, file_path, backup_dir, progress_callback):
                 # Prüfe auf Cancel nach Descriptor-Download
                 if self._is_cancelled():
@@ -467,7 +1578,6 @@ class VMwareBackup:
                 return True
             
             # Falls beide Methoden fehlschlagen, speichere Metadaten
-            import json
             vmdk_metadata = {
                 'datastore': datastore.name,
                 'file_path': file_path,
@@ -475,16 +1585,10 @@ class VMwareBackup:
                 'note': 'VMDK-Metadaten gesichert. Download nicht verfügbar - möglicherweise Berechtigungsproblem oder HTTP-Datastore-Zugriff nicht aktiviert.'
             }
             
-            file_name = os.path.basename(file_path)
-            if file_name.startswith('['):
-                import re
-                match = re.match(r'\[.*?\]\s*(.+)', file_path)
-                if match:
-                    file_name = os.path.basename(match.group(1).strip())
+            file_name = os.path.basename(_strip_ds(file_path))
             
             metadata_file = os.path.join(backup_dir, f"{file_name}.metadata.json")
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(vmdk_metadata, f, indent=2, ensure_ascii=False)
+            _dump_json(vmdk_metadata, metadata_file)
             
             if progress_callback:
                 progress_callback(f"Metadaten für {file_name} gesichert")
@@ -511,33 +1615,14 @@ class VMwareBackup:
             Liste von Snapshot-Dateipfaden
         """
         try:
-            import re
-            import paramiko
-            
             # Entferne Datastore-Präfix
-            clean_path = original_file
-            if original_file.startswith('['):
-                match = re.match(r'\[.*?\]\s*(.+)', original_file)
-                if match:
-                    clean_path = match.group(1).strip()
+            clean_path = _strip_ds(original_file)
             
             vm_dir = os.path.dirname(clean_path)
             base_name = os.path.splitext(os.path.basename(clean_path))[0]
             
-            # SSH-Verbindung
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
             try:
-                ssh.connect(
-                    self.host,
-                    username=self.user,
-                    password=self.password,
-                    port=22,
-                    timeout=10,
-                    allow_agent=False,
-                    look_for_keys=False
-                )
+                ssh = self._get_ssh()
                 
                 # Suche nach Snapshot-Dateien im VM-Verzeichnis
                 # Snapshot-Dateien haben normalerweise Namen wie: VM-000001.vmdk, VM-000001-delta.vmdk, etc.
@@ -545,30 +1630,27 @@ class VMwareBackup:
                 
                 # Suche nach verschiedenen Snapshot-Datei-Mustern
                 patterns = [
-                    f"'{base_name}-[0-9]+.*\\.vmdk$'",  # Standard-Snapshot-Format
-                    f"'{base_name}.*delta.*\\.vmdk$'",  # Delta-Dateien
-                    f"'{base_name}.*-snapshot.*\\.vmdk$'",  # Snapshot-Dateien
+                    f"{base_name}-[0-9]+.*\\.vmdk$",  # Standard-Snapshot-Format
+                    f"{base_name}.*delta.*\\.vmdk$",  # Delta-Dateien
+                    f"{base_name}.*-snapshot.*\\.vmdk$",  # Snapshot-Dateien
                 ]
+                # Alle Muster in einem Aufruf statt einem Kanal pro Muster
+                combined = shlex.quote('|'.join(f"({pattern})" for pattern in patterns))
                 
                 snapshot_files = []
-                for pattern in patterns:
-                    stdin, stdout, stderr = ssh.exec_command(f"ls -1 '{search_path}' 2>/dev/null | grep -E {pattern}")
-                    for line in stdout:
-                        file_name = line.strip()
-                        if file_name and file_name not in [os.path.basename(clean_path)]:
-                            snapshot_path = f"[{datastore.name}] {vm_dir}/{file_name}"
-                            if snapshot_path not in snapshot_files:
-                                snapshot_files.append(snapshot_path)
-                
-                ssh.close()
+                stdin, stdout, stderr = ssh.exec_command(
+                    f"ls -1 {shlex.quote(search_path)} 2>/dev/null | grep -E {combined}"
+                )
+                for line in stdout:
+                    file_name = line.strip()
+                    if file_name and file_name != os.path.basename(clean_path):
+                        snapshot_path = f"[{datastore.name}] {vm_dir}/{file_name}"
+                        if snapshot_path not in snapshot_files:
+                            snapshot_files.append(snapshot_path)
                 
                 return snapshot_files
                 
             except Exception as e:
-                try:
-                    ssh.close()
-                except:
-                    pass
                 if progress_callback:
                     progress_callback(f"Fehler beim Suchen nach Snapshot-Dateien: {str(e)}")
                 return []
@@ -608,11 +1690,7 @@ class VMwareBackup:
             )
             
             # Warte auf Snapshot-Erstellung
-            while task.info.state == 'running':
-                import time
-                time.sleep(1)
-            
-            if task.info.state == 'success':
+            if self._wait_for_task(task) == 'success':
                 snapshot = task.info.result
                 if progress_callback:
                     progress_callback(f"Snapshot erstellt: {snapshot_name}")
@@ -622,14 +1700,21 @@ class VMwareBackup:
                 # Lösung: Warte etwas und versuche dann die Datei zu sichern
                 # Oder: Sichere die Snapshot-Dateien (Delta-Dateien)
                 
-                if progress_callback:
-                    progress_callback(f"Warte kurz, damit Snapshot vollständig erstellt wird...")
-                import time
-                time.sleep(2)
+                # Schnellweg: nur die per CBT gemeldeten belegten Bereiche lesen
+                success = False
+                if self.USE_CHANGE_TRACKING:
+                    success = self._download_allocated_areas(
+                        vm, snapshot, datastore, file_path, backup_dir, progress_callback
+                    )
                 
-                # Versuche die ursprüngliche Datei zu sichern
-                # Manchmal wird sie nach kurzer Zeit entsperrt
-                success = self._download_vmdk(datastore, file_path, backup_dir, progress_callback)
+                if not success and not self._is_cancelled():
+                    if progress_callback:
+                        progress_callback(f"Warte kurz, damit Snapshot vollständig erstellt wird...")
+                    time.sleep(2)
+                    
+                    # Versuche die ursprüngliche Datei zu sichern
+                    # Manchmal wird sie nach kurzer Zeit entsperrt
+                    success = self._download_vmdk(datastore, file_path, backup_dir, progress_callback)
                 
                 # Falls das nicht funktioniert, versuche Snapshot-Dateien zu finden
                 if not success:
@@ -657,9 +1742,7 @@ class VMwareBackup:
                         progress_callback(f"Lösche Snapshot...")
                     try:
                         remove_task = snapshot.RemoveSnapshot_Task(removeChildren=False)
-                        # Warte kurz auf Snapshot-Löschung
-                        while remove_task.info.state == 'running':
-                            time.sleep(0.5)
+                        self._wait_for_task(remove_task)
                     except Exception as e:
                         if progress_callback:
                             progress_callback(f"Warnung: Snapshot konnte nicht gelöscht werden: {str(e)}")
@@ -678,10 +1761,188 @@ class VMwareBackup:
             # Fallback: Versuche direktes Backup
             return self._download_vmdk(datastore, file_path, backup_dir, progress_callback)
     
+    def _enable_change_tracking(self, vm: vim.VirtualMachine, progress_callback=None) -> bool:
+        """
+        Aktiviert Changed Block Tracking (CBT) für eine VM
+        
+        Bei laufenden VMs greift die Änderung mit dem nächsten Snapshot.
+        
+        Args:
+            vm: VirtualMachine-Objekt
+            progress_callback: Optional Callback
+            
+        Returns:
+            True bei Erfolg, False sonst
+        """
+        try:
+            if progress_callback:
+                progress_callback("Aktiviere Changed Block Tracking...")
+            task = vm.ReconfigVM_Task(spec=vim.vm.ConfigSpec(changeTrackingEnabled=True))
+            return self._wait_for_task(task) == 'success'
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"Changed Block Tracking nicht verfügbar: {str(e)}")
+            return False
+    
+    def _query_allocated_areas(self, vm: vim.VirtualMachine, snapshot: vim.vm.Snapshot,
+                               disk: vim.vm.device.VirtualDisk, capacity: int) -> List[tuple]:
+        """
+        Fragt die belegten Bereiche einer Festplatte im Snapshot per CBT ab
+        
+        Mit changeId '*' liefert QueryChangedDiskAreas alle belegten Bereiche.
+        Die Antwort kommt seitenweise; es wird bis zum Ende der Platte gefragt.
+        
+        Args:
+            vm: VirtualMachine-Objekt
+            snapshot: Snapshot, auf den sich die Abfrage bezieht
+            disk: Festplatte aus der Snapshot-Konfiguration
+            capacity: Größe der Festplatte in Bytes
+            
+        Returns:
+            Liste von (Offset, Länge)-Tupeln in Bytes
+        """
+        areas = []
+        offset = 0
+        while offset < capacity:
+            info = vm.QueryChangedDiskAreas(snapshot=snapshot, deviceKey=disk.key,
+                                            startOffset=offset, changeId='*')
+            areas.extend((area.start, area.length) for area in info.changedArea or [])
+            if not info.length:
+                break
+            offset = info.startOffset + info.length
+        return areas
+    
+    def _download_allocated_areas(self, vm: vim.VirtualMachine, snapshot: vim.vm.Snapshot,
+                                  datastore: vim.Datastore, file_path: str,
+                                  backup_dir: str, progress_callback=None) -> bool:
+        """
+        Sichert eine Festplatte, indem nur die per CBT belegten Bereiche gelesen werden
+        
+        Die Daten-Datei wird lokal als Sparse-Datei in voller Größe angelegt;
+        nur die belegten Bereiche werden per SFTP gelesen (gebündelt über readv)
+        und an ihren Offset geschrieben, der Rest bleibt ein Loch. Die changeId
+        der Festplatte wird für spätere inkrementelle Backups in cbt.json
+        festgehalten.
+        
+        Args:
+            vm: VirtualMachine-Objekt
+            snapshot: Gerade erstellter Snapshot
+            datastore: Datastore-Objekt
+            file_path: Pfad zur VMDK-Datei (mit Datastore-Präfix)
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            
+        Returns:
+            True bei Erfolg, False wenn der normale Weg übernehmen soll
+        """
+        try:
+            # Festplatte in der Snapshot-Konfiguration finden (dort zeigt sie auf die Basisdatei)
+            disk = None
+            for device in snapshot.config.hardware.device:
+                if isinstance(device, vim.vm.device.VirtualDisk):
+                    try:
+                        if device.backing.fileName == file_path:
+                            disk = device
+                            break
+                    except AttributeError:
+                        continue
+            if disk is None:
+                return False
+            
+            capacity = disk.capacityInBytes or disk.capacityInKB * 1024
+            areas = self._query_allocated_areas(vm, snapshot, disk, capacity)
+            
+            clean_path = _strip_ds(file_path)
+            remote_path = f"/vmfs/volumes/{datastore.name}/{clean_path}"
+            sftp = self._get_sftp()
+            data = self._sftp_read_bytes(sftp, remote_path, self.DESCRIPTOR_MAX_SIZE + 1)
+            if not data or len(data) > self.DESCRIPTOR_MAX_SIZE:
+                return False
+            flat_file = self._parse_vmdk_descriptor_bytes(data, clean_path)
+            if not flat_file:
+                return False
+            flat_name = os.path.basename(flat_file)
+            
+            with open(os.path.join(backup_dir, os.path.basename(clean_path)), 'wb') as f:
+                f.write(data)
+            
+            total = sum(length for _, length in areas)
+            if progress_callback:
+                progress_callback(
+                    f"CBT: {total // (1024*1024)}MB belegt von {capacity // (1024*1024)}MB, "
+                    f"lade nur belegte Bereiche von {flat_name}..."
+                )
+            
+            # Bereiche in Blöcke der lokalen Schreibgröße zerlegen
+            chunks = []
+            for start, length in areas:
+                end = start + length
+                while start < end:
+                    size = min(_COPY_BUFFER_SIZE, end - start)
+                    chunks.append((start, size))
+                    start += size
+            
+            limiter = _RateLimiter()
+            downloaded = 0
+            local_path = os.path.join(backup_dir, flat_name)
+            with self._open_remote(sftp, f"{os.path.dirname(remote_path)}/{flat_name}") as remote_file, \
+                    _open_backup_file(local_path) as local_file:
+                fd = local_file.fileno()
+                os.ftruncate(fd, capacity)
+                for batch_start in range(0, len(chunks), self.CBT_READ_BATCH):
+                    if self._is_cancelled():
+                        return False
+                    batch = chunks[batch_start:batch_start + self.CBT_READ_BATCH]
+                    # readv schickt alle READ-Anfragen des Stapels auf einmal ab
+                    for (offset, _), block in zip(batch, remote_file.readv(batch)):
+                        if not _is_zero_block(block):
+                            os.pwrite(fd, block, offset)
+                        downloaded += len(block)
+                    if progress_callback and limiter.ready(downloaded >= total):
+                        self._scp_progress_callback(downloaded, total, total, flat_name, progress_callback)
+            
+            self._save_change_id(backup_dir, file_path, disk)
+            if progress_callback:
+                progress_callback(f"CBT-Download abgeschlossen: {flat_name} ({downloaded // (1024*1024)}MB übertragen)")
+            return True
+            
+        except Exception as e:
+            if progress_callback and not self._is_cancelled():
+                progress_callback(f"CBT-Download nicht möglich, verwende normalen Weg: {str(e)}")
+            return False
+    
+    def _save_change_id(self, backup_dir: str, file_path: str, disk: vim.vm.device.VirtualDisk):
+        """
+        Hält die CBT-changeId einer Festplatte in cbt.json des Backups fest
+        
+        Args:
+            backup_dir: Zielverzeichnis des VM-Backups
+            file_path: Pfad zur VMDK-Datei (mit Datastore-Präfix)
+            disk: Festplatte aus der Snapshot-Konfiguration
+        """
+        try:
+            change_id = disk.backing.changeId
+        except AttributeError:
+            change_id = None
+        if not change_id:
+            return
+        
+        cbt_file = os.path.join(backup_dir, 'cbt.json')
+        change_ids = {}
+        if os.path.exists(cbt_file):
+            with open(cbt_file, 'r', encoding='utf-8') as f:
+                change_ids = json.load(f)
+        change_ids[file_path] = {'device_key': disk.key, 'change_id': change_id}
+        _dump_json(change_ids, cbt_file)
+    
     def _parse_vmdk_descriptor(self, descriptor_path: str, original_path: str) -> str:
         """
         Parst eine VMDK-Descriptor-Datei, um den Namen der -flat.vmdk Datei zu finden
         
+        Gelesen werden höchstens DESCRIPTOR_MAX_SIZE Bytes: eine binäre VMDK
+        (z.B. monolithicSparse) hat kaum Zeilenumbrüche und würde zeilenweise
+        sonst komplett in den Speicher geladen.
+        
         Args:
             descriptor_path: Pfad zur lokalen Descriptor-Datei
             original_path: Original-Pfad der VMDK-Datei
@@ -690,29 +1951,90 @@ class VMwareBackup:
             Name der -flat.vmdk Datei oder None
         """
         try:
-            with open(descriptor_path, 'r') as f:
-                content = f.read()
-                
-            # Suche nach der -flat.vmdk Datei im Descriptor
-            # Format: RW <sectors> VMFS "<filename>-flat.vmdk"
-            import re
-            match = re.search(r'RW\s+\d+\s+VMFS\s+"([^"]+)"', content)
-            if match:
-                return match.group(1)
-            
-            # Alternative: Suche nach "Extent description" und extrahiere Dateinamen
-            match = re.search(r'RW\s+\d+\s+\w+\s+"([^"]+-flat\.vmdk)"', content)
-            if match:
-                return match.group(1)
-            
-            # Falls nicht gefunden, konstruiere den Namen basierend auf dem Original-Namen
-            base_name = os.path.splitext(os.path.basename(original_path))[0]
-            return f"{base_name}-flat.vmdk"
+            with open(descriptor_path, 'rb') as f:
+                data = f.read(self.DESCRIPTOR_MAX_SIZE)
+            return self._parse_vmdk_descriptor_bytes(data, original_path)
+        except Exception as e:
+            print(f"Fehler beim Parsen der VMDK-Descriptor: {str(e)}")
+            return None
+    
+    def _parse_vmdk_descriptor_bytes(self, data: bytes, original_path: str) -> Optional[str]:
+        """
+        Parst einen bereits in den Speicher gelesenen VMDK-Descriptor
+        
+        Args:
+            data: Inhalt der Descriptor-Datei
+            original_path: Original-Pfad der VMDK-Datei
             
+        Returns:
+            Name der -flat.vmdk Datei oder None
+        """
+        try:
+            return _flat_extent_name(data, original_path)
         except Exception as e:
             print(f"Fehler beim Parsen der VMDK-Descriptor: {str(e)}")
             return None
     
+    def _download_vmdk_sftp_pair(self, datastore: vim.Datastore, clean_path: str,
+                                 backup_dir: str, progress_callback=None) -> bool:
+        """
+        Lädt Descriptor und Daten-Datei einer VMDK über dieselbe SFTP-Session
+        
+        Der Descriptor wird direkt in den Speicher gelesen, dort geparst und
+        einmal lokal geschrieben; die Daten-Datei folgt auf derselben Session.
+        
+        Args:
+            datastore: Datastore-Objekt
+            clean_path: VMDK-Pfad ohne Datastore-Präfix
+            backup_dir: Zielverzeichnis
+            progress_callback: Optional Callback
+            
+        Returns:
+            True bei Erfolg, False wenn die Einzel-Methoden übernehmen sollen
+        """
+        remote_path = f"/vmfs/volumes/{datastore.name}/{clean_path}"
+        try:
+            sftp = self._get_sftp()
+            data = self._sftp_read_bytes(sftp, remote_path, self.DESCRIPTOR_MAX_SIZE + 1)
+            if not data or len(data) > self.DESCRIPTOR_MAX_SIZE:
+                return False  # Kein Text-Descriptor (z.B. monolithic sparse)
+            flat_file = self._parse_vmdk_descriptor_bytes(data, clean_path)
+            if not flat_file:
+                return False
+            
+            flat_name = os.path.basename(flat_file)
+            flat_remote = f"{os.path.dirname(remote_path)}/{flat_name}"
+            file_size = sftp.stat(flat_remote).st_size
+            
+            with open(os.path.join(backup_dir, os.path.basename(clean_path)), 'wb') as f:
+                f.write(data)
+            
+            if progress_callback:
+                progress_callback(f"Lade Daten-Datei: {flat_name} ({file_size // (1024*1024)}MB)...")
+            local_path = os.path.join(backup_dir, flat_name)
+            self._sftp_download(sftp, flat_remote, local_path, file_size, flat_name, progress_callback)
+        except Exception as e:
+            if progress_callback and not self._is_cancelled():
+                progress_callback(f"SFTP-Direktdownload fehlgeschlagen, versuche Einzel-Methoden: {str(e)}")
+            return False
+        
+        return not self._is_cancelled() and os.path.getsize(local_path) == file_size
+    
+    def _sftp_read_bytes(self, sftp, remote_path: str, max_size: int) -> bytes:
+        """
+        Liest eine kleine Remote-Datei direkt in den Speicher
+        
+        Args:
+            sftp: Offene SFTPClient-Session
+            remote_path: Pfad auf dem ESXi Server
+            max_size: Höchstens so viele Bytes lesen
+            
+        Returns:
+            Gelesene Bytes
+        """
+        with self._open_remote(sftp, remote_path) as remote_file:
+            return remote_file.read(max_size)
+    
     def _download_vmdk_scp(self, datastore: vim.Datastore, file_path: str,
                           backup_dir: str, progress_callback=None) -> bool:
         """
@@ -728,19 +2050,18 @@ class VMwareBackup:
         Returns:
             True bei Erfolg, False sonst
         """
+        if paramiko is None:
+            if progress_callback:
+                progress_callback(f"SSH/SCP nicht verfügbar: paramiko-Bibliothek fehlt")
+                progress_callback(f"Installieren Sie mit: pip install paramiko")
+            return False
+        
         try:
-            import paramiko
-            import re
-            
             if progress_callback:
                 progress_callback(f"Versuche SSH/SCP-Download...")
             
             # Entferne Datastore-Präfix
-            clean_path = file_path
-            if file_path.startswith('['):
-                match = re.match(r'\[.*?\]\s*(.+)', file_path)
-                if match:
-                    clean_path = match.group(1).strip()
+            clean_path = _strip_ds(file_path)
             
             # Konstruiere den vollständigen Pfad auf dem ESXi Server
             # Format: /vmfs/volumes/datastore_name/path/to/file.vmdk
@@ -752,90 +2073,37 @@ class VMwareBackup:
                     progress_callback("Backup wurde abgebrochen")
                 return False
             
-            # SSH-Verbindung herstellen
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Speichere SSH-Verbindung für Cancel
-            self._active_ssh_connection = ssh
-            
-            # Versuche verschiedene SSH-Ports (22 ist Standard, manchmal wird ein anderer Port verwendet)
-            ssh_ports = [22, 2222]
-            ssh_connected = False
-            
-            for ssh_port in ssh_ports:
-                # Prüfe auf Cancel
+            # SSH-Verbindung holen (bestehende wird wiederverwendet)
+            try:
+                ssh = self._get_ssh(progress_callback)
+            except Exception as e:
                 if self._is_cancelled():
-                    ssh.close()
-                    self._active_ssh_connection = None
                     if progress_callback:
                         progress_callback("Backup wurde abgebrochen")
                     return False
-                
-                try:
-                    if progress_callback:
-                        progress_callback(f"Versuche SSH-Verbindung auf Port {ssh_port}...")
-                    ssh.connect(
-                        self.host,
-                        username=self.user,
-                        password=self.password,
-                        port=ssh_port,
-                        timeout=10,
-                        allow_agent=False,
-                        look_for_keys=False
-                    )
-                    ssh_connected = True
-                    if progress_callback:
-                        progress_callback(f"SSH-Verbindung erfolgreich auf Port {ssh_port}")
-                    break
-                except Exception as e:
-                    if progress_callback and ssh_port == ssh_ports[-1]:  # Nur beim letzten Versuch Fehler zeigen
-                        progress_callback(f"SSH-Verbindung auf Port {ssh_port} fehlgeschlagen: {str(e)}")
-                    continue
-            
-            if not ssh_connected:
-                self._active_ssh_connection = None
                 if progress_callback:
+                    progress_callback(f"SSH-Verbindung fehlgeschlagen: {str(e)}")
                     progress_callback(f"SSH-Verbindung fehlgeschlagen auf allen Ports")
                     progress_callback(f"Hinweis: SSH muss auf dem ESXi Server aktiviert sein")
                     progress_callback(f"  - Gehen Sie zu: Host → Manage → Services")
                     progress_callback(f"  - Aktivieren Sie den 'SSH' Service")
                 return False
             
-            # Prüfe, ob die Datei existiert
-            stdin, stdout, stderr = ssh.exec_command(f"ls -lh '{esxi_path}'")
-            exit_status = stdout.channel.recv_exit_status()
+            scp = self._get_sftp()
             
-            if exit_status != 0:
+            # Existenz und Dateigröße mit einem SFTP-stat prüfen (kein eigener ls-Prozess)
+            try:
+                file_size = scp.stat(esxi_path).st_size
+            except IOError:
                 if progress_callback:
                     progress_callback(f"Datei nicht gefunden auf ESXi: {esxi_path}")
-                ssh.close()
-                return False
-            
-            # Dateigröße ermitteln
-            file_info = stdout.read().decode('utf-8')
-            if progress_callback:
-                progress_callback(f"Datei gefunden: {file_info.strip()}")
-            
-            # Prüfe auf Cancel
-            if self._is_cancelled():
-                ssh.close()
-                self._active_ssh_connection = None
-                if progress_callback:
-                    progress_callback("Backup wurde abgebrochen")
                 return False
             
             # SCP-Download
             file_name = os.path.basename(clean_path)
             local_path = os.path.join(backup_dir, file_name)
             
-            scp = ssh.open_sftp()
-            self._active_scp_session = scp
-            
             try:
-                # Dateigröße für Fortschrittsanzeige
-                file_size = scp.stat(esxi_path).st_size
-                
                 if progress_callback:
                     if file_size < 1024:
                         progress_callback(f"Datei ist sehr klein ({file_size} Bytes) - wahrscheinlich Descriptor-Datei")
@@ -844,31 +2112,16 @@ class VMwareBackup:
                 
                 # Prüfe auf Cancel vor Download-Start
                 if self._is_cancelled():
-                    scp.close()
-                    ssh.close()
-                    self._active_scp_session = None
-                    self._active_ssh_connection = None
                     if progress_callback:
                         progress_callback("Backup wurde abgebrochen")
                     return False
                 
-                # Versuche SCP.get() für kleine Dateien
-                # Für große Dateien (>10GB) verwenden wir cat/dd, da SCP.get() nicht gut unterbrechbar ist
-                if file_size > 10 * 1024 * 1024 * 1024:  # Größer als 10GB
-                    if progress_callback:
-                        progress_callback(f"Große Datei erkannt, verwende cat-Methode für bessere Cancel-Unterstützung...")
-                    scp.close()
-                    raise Exception("Use cat method for large file")
-                
-                # Verwende SCP.get() für normale Dateien
-                scp.get(esxi_path, local_path)
+                # SFTP-Download mit Prefetch: viele READ-Anfragen gleichzeitig unterwegs,
+                # Cancel wird nach jedem Block geprüft (auch für große Dateien geeignet)
+                self._sftp_download(scp, esxi_path, local_path, file_size, file_name, progress_callback)
                 
                 # Prüfe auf Cancel nach Download
                 if self._is_cancelled():
-                    scp.close()
-                    ssh.close()
-                    self._active_scp_session = None
-                    self._active_ssh_connection = None
                     if os.path.exists(local_path):
                         try:
                             os.remove(local_path)
@@ -898,104 +2151,31 @@ class VMwareBackup:
                             else:
                                 # Dateigröße war unbekannt
                                 progress_callback(f"SCP-Download abgeschlossen: {file_name} ({actual_size // (1024*1024)}MB)")
-                        scp.close()
-                        ssh.close()
-                        self._active_scp_session = None
-                        self._active_ssh_connection = None
                         return True
                     else:
                         if progress_callback:
                             progress_callback(f"SCP-Download fehlgeschlagen: Datei ist leer")
                         if os.path.exists(local_path):
                             os.remove(local_path)
-                        scp.close()
-                        ssh.close()
-                        self._active_scp_session = None
-                        self._active_ssh_connection = None
                         return False
                 else:
                     if progress_callback:
                         progress_callback(f"SCP-Download fehlgeschlagen: Datei wurde nicht erstellt")
-                    scp.close()
-                    ssh.close()
-                    self._active_scp_session = None
-                    self._active_ssh_connection = None
                     return False
                 
             except Exception as download_error:
-                # Falls SCP.get fehlschlägt oder für große Dateien, verwende cat über SSH
-                use_cat_method = "Use cat method" in str(download_error)
-                
-                if not use_cat_method:
-                    if progress_callback:
-                        progress_callback(f"SCP-Download fehlgeschlagen, versuche alternativen Ansatz...")
-                        progress_callback(f"Fehlerdetails: {str(download_error)}")
+                # Falls der SFTP-Download fehlschlägt, verwende cat über SSH
+                if progress_callback:
+                    progress_callback(f"SCP-Download fehlgeschlagen, versuche alternativen Ansatz...")
+                    progress_callback(f"Fehlerdetails: {str(download_error)}")
                 
                 # Verwende SSH cat für bessere Cancel-Unterstützung
                 try:
-                    stdin, stdout, stderr = ssh.exec_command(f"cat '{esxi_path}'")
+                    stdin, stdout, stderr = ssh.exec_command(f"cat {shlex.quote(esxi_path)}")
                     
-                    with open(local_path, 'wb') as f:
-                        downloaded = 0
-                        chunk_size = 1024 * 1024  # 1MB chunks
-                        import time
-                        
-                        while True:
-                            # Prüfe auf Cancel während des Downloads (bei jedem Chunk)
-                            if self._is_cancelled():
-                                try:
-                                    stdout.channel.close()
-                                except:
-                                    pass
-                                f.close()
-                                if os.path.exists(local_path):
-                                    try:
-                                        os.remove(local_path)
-                                    except:
-                                        pass
-                                if progress_callback:
-                                    progress_callback("Download wurde abgebrochen")
-                                return False
-                            
-                            # Prüfe, ob Daten verfügbar sind
-                            if stdout.channel.recv_ready():
-                                chunk = stdout.read(chunk_size)
-                                if not chunk:
-                                    # Prüfe, ob Channel geschlossen wurde
-                                    if stdout.channel.closed:
-                                        break
-                                    # Warte kurz und prüfe erneut
-                                    time.sleep(0.1)
-                                    continue
-                                
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                
-                                if progress_callback and file_size > 1024:
-                                    progress = (downloaded / file_size) * 100
-                                    progress_callback(f"SSH cat Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {file_size // (1024*1024)}MB)")
-                            else:
-                                # Warte kurz, wenn keine Daten verfügbar
-                                time.sleep(0.1)
-                                # Prüfe erneut auf Cancel
-                                if self._is_cancelled():
-                                    try:
-                                        stdout.channel.close()
-                                    except:
-                                        pass
-                                    f.close()
-                                    if os.path.exists(local_path):
-                                        try:
-                                            os.remove(local_path)
-                                        except:
-                                            pass
-                                    if progress_callback:
-                                        progress_callback("Download wurde abgebrochen")
-                                    return False
-                                
-                                # Prüfe, ob Channel geschlossen wurde
-                                if stdout.channel.closed:
-                                    break
+                    if not self._pipe_channel_to_file(stdout.channel, local_path, file_size, file_name,
+                                                     'SSH cat', progress_callback):
+                        return False
                     
                     # Prüfe Exit-Status
                     exit_status = stdout.channel.recv_exit_status()
@@ -1005,85 +2185,27 @@ class VMwareBackup:
                             progress_callback(f"SSH cat Fehler (Exit {exit_status}): {error_msg}")
                         
                         # Wenn "Device or resource busy", versuche dd
-                        if "busy" in error_msg.lower() or "resource busy" in error_msg.lower():
+                        if "busy" in error_msg.lower():
                             if progress_callback:
                                 progress_callback(f"Datei ist gesperrt, versuche dd-Methode...")
-                            raise Exception("Device busy - try dd")
+                            raise _FileBusyError(error_msg)
                         
                         os.remove(local_path)
                         return False
                 except Exception as cat_error:
                     # Alternative 2: Verwende dd für gesperrte Dateien
-                    if "Device busy" in str(cat_error) or "busy" in str(cat_error).lower():
+                    if isinstance(cat_error, _FileBusyError):
                         try:
                             if progress_callback:
                                 progress_callback(f"Verwende dd für gesperrte Datei...")
                             
-                            # Verwende dd mit bs=1M für bessere Performance
-                            dd_command = f"dd if='{esxi_path}' bs=1M 2>/dev/null"
+                            # Verwende dd mit bs=4M passend zur lokalen Blockgröße
+                            dd_command = f"dd if={shlex.quote(esxi_path)} bs=4M 2>/dev/null"
                             stdin, stdout, stderr = ssh.exec_command(dd_command)
                             
-                            with open(local_path, 'wb') as f:
-                                downloaded = 0
-                                chunk_size = 1024 * 1024  # 1MB chunks
-                                import time
-                                
-                                while True:
-                                    # Prüfe auf Cancel während des Downloads (bei jedem Chunk)
-                                    if self._is_cancelled():
-                                        try:
-                                            stdout.channel.close()
-                                        except:
-                                            pass
-                                        f.close()
-                                        if os.path.exists(local_path):
-                                            try:
-                                                os.remove(local_path)
-                                            except:
-                                                pass
-                                        if progress_callback:
-                                            progress_callback("Download wurde abgebrochen")
-                                        return False
-                                    
-                                    # Prüfe, ob Daten verfügbar sind
-                                    if stdout.channel.recv_ready():
-                                        chunk = stdout.read(chunk_size)
-                                        if not chunk:
-                                            # Prüfe, ob Channel geschlossen wurde
-                                            if stdout.channel.closed:
-                                                break
-                                            # Warte kurz und prüfe erneut
-                                            time.sleep(0.1)
-                                            continue
-                                        
-                                        f.write(chunk)
-                                        downloaded += len(chunk)
-                                        
-                                        if progress_callback and file_size > 1024:
-                                            progress = (downloaded / file_size) * 100
-                                            progress_callback(f"dd Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {file_size // (1024*1024)}MB)")
-                                    else:
-                                        # Warte kurz, wenn keine Daten verfügbar
-                                        time.sleep(0.1)
-                                        # Prüfe erneut auf Cancel
-                                        if self._is_cancelled():
-                                            try:
-                                                stdout.channel.close()
-                                            except:
-                                                pass
-                                            f.close()
-                                            if os.path.exists(local_path):
-                                                try:
-                                                    os.remove(local_path)
-                                                except:
-                                                    pass
-                                            if progress_callback:
-                                                progress_callback("Download wurde abgebrochen")
-                                            return False
-                                        
-                                        # Prüfe, ob Channel geschlossen wurde
-                                        if stdout.channel.closed:
-                                            break
+                            if not self._pipe_channel_to_file(stdout.channel, local_path, file_size, file_name,
+                                                             'dd', progress_callback):
+                                return False
                             
                             # Prüfe Exit-Status
                             exit_status = stdout.channel.recv_exit_status()
@@ -1108,15 +2230,6 @@ class VMwareBackup:
                             progress_callback(f"Alternativer Download fehlgeschlagen: {str(cat_error)}")
                         return False
                 
-                # Schließe Verbindungen nach erfolgreichem Download
-                try:
-                    scp.close()
-                except:
-                    pass
-                ssh.close()
-                self._active_scp_session = None
-                self._active_ssh_connection = None
-                
                 # Prüfe auf Cancel nach Download
                 if self._is_cancelled():
                     if os.path.exists(local_path):
@@ -1172,33 +2285,286 @@ class VMwareBackup:
                     return False
                     
             except Exception as e:
-                try:
-                    scp.close()
-                except:
-                    pass
-                try:
-                    ssh.close()
-                except:
-                    pass
-                self._active_scp_session = None
-                self._active_ssh_connection = None
                 if progress_callback:
-                    import traceback
                     error_details = traceback.format_exc()
                     progress_callback(f"Download-Fehler: {str(e)}")
                     progress_callback(f"Details: {error_details[:500]}")
                 return False
                 
-        except ImportError:
-            if progress_callback:
-                progress_callback(f"SSH/SCP nicht verfügbar: paramiko-Bibliothek fehlt")
-                progress_callback(f"Installieren Sie mit: pip install paramiko")
-            return False
         except Exception as e:
             if progress_callback:
                 progress_callback(f"SSH/SCP-Fehler: {str(e)}")
             return False
     
+    def _pipe_channel_to_file(self, channel, local_path: str, file_size: int, file_name: str,
+                              label: str, progress_callback=None) -> bool:
+        """
+        Schreibt die Ausgabe eines SSH-Befehls (cat/dd) in eine lokale Datei
+        
+        Kopiert per shutil.copyfileobj in Blöcken von _COPY_BUFFER_SIZE; Null-Blöcke
+        werden als Löcher übersprungen. Bei Cancel wird der Kanal geschlossen und
+        die unvollständige Datei entfernt.
+        
+        Args:
+            channel: Kanal des laufenden exec_command
+            local_path: Lokaler Zielpfad
+            file_size: Erwartete Dateigröße in Bytes
+            file_name: Dateiname für Fortschrittsmeldungen
+            label: Name der Methode für Fortschrittsmeldungen
+            progress_callback: Optional Callback
+            
+        Returns:
+            True wenn der Kanal bis zum Ende gelesen wurde, False bei Cancel
+        """
+        def report(downloaded: int):
+            if progress_callback and file_size > 1024:
+                progress = (downloaded / file_size) * 100
+                progress_callback(f"{label} Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {file_size // (1024*1024)}MB)")
+        
+        reader = _CancellableReader(_ChannelReader(channel, self._is_cancelled), self._is_cancelled, report)
+        try:
+            with _open_backup_file(local_path) as f:
+                shutil.copyfileobj(reader, _SparseWriter(f), _COPY_BUFFER_SIZE)
+                f.truncate()
+            return True
+        except IOError:
+            if not self._is_cancelled():
+                raise
+            try:
+                channel.close()
+            except:
+                pass
+            if os.path.exists(local_path):
+                try:
+                    os.remove(local_path)
+                except:
+                    pass
+            if progress_callback:
+                progress_callback("Download wurde abgebrochen")
+            return False
+    
+    def _sftp_download(self, sftp, remote_path: str, local_path: str, file_size: int,
+                       file_name: str, progress_callback=None):
+        """
+        Lädt eine Datei per SFTP mit Prefetch herunter
+        
+        Der Prefetch hält viele READ-Anfragen gleichzeitig offen, statt auf jede
+        Antwort einzeln zu warten. Bei Cancel wird der Download beendet; der
+        Aufrufer prüft anschließend das Cancel-Flag und räumt auf.
+        
+        Args:
+            sftp: Offene SFTPClient-Session
+            remote_path: Pfad auf dem ESXi Server
+            local_path: Lokaler Zielpfad
+            file_size: Dateigröße in Bytes
+            file_name: Dateiname für Fortschrittsmeldungen
+            progress_callback: Optional Callback
+        """
+        if file_size <= self.SFTP_MAX_REQUEST_SIZE:
+            # Descriptoren u.ä.: eine einzige READ-Anfrage, ohne Prefetch-Thread
+            data = self._sftp_read_bytes(sftp, remote_path, file_size)
+            with open(local_path, 'wb') as local_file:
+                local_file.write(data)
+            return
+        
+        if file_size >= self.SFTP_PARALLEL_THRESHOLD:
+            if Libssh2Session is not None:
+                try:
+                    self._sftp_download_libssh2(remote_path, local_path, file_size,
+                                                file_name, progress_callback)
+                    return
+                except Exception as e:
+                    if self._is_cancelled():
+                        return
+                    if progress_callback:
+                        progress_callback(f"libssh2-Download fehlgeschlagen, verwende paramiko: {str(e)}")
+            self._sftp_download_parallel(sftp, remote_path, local_path, file_size,
+                                         file_name, progress_callback)
+            return
+        
+        chunk_size = _COPY_BUFFER_SIZE
+        limiter = _RateLimiter()
+        with self._open_remote(sftp, remote_path) as remote_file, _open_backup_file(local_path) as local_file:
+            remote_file.prefetch(file_size)
+            downloaded = 0
+            while True:
+                if self._is_cancelled():
+                    return
+                chunk = remote_file.read(chunk_size)
+                if not chunk:
+                    break
+                _write_sparse(local_file, chunk)
+                downloaded += len(chunk)
+                if file_size > 1024 and limiter.ready(downloaded >= file_size):
+                    self._scp_progress_callback(downloaded, file_size, file_size, file_name, progress_callback)
+            local_file.truncate()
+    
+    def _sftp_download_libssh2(self, remote_path: str, local_path: str, file_size: int,
+                               file_name: str, progress_callback=None):
+        """
+        Lädt eine Datei per SFTP über libssh2 (ssh2-python) herunter
+        
+        Verschlüsselung und SFTP laufen in C (OpenSSL mit AES-NI), paramiko
+        entschlüsselt dagegen in Python und wird bei schnellen Leitungen
+        CPU-gebunden. Benutzt wird der Port der bestehenden SSH-Verbindung.
+        
+        Args:
+            remote_path: Pfad auf dem ESXi Server
+            local_path: Lokaler Zielpfad
+            file_size: Dateigröße in Bytes
+            file_name: Dateiname für Fortschrittsmeldungen
+            progress_callback: Optional Callback
+            
+        Raises:
+            Exception: Wenn Verbindung oder Download fehlschlagen
+        """
+        ssh_port = self._get_ssh().get_transport().getpeername()[1]
+        sock = socket.create_connection((self.host, ssh_port), timeout=10)
+        sock.settimeout(None)  # libssh2 arbeitet blockierend auf dem Socket
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Registrieren, damit cancel_backup() auch einen blockierten Download beendet
+        with self._ssh_lock:
+            self._raw_sockets.add(sock)
+        try:
+            if self._is_cancelled():
+                raise IOError("Backup wurde abgebrochen")
+            session = Libssh2Session()
+            # Blockierende libssh2-Aufrufe geben bei einer hängenden Verbindung auf
+            session.set_timeout(self.SSH_STALL_TIMEOUT * 1000)
+            session.handshake(sock)
+            session.userauth_password(self.user, self.password)
+            session.keepalive_config(False, self.SSH_KEEPALIVE_INTERVAL)
+            sftp = session.sftp_init()
+            
+            limiter = _RateLimiter()
+            downloaded = 0
+            pending = []
+            pending_size = 0
+            with sftp.open(remote_path, LIBSSH2_FXF_READ, LIBSSH2_SFTP_S_IRUSR) as remote_file, \
+                    _open_backup_file(local_path) as local_file:
+                for _, data in remote_file:
+                    if self._is_cancelled():
+                        return
+                    # Zu vollen Blöcken sammeln, damit Null-Blöcke als Löcher erkannt werden
+                    pending.append(data)
+                    pending_size += len(data)
+                    if pending_size >= _COPY_BUFFER_SIZE:
+                        _write_sparse(local_file, b''.join(pending))
+                        downloaded += pending_size
+                        pending, pending_size = [], 0
+                        session.keepalive_send()  # Sendet nur, wenn das Intervall abgelaufen ist
+                        if limiter.ready():
+                            self._scp_progress_callback(downloaded, file_size, file_size, file_name, progress_callback)
+                if pending:
+                    _write_sparse(local_file, b''.join(pending))
+                    downloaded += pending_size
+                local_file.truncate()
+            # Der Handle-Iterator endet bei Lesefehlern und Timeouts stillschweigend
+            if downloaded != file_size:
+                raise IOError(f"libssh2-Download unvollständig ({downloaded} von {file_size} Bytes)")
+            self._scp_progress_callback(downloaded, file_size, file_size, file_name, progress_callback)
+            session.disconnect()
+        finally:
+            with self._ssh_lock:
+                self._raw_sockets.discard(sock)
+            sock.close()
+    
+    def _sftp_download_parallel(self, sftp, remote_path: str, local_path: str, file_size: int,
+                                file_name: str, progress_callback=None):
+        """
+        Lädt eine große Datei mit mehreren gleichzeitigen SFTP-Lese-Handles herunter
+        
+        Die Datei wird in zusammenhängende Bereiche aufgeteilt; jeder Worker liest
+        seinen Bereich über ein eigenes SFTP-Handle und
+        schreibt per pwrite an die passende Stelle der vorab angelegten lokalen Datei.
+        Jeder Worker fordert per readv mehrere Blöcke auf einmal an, so bleiben
+        pro Handle viele READ-Anfragen gleichzeitig unterwegs. Ab 2 GiB werden
+        die Worker auf mehrere SSH-Verbindungen verteilt, da ein einzelner
+        TCP-Strom schnelle Leitungen nicht auslastet; die zusätzlichen
+        Verbindungen (insgesamt höchstens SFTP_EXTRA_STREAMS_TOTAL über alle
+        gleichzeitigen Downloads) werden danach wieder geschlossen.
+        
+        Args:
+            sftp: Offene SFTPClient-Session
+            remote_path: Pfad auf dem ESXi Server
+            local_path: Lokaler Zielpfad
+            file_size: Dateigröße in Bytes
+            file_name: Dateiname für Fortschrittsmeldungen
+            progress_callback: Optional Callback
+        """
+        chunk = self.SFTP_PARALLEL_CHUNK
+        num_chunks = (file_size + chunk - 1) // chunk
+        workers = min(self._sftp_workers, num_chunks)
+        per_worker = (num_chunks + workers - 1) // workers
+        
+        downloaded = 0
+        lock = threading.Lock()
+        # Wird beim ersten Fehler gesetzt, damit die übrigen Worker sofort aufhören
+        failed = threading.Event()
+        
+        # Zusätzliche Verbindungen; Verbindung 0 ist die übergebene Session
+        streams = min(self.SFTP_PARALLEL_STREAMS, workers, max(1, file_size >> 30))
+        stream_keys = [(threading.get_ident(), 'stream', n) for n in range(1, streams)]
+        sessions = [sftp]
+        
+        def read_range(fd: int, first_chunk: int, last_chunk: int):
+            nonlocal downloaded
+            session = sessions[(first_chunk // per_worker) % len(sessions)]
+            try:
+                with self._open_remote(session, remote_path) as remote_file:
+                    for batch_start in range(first_chunk, last_chunk, self.SFTP_READV_CHUNKS):
+                        if self._is_cancelled() or failed.is_set():
+                            return
+                        batch = [
+                            (index * chunk, min(chunk, file_size - index * chunk))
+                            for index in range(batch_start, min(batch_start + self.SFTP_READV_CHUNKS, last_chunk))
+                        ]
+                        for (offset, _), data in zip(batch, remote_file.readv(batch)):
+                            # Null-Blöcke bleiben Löcher der vorab vergrößerten Datei
+                            if not _is_zero_block(data):
+                                os.pwrite(fd, data, offset)
+                            with lock:
+                                downloaded += len(data)
+            except Exception:
+                failed.set()
+                raise
+        
+        acquired = 0
+        try:
+            for key in stream_keys:
+                # Sind alle Plätze von anderen Downloads belegt, mit weniger Verbindungen auskommen
+                if not self._stream_slots.acquire(blocking=False):
+                    break
+                acquired += 1
+                try:
+                    sessions.append(self._get_sftp(key=key))
+                except Exception:
+                    # Weniger Verbindungen sind besser als ein Abbruch
+                    if self._is_cancelled():
+                        raise
+                    break
+            with _open_backup_file(local_path) as local_file:
+                fd = local_file.fileno()
+                os.ftruncate(fd, file_size)
+                
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(read_range, fd, start, min(start + per_worker, num_chunks))
+                        for start in range(0, num_chunks, per_worker)
+                    ]
+                    # Fortschritt aus dem aufrufenden Thread melden
+                    pending = futures
+                    while pending:
+                        done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                        for future in done:
+                            future.result()  # Fehler eines Workers weiterreichen
+                        self._scp_progress_callback(downloaded, file_size, file_size, file_name, progress_callback)
+        finally:
+            for key in stream_keys:
+                self._drop_ssh(key)
+            for _ in range(acquired):
+                self._stream_slots.release()
+    
     def _scp_progress_callback(self, transferred, total, file_size, file_name, progress_callback):
         """Callback für SCP-Fortschrittsanzeige"""
         if progress_callback and total > 0:
@@ -1258,31 +2624,21 @@ class VMwareBackup:
         Returns:
             True bei Erfolg, False sonst
         """
+        if requests is None:
+            if progress_callback:
+                progress_callback(f"HTTP-Download nicht verfügbar: requests-Bibliothek fehlt")
+            return False
+        
         try:
-            import requests
-            from requests.auth import HTTPBasicAuth
-            import urllib3
-            import re
-            
-            # SSL-Warnungen unterdrücken
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            
             # Entferne Datastore-Präfix aus dem Pfad (Format: [datastore] path)
             # Beispiel: [datastore1] BAUERP_PRO/BAUERP_PRO.vmdk -> BAUERP_PRO/BAUERP_PRO.vmdk
-            clean_path = file_path
-            if file_path.startswith('['):
-                # Entferne [datastore] Präfix
-                match = re.match(r'\[.*?\]\s*(.+)', file_path)
-                if match:
-                    clean_path = match.group(1)
+            clean_path = _strip_ds(file_path)
             
             # Erstelle Download-URL
             # Format: https://hostname/folder/path?dcPath=datacenter&dsName=datastore
-            datacenter = self._get_datacenter()
-            dc_path = datacenter.name if datacenter else ""
+            dc_path = self._get_datacenter_name()
             
             # Dateipfad für URL anpassen (Leerzeichen und Sonderzeichen encoden)
-            import urllib.parse
             # Pfad normalisieren (führende Leerzeichen entfernen)
             clean_path = clean_path.strip()
             encoded_path = urllib.parse.quote(clean_path, safe='/')
@@ -1294,13 +2650,8 @@ class VMwareBackup:
                 'dsName': datastore.name
             }
             
-            # HTTP-Basic-Auth verwenden
-            auth = HTTPBasicAuth(self.user, self.password)
-            
-            # SSL-Verifizierung deaktivieren (für selbstsignierte Zertifikate)
-            session = requests.Session()
-            session.auth = auth
-            session.verify = False
+            # Wiederverwendete Session mit Basic-Auth, ohne SSL-Verifizierung
+            session = self._get_http_session()
             
             if progress_callback:
                 progress_callback(f"Starte Download von {os.path.basename(clean_path)}...")
@@ -1315,22 +2666,31 @@ class VMwareBackup:
             
             urls_to_try = []
             
-            # Option 1: Standard mit Datacenter
+            # Option 1: Standard mit Datacenter (dokumentierte Form)
             urls_to_try.append((url, params, "Standard mit Datacenter"))
             
-            # Option 2: Ohne Datacenter
-            urls_to_try.append((f"https://{self.host}/folder/{encoded_path}", {'dsName': datastore.name}, "Ohne Datacenter"))
+            # Option 2: Ohne Datacenter (einziger Rückfall; ohne Datacenter identisch mit Option 1)
+            if dc_path:
+                urls_to_try.append((f"https://{self.host}/folder/{encoded_path}", {'dsName': datastore.name}, "Ohne Datacenter"))
             
-            # Option 3: Mit Datastore im Pfad (manchmal benötigt)
-            urls_to_try.append((f"https://{self.host}/folder/{datastore.name}/{encoded_path}", {}, "Mit Datastore im Pfad"))
+            if self.HTTP_COMPAT_URLS:
+                # Option 3: Mit Datastore im Pfad (manchmal benötigt)
+                urls_to_try.append((f"https://{self.host}/folder/{datastore.name}/{encoded_path}", {}, "Mit Datastore im Pfad"))
+                
+                # Option 4: Versuche auch ohne URL-Encoding für den Pfad (manchmal funktioniert das besser)
+                if clean_path != encoded_path:
+                    urls_to_try.append((f"https://{self.host}/folder/{clean_path}", {'dcPath': dc_path, 'dsName': datastore.name}, "Ohne URL-Encoding"))
+                    urls_to_try.append((f"https://{self.host}/folder/{clean_path}", {'dsName': datastore.name}, "Ohne Encoding und Datacenter"))
             
-            # Option 4: Versuche auch ohne URL-Encoding für den Pfad (manchmal funktioniert das besser)
-            if clean_path != encoded_path:
-                urls_to_try.append((f"https://{self.host}/folder/{clean_path}", {'dcPath': dc_path, 'dsName': datastore.name}, "Ohne URL-Encoding"))
-                urls_to_try.append((f"https://{self.host}/folder/{clean_path}", {'dsName': datastore.name}, "Ohne Encoding und Datacenter"))
+            # Das zuletzt erfolgreiche Format zuerst versuchen; auf einem Host
+            # funktioniert für alle Dateien dasselbe, die übrigen sind Rückfall
+            if self._working_template:
+                urls_to_try.sort(key=lambda candidate: candidate[2] != self._working_template)
             
             response = None
             successful_url = None
+            first_chunk = b''
+            chunk_iter = iter(())
             
             for test_url, test_params, description in urls_to_try:
                 if progress_callback:
@@ -1339,8 +2699,9 @@ class VMwareBackup:
                     progress_callback(f"Parameter: {test_params}")
                 
                 try:
-                    # Erste Anfrage ohne Stream, um zu prüfen, ob die Datei existiert
-                    test_response = session.get(test_url, params=test_params, stream=False, timeout=30)
+                    # Gestreamte Anfrage: zur Prüfung wird nur der erste Block gelesen,
+                    # bei Erfolg wird dieselbe Antwort für den Download weiterverwendet
+                    test_response = self._http_get(session, test_url, params=test_params, stream=True, timeout=30)
                     
                     if test_response.status_code == 200:
                         # Prüfe Content-Type
@@ -1349,44 +2710,41 @@ class VMwareBackup:
                         # Prüfe auf HTML-Fehler
                         if 'text/html' in content_type or 'application/xhtml' in content_type:
                             if progress_callback:
-                                error_text = test_response.text[:200]
+                                error_text = next(test_response.iter_content(512), b'')[:200].decode('utf-8', errors='ignore')
                                 progress_callback(f"URL {description} gibt HTML zurück: {error_text}...")
+                            test_response.close()
                             continue
                         
                         # Prüfe die ersten Bytes des Inhalts
-                        content_preview = test_response.content[:512]
+                        test_iter = test_response.iter_content(chunk_size=_COPY_BUFFER_SIZE)
+                        test_chunk = next(test_iter, b'')
+                        content_preview = test_chunk[:512]
                         
-                        # Prüfe auf HTML-Fehler im Content
-                        if content_preview.startswith(b'<') or b'<html' in content_preview.lower() or b'<!doctype' in content_preview.lower():
+                        # Prüfe auf HTML-Fehler oder Text-Fehlermeldungen im Content
+                        if content_preview.startswith(b'<') or _ERR_RE.search(content_preview):
                             if progress_callback:
-                                error_text = content_preview.decode('utf-8', errors='ignore')[:200]
-                                progress_callback(f"URL {description} gibt HTML zurück: {error_text}...")
+                                error_text = content_preview[:200].decode('utf-8', errors='ignore')
+                                progress_callback(f"URL {description} gibt Fehlermeldung zurück: {error_text}...")
+                            test_response.close()
                             continue
                         
-                        # Prüfe auf Text-Fehlermeldungen
-                        try:
-                            text_content = content_preview.decode('utf-8', errors='ignore')
-                            if any(keyword in text_content.lower() for keyword in ['not found', '404', 'forbidden', 'unauthorized', 'error']):
-                                if progress_callback:
-                                    progress_callback(f"URL {description} gibt Fehlermeldung zurück: {text_content[:200]}")
-                                continue
-                        except:
-                            pass
-                        
-                        # Prüfe Dateigröße
-                        content_length = len(test_response.content)
+                        # Prüfe Dateigröße (Header, sonst Länge des ersten Blocks)
+                        content_length = int(test_response.headers.get('content-length', 0) or len(test_chunk))
                         if content_length < 1024:  # Weniger als 1KB ist verdächtig
                             if progress_callback:
                                 progress_callback(f"URL {description} gibt sehr kleine Datei zurück ({content_length} Bytes)")
                                 # Zeige Inhalt zur Diagnose
-                                preview = test_response.text[:200] if hasattr(test_response, 'text') else str(test_response.content[:200])
+                                preview = test_chunk[:200].decode('utf-8', errors='ignore')
                                 progress_callback(f"Inhalt: {preview}")
+                            test_response.close()
                             continue
                         
                         # Wenn wir hier sind, sieht es nach einer echten Datei aus
-                        # Jetzt erstellen wir einen neuen Stream-Request für den Download
-                        response = session.get(test_url, params=test_params, stream=True, timeout=30)
+                        response = test_response
+                        first_chunk = test_chunk
+                        chunk_iter = test_iter
                         successful_url = description
+                        self._working_template = description
                         if progress_callback:
                             progress_callback(f"Download-URL erfolgreich: {description}")
                         break
@@ -1394,10 +2752,14 @@ class VMwareBackup:
                         if progress_callback:
                             progress_callback(f"URL {description} fehlgeschlagen: HTTP {test_response.status_code}")
                             try:
-                                error_text = test_response.text[:200]
+                                error_text = next(test_response.iter_content(512), b'')[:200].decode('utf-8', errors='ignore')
                                 progress_callback(f"Fehlerdetails: {error_text}")
                             except:
                                 pass
+                        test_response.close()
+                        if test_response.status_code == 401:
+                            # Falsche Zugangsdaten gelten für alle URL-Formate
+                            break
                 except Exception as e:
                     if progress_callback:
                         progress_callback(f"Fehler bei URL {description}: {str(e)}")
@@ -1418,10 +2780,11 @@ class VMwareBackup:
                         progress_callback(f"Möglicherweise falsche URL oder Berechtigungsproblem")
                         # Zeige ersten Teil der Response
                         try:
-                            preview = response.text[:500]
+                            preview = first_chunk[:500].decode('utf-8', errors='ignore')
                             progress_callback(f"Response-Vorschau: {preview}")
                         except:
                             pass
+                    response.close()
                     return False
                 
                 if progress_callback:
@@ -1429,30 +2792,35 @@ class VMwareBackup:
                     progress_callback(f"Erwartete Größe: {total_size // (1024*1024)}MB" if total_size > 0 else "Größe unbekannt")
                 
                 downloaded = 0
-                chunk_size = 1024 * 1024  # 1MB chunks
-                bytes_written = 0
                 
-                # Stream-Download - wichtig: Response nur einmal lesen!
-                with open(local_path, 'wb') as f:
-                    # Verwende iter_content für Streaming-Download
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:  # chunk kann leer sein, prüfe das
-                            f.write(chunk)
-                            bytes_written += len(chunk)
-                            downloaded += len(chunk)
+                if (total_size >= self.SFTP_PARALLEL_THRESHOLD
+                        and response.headers.get('accept-ranges', '').lower() == 'bytes'):
+                    # Große Dateien: mehrere Range-Anfragen gleichzeitig
+                    self._http_download_ranges(session, response, first_chunk, chunk_iter, local_path,
+                                               total_size, file_name, progress_callback)
+                else:
+                    # Stream-Download - wichtig: Response nur einmal lesen!
+                    limiter = _RateLimiter()
+                    # Der erste Block wurde schon bei der Prüfung gelesen
+                    chunks = self._resume_http_chunks(session, response.url,
+                                                      itertools.chain((first_chunk,), chunk_iter),
+                                                      0, total_size or None)
+                    with _open_backup_file(local_path) as f:
+                        for chunk in chunks:
+                            if chunk:  # chunk kann leer sein, prüfe das
+                                _write_sparse(f, chunk)
+                                downloaded += len(chunk)
                             
-                            if progress_callback:
-                                if total_size > 0:
-                                    progress = (downloaded / total_size) * 100
-                                    progress_callback(f"Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {total_size // (1024*1024)}MB)")
-                                else:
-                                    # Wenn Größe unbekannt, zeige nur heruntergeladene Menge
-                                    if downloaded % (10 * 1024 * 1024) < chunk_size:  # Alle 10MB
+                                if progress_callback and limiter.ready(0 < total_size <= downloaded):
+                                    if total_size > 0:
+                                        progress = (downloaded / total_size) * 100
+                                        progress_callback(f"Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {total_size // (1024*1024)}MB)")
+                                    else:
+                                        # Wenn Größe unbekannt, zeige nur heruntergeladene Menge
                                         progress_callback(f"Download {file_name}: {downloaded // (1024*1024)}MB...")
                     
-                    # Stelle sicher, dass Daten geschrieben wurden
-                    f.flush()
-                    os.fsync(f.fileno())
+                        # Länge festlegen, falls die Datei mit Null-Blöcken endet
+                        f.truncate()
                 
                 # Prüfe, ob die Datei tatsächlich geschrieben wurde
                 if os.path.exists(local_path):
@@ -1462,37 +2830,11 @@ class VMwareBackup:
                             progress_callback(f"Fehler: Datei wurde erstellt, aber ist leer (0 Bytes)")
                         os.remove(local_path)  # Lösche leere Datei
                         return False
-                    elif actual_size < 10240:  # Weniger als 10KB ist verdächtig für eine VMDK
-                        # Prüfe, ob es eine HTML-Fehlerseite oder Text-Fehlermeldung ist
-                        try:
-                            with open(local_path, 'rb') as f:
-                                first_bytes = f.read(512)
-                                # Prüfe auf HTML
-                                if b'<html' in first_bytes.lower() or b'<!doctype' in first_bytes.lower():
-                                    if progress_callback:
-                                        progress_callback(f"Fehler: Server hat HTML-Fehlerseite zurückgegeben statt VMDK")
-                                        # Zeige ersten Teil der Fehlermeldung
-                                        f.seek(0)
-                                        error_text = f.read(1000).decode('utf-8', errors='ignore')
-                                        progress_callback(f"Fehlerdetails: {error_text[:200]}...")
-                                    os.remove(local_path)
-                                    return False
-                                # Prüfe auf Text-Fehlermeldungen
-                                try:
-                                    text_content = first_bytes.decode('utf-8', errors='ignore')
-                                    if any(keyword in text_content.lower() for keyword in ['error', 'not found', '404', 'forbidden', 'unauthorized']):
-                                        if progress_callback:
-                                            progress_callback(f"Fehler: Server hat Fehlermeldung zurückgegeben: {text_content[:200]}")
-                                        os.remove(local_path)
-                                        return False
-                                except:
-                                    pass
-                        except Exception as e:
-                            if progress_callback:
-                                progress_callback(f"Fehler beim Überprüfen der Datei: {str(e)}")
-                        
+                    elif 0 < total_size and actual_size < total_size:
+                        # Die Prüfung der URL hat Fehlerseiten bereits ausgeschlossen,
+                        # hier bleibt nur ein vorzeitig beendeter Download
                         if progress_callback:
-                            progress_callback(f"Warnung: Datei ist sehr klein ({actual_size} Bytes). Möglicherweise Fehler.")
+                            progress_callback(f"Fehler: Download unvollständig ({actual_size} von {total_size} Bytes)")
                         os.remove(local_path)
                         return False
                     
@@ -1522,6 +2864,196 @@ class VMwareBackup:
                 progress_callback(f"Fehler beim HTTP-Download: {str(e)}")
             return False
     
+    def _http_download_ranges(self, session, response, first_chunk: bytes, chunk_iter,
+                              local_path: str, total_size: int, file_name: str,
+                              progress_callback=None):
+        """
+        Lädt eine große Datei über mehrere gleichzeitige HTTP-Range-Anfragen
+        
+        Die Datei wird in HTTP_RANGE_STREAMS Abschnitte geteilt. Den ersten
+        liest die bereits geöffnete Antwort weiter, für die übrigen wird je
+        eine Range-Anfrage über den Verbindungspool gestellt. Jeder Abschnitt
+        wird per pwrite an seinen Offset der vorab angelegten Datei geschrieben.
+        
+        Args:
+            session: requests.Session aus _get_http_session
+            response: Geprüfte, gestreamte Antwort für die ganze Datei
+            first_chunk: Bereits gelesener erster Block der Antwort
+            chunk_iter: iter_content der Antwort (nach dem ersten Block)
+            local_path: Lokaler Zielpfad
+            total_size: Dateigröße laut Content-Length
+            file_name: Dateiname für Fortschrittsmeldungen
+            progress_callback: Optional Callback
+            
+        Raises:
+            IOError: Bei Abbruch oder wenn der Server keine Teilinhalte liefert
+        """
+        # Abschnittsgrenzen auf Blockgröße ausrichten
+        blocks = (total_size + _COPY_BUFFER_SIZE - 1) // _COPY_BUFFER_SIZE
+        per_stream = (blocks + self.HTTP_RANGE_STREAMS - 1) // self.HTTP_RANGE_STREAMS * _COPY_BUFFER_SIZE
+        ranges = [(start, min(start + per_stream, total_size)) for start in range(0, total_size, per_stream)]
+        
+        downloaded = 0
+        lock = threading.Lock()
+        # Wird beim ersten Fehler gesetzt, damit die übrigen Abschnitte sofort aufhören
+        failed = threading.Event()
+        
+        def write_range(fd: int, start: int, end: int, chunks):
+            nonlocal downloaded
+            offset = start
+            for chunk in chunks:
+                if self._is_cancelled():
+                    raise IOError("Download abgebrochen")
+                if failed.is_set():
+                    return  # Fehler wird von dem Abschnitt gemeldet, der ihn ausgelöst hat
+                chunk = chunk[:end - offset]
+                if not _is_zero_block(chunk):
+                    os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                with lock:
+                    downloaded += len(chunk)
+                if offset >= end:
+                    break
+            if offset < end:
+                raise IOError(f"Abschnitt {start}-{end} unvollständig ({offset - start} Bytes)")
+        
+        def fetch_range(fd: int, start: int, end: int):
+            try:
+                range_response = self._http_get(session, response.url, headers={'Range': f"bytes={start}-{end - 1}"},
+                                                stream=True, timeout=30)
+            except Exception:
+                failed.set()
+                raise
+            try:
+                if range_response.status_code != 206:
+                    raise IOError(f"Server liefert keine Teilinhalte (HTTP {range_response.status_code})")
+                chunks = range_response.iter_content(chunk_size=_COPY_BUFFER_SIZE)
+                write_range(fd, start, end, self._resume_http_chunks(session, response.url, chunks, start, end))
+            except Exception:
+                failed.set()
+                raise
+            finally:
+                range_response.close()
+        
+        def first_range(fd: int, start: int, end: int):
+            try:
+                chunks = itertools.chain((first_chunk,), chunk_iter)
+                write_range(fd, start, end, self._resume_http_chunks(session, response.url, chunks, start, end))
+            except Exception:
+                failed.set()
+                raise
+            finally:
+                response.close()
+        
+        with _open_backup_file(local_path) as local_file:
+            fd = local_file.fileno()
+            os.ftruncate(fd, total_size)
+            
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(first_range, fd, *ranges[0])]
+                futures += [executor.submit(fetch_range, fd, start, end) for start, end in ranges[1:]]
+                # Fortschritt aus dem aufrufenden Thread melden
+                pending = futures
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        future.result()  # Fehler eines Abschnitts weiterreichen
+                    if progress_callback:
+                        progress = (downloaded / total_size) * 100
+                        progress_callback(f"Download {file_name}: {progress:.1f}% ({downloaded // (1024*1024)}MB / {total_size // (1024*1024)}MB)")
+    
+    def _http_get(self, session, url: str, **kwargs):
+        """
+        GET-Anfrage mit Wiederholung bei vorübergehenden Fehlern
+        
+        Verbindungsabbrüche, Timeouts und HTTP 5xx werden bis zu HTTP_RETRIES mal
+        mit exponentiell wachsender Wartezeit wiederholt. Andere Statuscodes wie
+        401/403/404 ändern sich dadurch nicht und werden sofort zurückgegeben.
+        
+        Args:
+            session: requests.Session aus _get_http_session
+            url: Anzufragende URL
+            **kwargs: Weitere Argumente für session.get
+            
+        Returns:
+            requests.Response des letzten Versuchs
+            
+        Raises:
+            requests.exceptions.RequestException: Wenn auch der letzte Versuch scheitert
+        """
+        for attempt in range(self.HTTP_RETRIES + 1):
+            last_attempt = attempt == self.HTTP_RETRIES or self._is_cancelled()
+            try:
+                response = session.get(url, **kwargs)
+            except _HTTP_TRANSIENT_ERRORS:
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or response.status_code not in self.HTTP_RETRY_STATUS:
+                    return response
+                response.close()
+            time.sleep(_backoff_delay(attempt))
+    
+    def _resume_http_chunks(self, session, url: str, chunks, start: int, end: Optional[int] = None):
+        """
+        Liefert die Blöcke einer gestreamten Antwort und setzt nach einem
+        Verbindungsabbruch per Range-Anfrage ab dem zuletzt gelesenen Byte fort
+        
+        Args:
+            session: requests.Session aus _get_http_session
+            url: URL der Datei
+            chunks: Block-Iterator der laufenden Antwort
+            start: Dateioffset des ersten Blocks
+            end: Ende des Bereichs (exklusiv), None für Dateiende
+            
+        Yields:
+            Datenblöcke als bytes
+            
+        Raises:
+            IOError: Wenn der Server die Fortsetzung nicht als Teilinhalt liefert
+            requests.exceptions.RequestException: Wenn alle Wiederholungen scheitern
+        """
+        offset = start
+        attempt = 0
+        resumed = None
+        try:
+            while True:
+                try:
+                    for chunk in chunks:
+                        offset += len(chunk)
+                        attempt = 0
+                        yield chunk
+                    return
+                except _HTTP_TRANSIENT_ERRORS:
+                    if attempt >= self.HTTP_RETRIES or self._is_cancelled():
+                        raise
+                time.sleep(_backoff_delay(attempt))
+                attempt += 1
+                if resumed is not None:
+                    resumed.close()
+                byte_range = f"bytes={offset}-{end - 1 if end is not None else ''}"
+                resumed = self._http_get(session, url, headers={'Range': byte_range}, stream=True, timeout=30)
+                if resumed.status_code != 206:
+                    raise IOError(f"Fortsetzen ab Byte {offset} nicht möglich (HTTP {resumed.status_code})")
+                chunks = resumed.iter_content(chunk_size=_COPY_BUFFER_SIZE)
+        finally:
+            if resumed is not None:
+                resumed.close()
+    
+    def _get_datacenter_name(self) -> str:
+        """
+        Liefert den Namen des Datacenters, zwischengespeichert pro Verbindung
+        
+        Returns:
+            Name des Datacenters oder "" wenn keins gefunden wurde
+        """
+        if self._datacenter_name is None:
+            datacenter = self._get_datacenter()
+            if not datacenter:
+                return ""
+            self._datacenter_name = datacenter.name
+        return self._datacenter_name
+    
     def _get_datacenter(self) -> Optional[vim.Datacenter]:
         """Ruft das Datacenter ab"""
         if not self.content:
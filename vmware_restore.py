@@ -7,16 +7,95 @@ import ssl
 import os
 import json
 import re
+import shlex
+import threading
+import time
+import traceback
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Dict, Optional
 from pathlib import Path
 from pyVim.connect import SmartConnect, Disconnect
 from pyVmomi import vim, vmodl
 
+try:
+    import orjson  # Optional: schnelleres JSON-Parsen
+except ImportError:
+    orjson = None
+
+try:
+    import paramiko  # Für SSH/SFTP-Uploads
+except ImportError:
+    paramiko = None
+
+try:
+    import requests  # Für HTTPS-Uploads über den Datastore-Browser
+    import urllib3
+    from requests.auth import HTTPBasicAuth
+except ImportError:
+    requests = None
+
+
+# Timestamp am Ende eines Backup-Verzeichnisnamens: Name_YYYYMMDD_HHMMSS
+_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})$')
+
+# SSL-Kontext ohne Zertifikatsprüfung (selbstsignierte ESXi-Zertifikate), einmal
+# erzeugt und bei jedem connect() wiederverwendet
+_UNVERIFIED_SSL_CONTEXT = ssl._create_unverified_context()
+
+
+def _load_json(data: bytes):
+    """Parst UTF-8-JSON, mit orjson falls installiert"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Blockgröße beim Lesen lokaler Dateien für Uploads (urllib3 und paramiko
+# lesen sonst in 16- bzw. 32-KiB-Blöcken); größere Blöcke sparen Python-Aufrufe
+_UPLOAD_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class _UploadReader:
+    """Lesbares Dateiobjekt für HTTPS-Uploads, das Fortschritt meldet und bei Abbruch aufhört"""
+    
+    def __init__(self, file, size: int, is_aborted, on_read):
+        self._file = file
+        self._size = size
+        self._is_aborted = is_aborted
+        self._on_read = on_read
+        self._transferred = 0
+    
+    def __len__(self) -> int:
+        # requests setzt damit Content-Length statt Chunked-Encoding
+        return self._size
+    
+    def read(self, size: int = -1) -> bytes:
+        if self._is_aborted():
+            raise IOError("Upload abgebrochen")
+        if 0 < size < _UPLOAD_BLOCK_SIZE:
+            size = _UPLOAD_BLOCK_SIZE
+        data = self._file.read(size)
+        self._transferred += len(data)
+        self._on_read(self._transferred)
+        return data
+
 
 class VMwareRestore:
     """Klasse zur Verwaltung von VMware ESXi Restores"""
     
+    DATASTORE_CACHE_TTL = 60  # Gültigkeit der Datastore-Liste in Sekunden
+    SSH_KEEPALIVE_INTERVAL = 30  # Sekunden zwischen Keepalive-Paketen
+    # CBC-Modi und 3DES sind auf beiden Seiten deutlich langsamer als aes128-ctr/-gcm
+    SSH_SLOW_CIPHERS = ['3des-cbc', 'blowfish-cbc', 'aes128-cbc', 'aes192-cbc', 'aes256-cbc']
+    PROGRESS_INTERVAL = 0.5  # Mindestabstand zwischen Upload-Fortschrittsmeldungen in Sekunden
+    UPLOAD_CONCURRENCY = 4  # Gleichzeitig hochgeladene VMDK-Dateien (unter MaxSessions)
+    # 128 KiB pro WRITE-Anfrage statt paramikos 32 KiB; der sftp-server von OpenSSH
+    # verwirft Nachrichten über 256 KiB (inkl. Kopf), größer geht also nicht
+    SFTP_WRITE_REQUEST_SIZE = 2 ** 17
+    
     def __init__(self, host: str, user: str, password: str, port: int = 443):
         """
         Initialisiert die Verbindung zum ESXi Server
@@ -33,6 +112,144 @@ class VMwareRestore:
         self.port = port
         self.service_instance = None
         self.content = None
+        self._cancel_flag = None  # Referenz zum Cancel-Flag vom Runnable
+        self._active_ssh_connection = None  # Wiederverwendete SSH-Verbindung (auch für Cancel)
+        self._sftp_sessions = {}  # Thread-ID -> SFTP-Session auf dieser Verbindung
+        self._ssh_lock = threading.Lock()
+        self._percent_callback = None  # Callback für Fortschritt in Prozent
+        self._last_percent = None  # Zuletzt gemeldeter Prozentwert
+        self._last_progress_ts = {}  # Dateiname -> Zeitpunkt (monotonic) der letzten Upload-Meldung
+        self._upload_progress = {}  # Dateiname -> übertragene Bytes der laufenden Wiederherstellung
+        self._upload_total = 0  # Summe der Dateigrößen der laufenden Wiederherstellung
+        self._upload_abort = threading.Event()  # Gesetzt, wenn ein Upload fehlschlägt
+        self._datastore_cache = None  # Zwischengespeicherte Datastores (Name -> Datastore)
+        self._datastore_cache_ts = 0.0  # Zeitpunkt (monotonic) des letzten Abrufs
+        self._datacenter = None  # Zwischengespeichertes Datacenter
+        self._scan_cache = {}  # Pfad einer Metadaten-Datei -> ((mtime_ns, Größe), Inhalt)
+        self._datacenter_name: Optional[str] = None  # Zwischengespeicherter Datacenter-Name
+        self._http_session = None  # Wiederverwendete HTTPS-Session für Datastore-Uploads
+    
+    def set_cancel_flag(self, runnable):
+        """Setzt das Cancel-Flag vom Runnable"""
+        self._cancel_flag = runnable
+    
+    def set_percent_callback(self, callback):
+        """Setzt den Callback für den Fortschritt in Prozent"""
+        self._percent_callback = callback
+    
+    def _report_percent(self, percent: float):
+        """Meldet den Fortschritt in Prozent, aber nur bei Änderung"""
+        value = int(percent)
+        if self._percent_callback and value != self._last_percent:
+            self._last_percent = value
+            self._percent_callback(value)
+    
+    def cancel_restore(self):
+        """Bricht die aktuelle Wiederherstellung ab"""
+        # Schließe aktive SSH-Verbindungen, damit ein laufender Upload abbricht
+        self._close_ssh()
+    
+    def _get_ssh(self):
+        """
+        Liefert die SSH-Verbindung zum ESXi Server
+        
+        Eine bestehende Verbindung wird wiederverwendet, solange ihr Transport
+        aktiv ist, damit nicht jede VMDK-Datei einen eigenen Handshake braucht.
+        Gleichzeitige Uploads teilen sich diese Verbindung.
+        
+        Returns:
+            Verbundener paramiko.SSHClient
+        """
+        with self._ssh_lock:
+            ssh = self._active_ssh_connection
+            if ssh is not None:
+                transport = ssh.get_transport()
+                if transport is not None and transport.is_active():
+                    return ssh
+                self._close_ssh()
+            
+            if paramiko is None:
+                raise ImportError("paramiko-Bibliothek fehlt")
+            
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh.connect(
+                self.host,
+                username=self.user,
+                password=self.password,
+                port=22,
+                timeout=30,
+                allow_agent=False,
+                look_for_keys=False,
+                # VMDK-Daten komprimieren kaum, zlib in Python bremst nur
+                compress=False,
+                disabled_algorithms={
+                    'ciphers': self.SSH_SLOW_CIPHERS,
+                    'compression': ['zlib', 'zlib@openssh.com'],
+                }
+            )
+            ssh.get_transport().set_keepalive(self.SSH_KEEPALIVE_INTERVAL)
+            self._active_ssh_connection = ssh  # Für Cancel speichern
+            return ssh
+    
+    def _get_sftp(self):
+        """Liefert die SFTP-Session des aktuellen Threads auf der wiederverwendeten SSH-Verbindung"""
+        ssh = self._get_ssh()
+        key = threading.get_ident()
+        sftp = self._sftp_sessions.get(key)
+        if sftp is None or sftp.get_channel().closed:
+            sftp = ssh.open_sftp()
+            self._sftp_sessions[key] = sftp  # Für Cancel speichern
+        return sftp
+    
+    def _close_ssh(self):
+        """Schließt alle SFTP-Sessions und die SSH-Verbindung"""
+        sessions, self._sftp_sessions = self._sftp_sessions, {}
+        for sftp in sessions.values():
+            try:
+                sftp.close()
+            except:
+                pass
+        
+        if self._active_ssh_connection:
+            try:
+                self._active_ssh_connection.close()
+            except:
+                pass
+            self._active_ssh_connection = None
+    
+    def _get_http_session(self):
+        """
+        Liefert die HTTPS-Session für Datastore-Uploads
+        
+        Die Session wird einmal angelegt und hält bis zu UPLOAD_CONCURRENCY
+        Verbindungen offen.
+        
+        Returns:
+            requests.Session oder None, wenn requests fehlt
+        """
+        if requests is None:
+            return None
+        if self._http_session is None:
+            # SSL-Warnungen unterdrücken (selbstsignierte Zertifikate)
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(self.user, self.password)
+            session.verify = False
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.UPLOAD_CONCURRENCY)
+            session.mount('https://', adapter)
+            self._http_session = session
+        return self._http_session
+    
+    def _is_cancelled(self) -> bool:
+        """Prüft, ob die Wiederherstellung abgebrochen wurde"""
+        if self._cancel_flag:
+            return self._cancel_flag.is_cancelled()
+        return False
+    
+    def _upload_aborted(self) -> bool:
+        """Prüft, ob laufende Uploads aufhören sollen (Abbruch oder Fehler eines anderen Uploads)"""
+        return self._upload_abort.is_set() or self._is_cancelled()
         
     def connect(self) -> bool:
         """
@@ -42,17 +259,16 @@ class VMwareRestore:
             True bei erfolgreicher Verbindung, False sonst
         """
         try:
-            context = ssl._create_unverified_context()
-            
             self.service_instance = SmartConnect(
                 host=self.host,
                 user=self.user,
                 pwd=self.password,
                 port=self.port,
-                sslContext=context
+                sslContext=_UNVERIFIED_SSL_CONTEXT
             )
             
             self.content = self.service_instance.RetrieveContent()
+            self.invalidate_cache()  # Neue Sitzung: Cache verwerfen
             return True
             
         except Exception as e:
@@ -61,8 +277,19 @@ class VMwareRestore:
     
     def disconnect(self):
         """Trennt die Verbindung zum ESXi Server"""
+        self._close_ssh()
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
         if self.service_instance:
             Disconnect(self.service_instance)
+        self.invalidate_cache()
+    
+    def invalidate_cache(self):
+        """Verwirft alle zwischengespeicherten Inventar-Objekte der Sitzung"""
+        self._datastore_cache = None
+        self._datacenter = None
+        self._datacenter_name = None
     
     def scan_backup_directory(self, backup_dir: str) -> List[Dict]:
         """
@@ -76,45 +303,47 @@ class VMwareRestore:
         """
         backups = []
         
-        if not os.path.exists(backup_dir):
+        # scandir liefert den Typ direkt aus dem Verzeichniseintrag (kein stat pro Eintrag)
+        try:
+            with os.scandir(backup_dir) as it:
+                entries = [entry for entry in it if entry.is_dir()]
+        except FileNotFoundError:
             return backups
         
-        for item in os.listdir(backup_dir):
-            item_path = os.path.join(backup_dir, item)
-            if not os.path.isdir(item_path):
-                continue
+        for entry in entries:
+            item = entry.name
+            item_path = entry.path
             
             # Prüfe, ob es ein Backup-Verzeichnis ist (enthält vm_info.json oder host_config.json)
             backup_info = {
                 'name': item,
                 'path': item_path,
                 'type': None,
-                'timestamp': None,
+                'timestamp': '',  # Leer statt None, damit direkt sortiert werden kann
                 'info': {}
             }
             
             # Prüfe auf VM-Backup
             vm_info_file = os.path.join(item_path, 'vm_info.json')
-            if os.path.exists(vm_info_file):
-                try:
-                    with open(vm_info_file, 'r', encoding='utf-8') as f:
-                        vm_info = json.load(f)
+            try:
+                vm_info = self._read_backup_json(vm_info_file)
+                if vm_info is not None:
                     backup_info['type'] = 'vm'
                     backup_info['info'] = vm_info
-                    backup_info['timestamp'] = self._extract_timestamp(item)
-                except Exception as e:
-                    print(f"Fehler beim Lesen von {vm_info_file}: {str(e)}")
-                    continue
+                    backup_info['timestamp'] = self._extract_timestamp(item) or ''
+            except Exception as e:
+                print(f"Fehler beim Lesen von {vm_info_file}: {str(e)}")
+                continue
             
-            # Prüfe auf Host-Backup
-            host_config_file = os.path.join(item_path, 'host_config.json')
-            if os.path.exists(host_config_file):
+            # Prüfe auf Host-Backup (nur, wenn es kein VM-Backup ist)
+            if backup_info['type'] is None:
+                host_config_file = os.path.join(item_path, 'host_config.json')
                 try:
-                    with open(host_config_file, 'r', encoding='utf-8') as f:
-                        host_info = json.load(f)
-                    backup_info['type'] = 'host'
-                    backup_info['info'] = host_info
-                    backup_info['timestamp'] = self._extract_timestamp(item)
+                    host_info = self._read_backup_json(host_config_file)
+                    if host_info is not None:
+                        backup_info['type'] = 'host'
+                        backup_info['info'] = host_info
+                        backup_info['timestamp'] = self._extract_timestamp(item) or ''
                 except Exception as e:
                     print(f"Fehler beim Lesen von {host_config_file}: {str(e)}")
                     continue
@@ -122,12 +351,40 @@ class VMwareRestore:
             if backup_info['type']:
                 backups.append(backup_info)
         
-        return sorted(backups, key=lambda x: x['timestamp'] if x['timestamp'] else '', reverse=True)
+        return sorted(backups, key=itemgetter('timestamp'), reverse=True)
+    
+    def _read_backup_json(self, path: str) -> Optional[Dict]:
+        """
+        Liest eine Metadaten-Datei eines Backups
+        
+        Der Inhalt wird nach Änderungszeit und Größe zwischengespeichert, so
+        werden bei erneuten Scans nur neue oder geänderte Dateien geparst.
+        
+        Args:
+            path: Pfad zu vm_info.json oder host_config.json
+            
+        Returns:
+            Geparster Inhalt oder None, wenn die Datei nicht existiert
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._scan_cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with open(path, 'rb') as f:
+            info = _load_json(f.read())
+        self._scan_cache[path] = (version, info)
+        return info
     
     def _extract_timestamp(self, name: str) -> Optional[str]:
         """Extrahiert Timestamp aus Backup-Verzeichnisnamen"""
         # Format: Name_YYYYMMDD_HHMMSS
-        match = re.search(r'_(\d{8}_\d{6})$', name)
+        match = _TIMESTAMP_RE.search(name)
         if match:
             return match.group(1)
         return None
@@ -207,18 +464,18 @@ class VMwareRestore:
                 progress_callback(f"Wiederherstelle VM: {vm_name} (Original: {original_vm_name})")
             
             # Finde Datastore
-            datastores = self._get_datastores()
+            datastores = self._get_datastores_by_name()
             if not datastores:
                 if progress_callback:
                     progress_callback("Fehler: Keine Datastores gefunden")
                 return False
             
-            # Wähle Datastore
+            # Wähle Datastore (Namen kommen aus dem Cache, kein Abruf pro Datastore)
             if datastore_name:
-                datastore = next((ds for ds in datastores if ds.name == datastore_name), None)
+                datastore = datastores.get(datastore_name)
             else:
                 # Verwende ersten verfügbaren Datastore
-                datastore = datastores[0]
+                datastore = next(iter(datastores.values()))
             
             if not datastore:
                 if progress_callback:
@@ -242,25 +499,51 @@ class VMwareRestore:
             # Erstelle VM-Verzeichnis auf Datastore
             vm_folder = vm_name.replace(' ', '_')
             
-            # Lade VMDK-Dateien hoch
-            uploaded_files = []
-            for vmdk_file in vmdk_files:
+            # Lade VMDK-Dateien gleichzeitig hoch: je Datei eine HTTPS-Verbindung
+            # aus dem Pool bzw. eine SFTP-Session auf der gemeinsamen SSH-Verbindung
+            self._upload_progress = {}
+            self._upload_abort.clear()
+            self._upload_total = sum(os.path.getsize(vmdk_file) for vmdk_file in vmdk_files)
+            self._report_percent(0)
+            uploaded = {}
+            # Verzeichnis und Session einmal anlegen, bevor die Worker starten
+            self._make_vm_folder(datastore, vm_folder)
+            self._get_http_session()
+            try:
+                with ThreadPoolExecutor(max_workers=min(self.UPLOAD_CONCURRENCY, len(vmdk_files))) as executor:
+                    futures = {
+                        executor.submit(self._upload_vmdk, vmdk_file, datastore, vm_folder, progress_callback): vmdk_file
+                        for vmdk_file in vmdk_files
+                    }
+                    for future in as_completed(futures):
+                        vmdk_file = futures[future]
+                        uploaded_path = future.result()
+                        if uploaded_path:
+                            uploaded[vmdk_file] = uploaded_path
+                            continue
+                        
+                        # Restliche Uploads verwerfen; laufende HTTPS-Uploads prüfen das
+                        # Abbruch-Signal pro Block, SFTP-Uploads enden mit der Verbindung
+                        self._upload_abort.set()
+                        for other in futures:
+                            other.cancel()
+                        self._close_ssh()
+                        if progress_callback:
+                            if self._is_cancelled():
+                                progress_callback("Wiederherstellung abgebrochen")
+                            else:
+                                progress_callback(f"Fehler beim Hochladen von {os.path.basename(vmdk_file)}")
+                        return False
+            finally:
+                self._close_ssh()
+            
+            # Reihenfolge wie von _find_vmdk_files geliefert
+            uploaded_files = [uploaded[vmdk_file] for vmdk_file in vmdk_files]
+            
+            if self._is_cancelled():
                 if progress_callback:
-                    progress_callback(f"Lade hoch: {os.path.basename(vmdk_file)}...")
-                
-                uploaded_path = self._upload_vmdk(
-                    vmdk_file, 
-                    datastore, 
-                    vm_folder, 
-                    progress_callback
-                )
-                
-                if uploaded_path:
-                    uploaded_files.append(uploaded_path)
-                else:
-                    if progress_callback:
-                        progress_callback(f"Fehler beim Hochladen von {os.path.basename(vmdk_file)}")
-                    return False
+                    progress_callback("Wiederherstellung abgebrochen")
+                return False
             
             # Erstelle VM-Konfiguration
             if progress_callback:
@@ -286,34 +569,81 @@ class VMwareRestore:
         except Exception as e:
             if progress_callback:
                 progress_callback(f"Fehler bei VM-Wiederherstellung: {str(e)}")
-            import traceback
             if progress_callback:
                 progress_callback(f"Details: {traceback.format_exc()[:500]}")
             return False
     
-    def _get_datastores(self) -> List[vim.Datastore]:
-        """Ruft alle Datastores ab"""
+    def get_datastore_names(self, refresh: bool = False) -> List[str]:
+        """
+        Ruft die Namen aller Datastores ab
+        
+        Args:
+            refresh: Cache ignorieren und Namen neu abrufen
+        
+        Returns:
+            Liste von Datastore-Namen
+        """
+        return list(self._get_datastores_by_name(refresh))
+    
+    def _get_datastores_by_name(self, refresh: bool = False) -> Dict[str, vim.Datastore]:
+        """
+        Ruft alle Datastores mit ihren Namen in einem PropertyCollector-Aufruf ab
+        
+        Das Ergebnis wird für DATASTORE_CACHE_TTL Sekunden zwischengespeichert.
+        
+        Args:
+            refresh: Cache ignorieren und neu abrufen
+        
+        Returns:
+            Dictionary Name -> Datastore
+        """
         if not self.content:
-            return []
+            return {}
+        
+        if (not refresh and self._datastore_cache is not None
+                and time.monotonic() - self._datastore_cache_ts < self.DATASTORE_CACHE_TTL):
+            return self._datastore_cache
         
         datastore_view = self.content.viewManager.CreateContainerView(
             self.content.rootFolder,
             [vim.Datastore],
             True
         )
-        datastores = datastore_view.view
-        datastore_view.Destroy()
-        return datastores
+        try:
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+                name='traverseView',
+                path='view',
+                skip=False,
+                type=vim.view.ContainerView
+            )
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(
+                obj=datastore_view,
+                skip=True,
+                selectSet=[traversal_spec]
+            )
+            property_spec = vmodl.query.PropertyCollector.PropertySpec(
+                type=vim.Datastore,
+                pathSet=['name'],
+                all=False
+            )
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+                objectSet=[object_spec],
+                propSet=[property_spec]
+            )
+            results = self.content.propertyCollector.RetrieveContents([filter_spec])
+        finally:
+            datastore_view.Destroy()
+        
+        self._datastore_cache = {result.propSet[0].val: result.obj for result in results if result.propSet}
+        self._datastore_cache_ts = time.monotonic()
+        return self._datastore_cache
     
     def _find_vmdk_files(self, backup_path: str) -> List[str]:
         """Findet alle VMDK-Dateien im Backup-Verzeichnis"""
-        vmdk_files = []
-        
-        for file in os.listdir(backup_path):
-            if file.endswith('.vmdk') and not file.endswith('.metadata.json'):
-                file_path = os.path.join(backup_path, file)
-                if os.path.isfile(file_path):
-                    vmdk_files.append(file_path)
+        # scandir liefert den Typ aus dem Verzeichniseintrag, ohne stat pro Datei
+        with os.scandir(backup_path) as it:
+            vmdk_files = [entry.path for entry in it
+                          if entry.name.endswith('.vmdk') and entry.is_file()]
         
         # Sortiere: Descriptor-Datei zuerst, dann -flat.vmdk
         vmdk_files.sort(key=lambda x: (not x.endswith('-flat.vmdk'), x))
@@ -334,47 +664,40 @@ class VMwareRestore:
         Returns:
             Pfad zur hochgeladenen Datei oder None
         """
+        if self._upload_aborted():
+            return None
+        
         try:
-            import paramiko
-            import re
-            
             file_name = os.path.basename(local_file)
             file_size = os.path.getsize(local_file)
             
-            # SSH-Verbindung herstellen
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            if progress_callback:
+                progress_callback(f"Lade hoch: {file_name} ({file_size // (1024*1024)}MB)...")
             
-            ssh.connect(
-                self.host,
-                username=self.user,
-                password=self.password,
-                port=22,
-                timeout=30,
-                allow_agent=False,
-                look_for_keys=False
-            )
+            # Bevorzugt per HTTPS-PUT: schneller als SFTP und ohne SSH-Dienst
+            if self._upload_vmdk_http(local_file, datastore, vm_folder, file_size, progress_callback):
+                if progress_callback:
+                    progress_callback(f"Hochladen abgeschlossen: {file_name}")
+                return f"[{datastore.name}] {vm_folder}/{file_name}"
+            if self._upload_aborted():
+                return None
+            
+            # Wiederverwendete SSH-Verbindung
+            ssh = self._get_ssh()
             
             # Erstelle VM-Verzeichnis auf Datastore
             remote_dir = f"/vmfs/volumes/{datastore.name}/{vm_folder}"
-            ssh.exec_command(f"mkdir -p '{remote_dir}'")
+            stdin, stdout, stderr = ssh.exec_command(f"mkdir -p {shlex.quote(remote_dir)}")
+            stdout.channel.recv_exit_status()  # Verzeichnis muss vor dem Upload existieren
             
             # Remote-Pfad
             remote_path = f"{remote_dir}/{file_name}"
             
-            if progress_callback:
-                progress_callback(f"Lade hoch: {file_name} ({file_size // (1024*1024)}MB)...")
-            
             # Upload mit SCP
-            scp = ssh.open_sftp()
+            scp = self._get_sftp()
             
             try:
-                scp.put(local_file, remote_path, callback=lambda x, y: self._upload_progress_callback(
-                    x, y, file_size, file_name, progress_callback
-                ) if file_size > 1024 else None)
-                
-                scp.close()
-                ssh.close()
+                self._sftp_upload(scp, local_file, remote_path, file_size, progress_callback)
                 
                 if progress_callback:
                     progress_callback(f"Hochladen abgeschlossen: {file_name}")
@@ -382,8 +705,10 @@ class VMwareRestore:
                 return f"[{datastore.name}] {vm_folder}/{file_name}"
                 
             except Exception as e:
-                scp.close()
-                ssh.close()
+                # Verbindung in unklarem Zustand: beim nächsten Upload neu aufbauen
+                self._close_ssh()
+                if self._upload_aborted():
+                    return None
                 if progress_callback:
                     progress_callback(f"Upload-Fehler: {str(e)}")
                 return None
@@ -393,10 +718,120 @@ class VMwareRestore:
                 progress_callback(f"Upload-Fehler: {str(e)}")
             return None
     
+    def _sftp_upload(self, sftp, local_file: str, remote_path: str, file_size: int,
+                     progress_callback=None):
+        """
+        Lädt eine Datei per SFTP hoch
+        
+        Ersetzt sftp.put: die lokale Datei wird in großen Blöcken gelesen und
+        mit größeren, pipelined WRITE-Anfragen gesendet; der Fortschritt wird
+        pro Block statt pro 32-KiB-Paket geprüft.
+        
+        Args:
+            sftp: paramiko.SFTPClient
+            local_file: Pfad zur lokalen Datei
+            remote_path: Zielpfad auf dem ESXi Server
+            file_size: Größe der lokalen Datei in Bytes
+            progress_callback: Optional Callback
+            
+        Raises:
+            IOError: Bei Abbruch oder wenn die Zieldatei nicht vollständig ist
+        """
+        file_name = os.path.basename(local_file)
+        transferred = 0
+        with open(local_file, 'rb') as local, sftp.open(remote_path, 'wb') as remote:
+            remote.MAX_REQUEST_SIZE = self.SFTP_WRITE_REQUEST_SIZE
+            # Nicht auf die Bestätigung jeder WRITE-Anfrage warten
+            remote.set_pipelined(True)
+            for chunk in iter(lambda: local.read(_UPLOAD_BLOCK_SIZE), b''):
+                if self._upload_aborted():
+                    raise IOError("Upload abgebrochen")
+                remote.write(chunk)
+                transferred += len(chunk)
+                self._upload_progress_callback(transferred, file_size, file_size, file_name, progress_callback)
+        
+        remote_size = sftp.stat(remote_path).st_size
+        if remote_size != file_size:
+            raise IOError(f"Größe stimmt nicht: {remote_size} != {file_size}")
+    
+    def _upload_vmdk_http(self, local_file: str, datastore: vim.Datastore, vm_folder: str,
+                          file_size: int, progress_callback=None) -> bool:
+        """
+        Lädt eine Datei per HTTPS-PUT über den Datastore-Browser (/folder) hoch
+        
+        Das Zielverzeichnis muss bereits existieren (siehe _make_vm_folder).
+        
+        Args:
+            local_file: Pfad zur lokalen Datei
+            datastore: Datastore-Objekt
+            vm_folder: VM-Verzeichnisname auf dem Datastore
+            file_size: Größe der lokalen Datei in Bytes
+            progress_callback: Optional Callback
+            
+        Returns:
+            True bei Erfolg, False wenn der Upload auf diesem Weg nicht möglich war
+        """
+        session = self._get_http_session()
+        if session is None:
+            return False
+        
+        file_name = os.path.basename(local_file)
+        url = f"https://{self.host}:{self.port}/folder/{urllib.parse.quote(f'{vm_folder}/{file_name}')}"
+        params = {'dsName': datastore.name}
+        dc_path = self._get_datacenter_name()
+        if dc_path:
+            params['dcPath'] = dc_path
+        
+        try:
+            with open(local_file, 'rb') as f:
+                reader = _UploadReader(f, file_size, self._upload_aborted, lambda transferred: self._upload_progress_callback(
+                    transferred, file_size, file_size, file_name, progress_callback
+                ))
+                response = session.put(url, params=params, data=reader,
+                                       headers={'Content-Type': 'application/octet-stream'}, timeout=60)
+            response.close()
+        except Exception as e:
+            if progress_callback and not self._upload_aborted():
+                progress_callback(f"HTTPS-Upload fehlgeschlagen: {str(e)}, verwende SFTP...")
+            return False
+        
+        if response.status_code in (200, 201):
+            return True
+        if progress_callback:
+            progress_callback(f"HTTPS-Upload nicht möglich (HTTP {response.status_code}), verwende SFTP...")
+        return False
+    
+    def _make_vm_folder(self, datastore: vim.Datastore, vm_folder: str):
+        """
+        Legt das VM-Verzeichnis über den FileManager der vSphere API an
+        
+        Fehler werden ignoriert: der SFTP-Upload legt das Verzeichnis
+        notfalls selbst per mkdir an.
+        
+        Args:
+            datastore: Datastore-Objekt
+            vm_folder: VM-Verzeichnisname auf dem Datastore
+        """
+        try:
+            self.content.fileManager.MakeDirectory(
+                name=f"[{datastore.name}] {vm_folder}",
+                datacenter=self._get_datacenter(),
+                createParentDirectories=True
+            )
+        except Exception:
+            pass  # Existiert bereits oder FileManager nicht verfügbar
+    
     def _upload_progress_callback(self, transferred, total, file_size, file_name, progress_callback):
-        """Callback für Upload-Fortschrittsanzeige"""
+        """Callback für Upload-Fortschrittsanzeige (wird pro gelesenem Block aufgerufen)"""
         if progress_callback and file_size > 1024:
+            now = time.monotonic()
+            if transferred < file_size and now - self._last_progress_ts.get(file_name, 0.0) < self.PROGRESS_INTERVAL:
+                return
+            self._last_progress_ts[file_name] = now
             progress = (transferred / file_size) * 100
+            # Prozentanzeige über alle gleichzeitig hochgeladenen Dateien
+            self._upload_progress[file_name] = transferred
+            self._report_percent(sum(self._upload_progress.values()) * 100 / max(self._upload_total, file_size))
             progress_callback(f"Upload {file_name}: {progress:.1f}% ({transferred // (1024*1024)}MB / {file_size // (1024*1024)}MB)")
     
     def _create_vm_config(self, vm_info: Dict, vmdk_files: List[str], 
@@ -471,12 +906,7 @@ class VMwareRestore:
             else:
                 return 'windows8_64Guest'
         elif 'ubuntu' in guest_os_lower:
-            if '22' in guest_os_lower:
-                return 'ubuntu64Guest'
-            elif '20' in guest_os_lower:
-                return 'ubuntu64Guest'
-            else:
-                return 'ubuntu64Guest'
+            return 'ubuntu64Guest'  # Gleiche guestId für alle Versionen
         elif 'linux' in guest_os_lower:
             return 'other3xLinux64Guest'
         else:
@@ -496,6 +926,67 @@ class VMwareRestore:
         view.Destroy()
         return pools[0] if pools else None
 
+    def _wait_for_task(self, task: vim.Task) -> tuple:
+        """
+        Wartet auf das Ende eines Tasks und meldet dessen Fortschritt
+        
+        Statt task.info zu pollen, wartet WaitForUpdatesEx, bis der Server eine
+        Änderung von Zustand oder Fortschritt meldet; spätestens nach einer
+        Sekunde ohne Änderung wird auf Abbruch geprüft. Ergebnis bzw. Fehler
+        kommen mit derselben Aktualisierung wie der Endzustand, ohne weiteren
+        Abruf von task.info.
+        
+        Args:
+            task: vSphere-Task
+            
+        Returns:
+            (Endzustand, Ergebnis bzw. Fehler), (None, None) bei Abbruch
+        """
+        # Eigener Collector, damit gleichzeitige Wartevorgänge sich nicht stören
+        collector = self.content.propertyCollector.CreatePropertyCollector()
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+            objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=task)],
+            propSet=[vmodl.query.PropertyCollector.PropertySpec(
+                type=vim.Task,
+                pathSet=['info.state', 'info.progress', 'info.result', 'info.error']
+            )]
+        )
+        collector.CreateFilter(filter_spec, partialUpdates=True)
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=1)
+        
+        try:
+            version = ''
+            state = None
+            values = {}
+            while state not in (vim.TaskInfo.State.success, vim.TaskInfo.State.error):
+                if self._is_cancelled():
+                    try:
+                        task.CancelTask()
+                    except Exception:
+                        pass  # Task ist ggf. nicht abbrechbar
+                    return None, None
+                
+                update = collector.WaitForUpdatesEx(version, options)
+                if update is None:
+                    continue
+                version = update.version
+                for filter_update in update.filterSet:
+                    for object_update in filter_update.objectSet:
+                        for change in object_update.changeSet:
+                            if change.name == 'info.state':
+                                state = change.val
+                            elif change.name == 'info.progress':
+                                if change.val is not None:
+                                    self._report_percent(change.val)
+                            else:
+                                values[change.name] = change.val
+            if state == vim.TaskInfo.State.success:
+                return state, values.get('info.result')
+            return state, values.get('info.error')
+        finally:
+            # Entfernt auch den Filter
+            collector.DestroyPropertyCollector()
+    
     def _register_vm(self, config_spec: vim.vm.ConfigSpec, vm_name: str,
                     datastore: vim.Datastore, progress_callback=None) -> Optional[vim.VirtualMachine]:
         """Registriert VM auf ESXi Server"""
@@ -522,20 +1013,24 @@ class VMwareRestore:
                 progress_callback(f"Erstelle VM '{vm_name}'...")
             
             task = vm_folder.CreateVM_Task(config=config_spec, pool=resource_pool)
+            self._report_percent(0)
             
-            # Warte auf Task-Abschluss
-            while task.info.state == 'running':
-                import time
-                time.sleep(1)
+            # Warte auf Task-Abschluss und melde den Task-Fortschritt
+            state, outcome = self._wait_for_task(task)
+            if state is None:
+                if progress_callback:
+                    progress_callback("Wiederherstellung abgebrochen")
+                return None
             
-            if task.info.state == 'success':
-                vm = task.info.result
+            if state == vim.TaskInfo.State.success:
+                self._report_percent(100)
                 if progress_callback:
-                    progress_callback(f"VM erfolgreich erstellt: {vm.name}")
-                return vm
+                    # Name aus der ConfigSpec statt eines weiteren Abrufs von vm.name
+                    progress_callback(f"VM erfolgreich erstellt: {config_spec.name}")
+                return outcome
             else:
                 if progress_callback:
-                    progress_callback(f"VM-Erstellung fehlgeschlagen: {task.info.error}")
+                    progress_callback(f"VM-Erstellung fehlgeschlagen: {outcome}")
                 return None
                 
         except Exception as e:
@@ -543,16 +1038,32 @@ class VMwareRestore:
                 progress_callback(f"Fehler beim Registrieren der VM: {str(e)}")
             return None
     
+    def _get_datacenter_name(self) -> str:
+        """
+        Liefert den Namen des Datacenters, zwischengespeichert pro Verbindung
+        
+        Returns:
+            Name des Datacenters oder "" wenn keins gefunden wurde
+        """
+        if self._datacenter_name is None:
+            datacenter = self._get_datacenter()
+            if not datacenter:
+                return ""
+            self._datacenter_name = datacenter.name
+        return self._datacenter_name
+    
     def _get_datacenter(self) -> Optional[vim.Datacenter]:
-        """Ruft das Datacenter ab"""
+        """Ruft das Datacenter ab, zwischengespeichert pro Verbindung"""
         if not self.content:
             return None
         
-        datacenter_view = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder,
-            [vim.Datacenter],
-            True
-        )
-        datacenters = datacenter_view.view
-        datacenter_view.Destroy()
-        return datacenters[0] if datacenters else None
+        if self._datacenter is None:
+            datacenter_view = self.content.viewManager.CreateContainerView(
+                self.content.rootFolder,
+                [vim.Datacenter],
+                True
+            )
+            datacenters = datacenter_view.view
+            datacenter_view.Destroy()
+            self._datacenter = datacenters[0] if datacenters else None
+        return self._datacenter